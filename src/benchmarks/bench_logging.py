@@ -0,0 +1,66 @@
+"""Цена вызова логгера в обработчике запроса и пропускная способность вывода.
+
+Вызовы замеряются при остановленном слушателе очереди: его поток форматирует
+JSON и в плотном цикле делил бы GIL с замером. Затем слушатель запускается и
+выводит накопленное в /dev/null.
+
+Запуск из каталога src:
+    python -m benchmarks.bench_logging --calls 100000
+"""
+
+import argparse
+import logging
+import os
+import time
+import timeit
+
+from tools.logs import log_sampled, request_id, setup_logging
+from web.middlewares import RequestLogMiddleware
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-us", type=float, default=5, help="бюджет на вызов, мкс")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        listener = setup_logging(stream=devnull)
+        logger = logging.getLogger("bench")
+        request_id.set("0f3c9a4e2b7d4c1e8a6b5d3f2e1c0b9a")
+
+        cases = {
+            "info": lambda: logger.info("Вакансия %s обновлена", 42),
+            "info + extra": lambda: logger.info(
+                "GET /jobs 200", extra={"method": "GET", "path": "/jobs", "status": 200}
+            ),
+            # строка журнала доступа из RequestLogMiddleware: пишется на каждый запрос
+            "журнал доступа": lambda: RequestLogMiddleware._log_access(
+                logging.INFO, "GET", "/jobs", 200, time.perf_counter()
+            ),
+            "debug, уровень INFO": lambda: logger.debug("Вакансия %s обновлена", 42),
+        }
+
+        def report(name, call):
+            seconds = min(timeit.repeat(call, number=args.calls, repeat=args.repeat))
+            us = seconds / args.calls * 1e6
+            verdict = "в бюджете" if us < args.budget_us else "СВЕРХ БЮДЖЕТА"
+            print(f"{name:>22}: {us:5.2f} µs  {verdict} ({args.budget_us:g} µs)")
+
+        for name, call in cases.items():
+            report(name, call)
+
+        log_sampled.set(False)
+        report("info вне выборки", cases["info"])
+
+        queued = listener.queue.qsize()
+        started = time.perf_counter()
+        listener.start()
+        listener.stop()
+        seconds = time.perf_counter() - started
+        print(f"вывод очереди: {queued / seconds:,.0f} записей/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Цена сборки и компиляции запроса на каждый вызов горячей выборки.
+
+Выборка пользователя по id (как в get_current_user) выполняется в нескольких режимах:
+без кэшей SQLAlchemy и asyncpg, с пересборкой запроса при включённых кэшах,
+через lambda_stmt и готовым запросом с bindparam. Нужна БД из .env.<STAGE>.
+
+Запуск из каталога src:
+    STAGE=test python -m benchmarks.bench_queries --queries 5000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import bindparam, lambda_stmt, select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config import DBSettings
+from config.common import env_file_path
+from storage.sqlalchemy.tables import User
+
+PREBUILT = select(User).filter_by(id=bindparam("id"), deleted_at=None).limit(1)
+
+
+def rebuilt(id: int):
+    return select(User).filter_by(id=id, deleted_at=None).limit(1), None
+
+
+def lambda_built(id: int):
+    return lambda_stmt(lambda: select(User).filter_by(id=id, deleted_at=None).limit(1)), None
+
+
+def prebuilt(id: int):
+    return PREBUILT, {"id": id}
+
+
+async def measure(settings: DBSettings, build, queries: int, caches: bool) -> float:
+    engine = create_async_engine(
+        str(settings.pg_async_dsn),
+        query_cache_size=500 if caches else 0,
+        connect_args=dict(prepared_statement_cache_size=100 if caches else 0),
+    )
+    try:
+        async with AsyncSession(engine) as session:
+            # прогрев: соединение, типы asyncpg и первая компиляция не входят в замер
+            for id in range(100):
+                await session.execute(*build(id))
+
+            started = time.perf_counter()
+            for id in range(queries):
+                query, params = build(id)
+                res = await session.execute(query, params)
+                res.scalars().first()
+            return (time.perf_counter() - started) / queries * 1e6
+    finally:
+        await engine.dispose()
+
+
+def compile_cost(repeat: int) -> float:
+    dialect = asyncpg_dialect()
+    started = time.perf_counter()
+    for id in range(repeat):
+        rebuilt(id)[0].compile(dialect=dialect)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    settings = DBSettings(_env_file=env_file_path)
+    print(f"компиляция запроса без кэша: {compile_cost(args.queries):.1f} мкс")
+
+    modes = [
+        ("пересборка, кэши выключены", rebuilt, False),
+        ("пересборка", rebuilt, True),
+        ("lambda_stmt", lambda_built, True),
+        ("готовый запрос с bindparam", prebuilt, True),
+    ]
+    baseline = None
+    for name, build, caches in modes:
+        latency = await measure(settings, build, args.queries, caches)
+        baseline = baseline or latency
+        print(f"{name}: {latency:.1f} мкс на запрос, экономия {baseline - latency:.1f} мкс")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""Задержка подбора рекомендаций по TF-IDF индексу вакансий.
+
+Затем индекс воркера (JobTextIndex) строится так же, как при старте приложения:
+пачками через upsert_jobs с упаковкой в потоке. Рядом работает задача, которая
+каждые 10 мс отмечается в цикле событий: её наибольшая задержка — сколько ждал
+бы запрос, пришедший во время сборки.
+
+Запуск из каталога src:
+    python -m benchmarks.bench_recommendations --jobs 500000 --queries 200
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import string
+import time
+
+from models import Job
+from services import JobTextIndex
+from tools.tfidf import TfIdfIndex
+
+
+def build_vocabulary(size: int, rnd: random.Random) -> list[str]:
+    return ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10))) for _ in range(size)]
+
+
+async def build_worker_index(texts: list[str], batch_size: int) -> tuple[float, float]:
+    """Время сборки JobTextIndex и наибольшая задержка цикла событий во время неё."""
+
+    delays = [0.0]
+
+    async def tick() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append(time.perf_counter() - started - 0.01)
+
+    ticker = asyncio.create_task(tick())
+    index = JobTextIndex()
+    started = time.perf_counter()
+    async with index.bulk_load():
+        for start in range(0, len(texts), batch_size):
+            end = start + batch_size
+            await index.upsert_jobs(
+                [
+                    Job(id, 1, text, "", salary_from=0, salary_to=0, is_active=True)
+                    for id, text in enumerate(texts[start:end], start)
+                ]
+            )
+    elapsed = time.perf_counter() - started
+    ticker.cancel()
+    return elapsed, max(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--words", type=int, default=60, help="слов в описании вакансии")
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--history", type=int, default=5, help="откликов у пользователя")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker-jobs", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary, rnd)
+    # частоты слов в текстах близки к закону Ципфа
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+    index = TfIdfIndex()
+    started = time.perf_counter()
+    with index.deferred_compaction():
+        for id in range(args.jobs):
+            text = " ".join(rnd.choices(vocabulary, cum_weights=cum_weights, k=args.words))
+            index.upsert(id, text)
+    print(f"индекс из {args.jobs} вакансий построен за {time.perf_counter() - started:.1f} с")
+
+    latencies = []
+    for _ in range(args.queries):
+        history = rnd.sample(range(args.jobs), args.history)
+        started = time.perf_counter()
+        index.search(index.profile(history), k=10, exclude=history)
+        latencies.append((time.perf_counter() - started) * 1000)
+        # между запросами вакансии меняются: часть поиска идёт по неупакованным документам
+        id = rnd.randrange(args.jobs)
+        index.upsert(id, " ".join(rnd.choices(vocabulary, cum_weights=cum_weights, k=args.words)))
+
+    latencies.sort()
+    print(
+        f"поиск: p50 {statistics.median(latencies):.2f} мс, "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} мс, "
+        f"max {latencies[-1]:.2f} мс"
+    )
+
+    texts = [
+        " ".join(rnd.choices(vocabulary, cum_weights=cum_weights, k=args.words))
+        for _ in range(args.worker_jobs)
+    ]
+    elapsed, max_delay = asyncio.run(build_worker_index(texts, args.batch_size))
+    print(
+        f"индекс воркера из {args.worker_jobs} вакансий: {elapsed:.1f} с, "
+        f"наибольшая задержка цикла событий {max_delay * 1000:.1f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
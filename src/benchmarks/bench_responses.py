@@ -0,0 +1,116 @@
+"""Сравнение сериализации и сжатия страницы вакансий.
+
+Сначала замеряется только render класса ответа, затем полный ответ GET /jobs
+приложения из create_app (маршрутизация, валидация, middleware, сериализация и
+сжатие) на репозиториях в памяти для каждого класса ответа с GZip и без.
+
+Запуск из каталога src:
+    python -m benchmarks.bench_responses --jobs 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import gzip
+import os
+import time
+import timeit
+
+import factory
+from fastapi.encoders import jsonable_encoder
+from httpx import ASGITransport, AsyncClient
+
+from config.web import RESPONSE_CLASSES
+from tools.fixtures.jobs import JobFactory
+from web.schemas import JobCreateSchema, JobSchema, UserCreateSchema
+
+
+def build_page(size: int) -> list[dict]:
+    # описания вакансий в проде заметно длиннее дефолтных 200 символов Faker
+    jobs = JobFactory.build_batch(size, description=factory.Faker("text", max_nb_chars=2000))
+    page = [
+        JobSchema(
+            id=job.id,
+            user_id=job.user_id,
+            title=job.title,
+            description=job.description,
+            salary_from=job.salary_from,
+            salary_to=job.salary_to,
+            is_active=job.is_active,
+        )
+        for job in jobs
+    ]
+    return jsonable_encoder(page)
+
+
+async def time_full_response(jobs: list[dict], repeat: int, **env: str) -> tuple[float, int]:
+    """Среднее время GET /jobs через всё приложение и размер тела ответа на проводе."""
+
+    os.environ.update(REPOSITORY_BACKEND="memory", RATE_LIMIT_ENABLED="false", **env)
+    from main import create_app
+
+    app = create_app()
+    user_repository = app.container.repositories_container.user_repository()
+    job_repository = app.container.repositories_container.job_repository()
+    company = await user_repository.create(
+        UserCreateSchema(
+            name="Компания",
+            email="hr@example.com",
+            password="password",
+            password2="password",
+            is_company=True,
+        ),
+        hashed_password="hash",
+    )
+    for job in jobs:
+        await job_repository.create(
+            user_id=company.id,
+            # зарплаты Faker не согласованы между собой: страница копируется без валидации
+            job_create_dto=JobCreateSchema.model_construct(
+                **{field: job[field] for field in JobCreateSchema.model_fields}
+            ),
+        )
+
+    params = {"limit": len(jobs)}
+    headers = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        response = await client.get("/jobs", params=params, headers=headers)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await client.get("/jobs", params=params, headers=headers)
+        seconds = time.perf_counter() - started
+
+    return seconds / repeat, response.num_bytes_downloaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    page = build_page(args.jobs)
+    print(f"страница из {args.jobs} вакансий, {args.repeat} повторов")
+    for name, response_class in RESPONSE_CLASSES.items():
+        response = response_class(content=None)
+        seconds = timeit.timeit(lambda: response.render(page), number=args.repeat)
+        body = response.render(page)
+        print(
+            f"{name:>7}: encode {seconds / args.repeat * 1e6:8.1f} µs, "
+            f"{len(body):>8} B, gzip-6 {len(gzip.compress(body, compresslevel=6)):>7} B"
+        )
+
+    jobs = [{**job, "is_active": True} for job in page]
+    print("полный ответ GET /jobs")
+    for name in RESPONSE_CLASSES:
+        for gzip_enabled in ("false", "true"):
+            seconds, size = asyncio.run(
+                time_full_response(
+                    jobs, args.repeat, RESPONSE_CLASS=name, GZIP_ENABLED=gzip_enabled
+                )
+            )
+            label = f"{name}{' + gzip' if gzip_enabled == 'true' else ''}"
+            print(f"{label:>14}: {seconds * 1e6:8.1f} µs, {size:>8} B")
+
+
+if __name__ == "__main__":
+    main()
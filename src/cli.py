@@ -0,0 +1,238 @@
+"""Пакетные операции вне процесса API.
+
+Команды работают через синхронные репозитории (SqlAlchemySync, psycopg2) и не
+занимают цикл событий воркеров. Запуск из каталога src:
+    python cli.py purge --retention-days 7
+    python cli.py export-jobs --output jobs.jsonl
+    python cli.py find-duplicates --threshold 0.8
+    python cli.py seed --users 1000000 --jobs 1000000 --responses 5000000 --seed 42
+    python cli.py import-feed partner.xml --user-id 42
+    python cli.py profile-token --user-id 1 --minutes 15
+    python cli.py stats-token --user-id 1 --minutes 60
+
+Параметры БД берутся из DBSettings (.env.<STAGE>).
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from dependency_injector import providers
+from sqlalchemy import create_engine
+
+from config import DBSettings
+from config.common import env_file_path
+from dependencies.containers import SyncRepositoriesContainer
+from models import FeedReport
+from repositories.exceptions import EntityNotFoundError
+from services.feed import FeedBatches, record_upsert
+from storage.sqlalchemy.client import SqlAlchemySync
+from tools.feeds import FEED_PARSERS
+from tools.fixtures.seed import plan_from_database, seed
+from tools.minhash import LshIndex
+from tools.profiler import PROFILE_CLAIM
+from tools.security import STATS_CLAIM, create_access_token, hash_password
+
+
+def create_container() -> SyncRepositoriesContainer:
+    container = SyncRepositoriesContainer()
+    container.db.override(
+        providers.Singleton(SqlAlchemySync, pg_settings=DBSettings(_env_file=env_file_path))
+    )
+    return container
+
+
+def report(action: str, count: int, elapsed: float) -> None:
+    print(f"{action}: {count} за {elapsed:.1f} с ({count / (elapsed or 1):.0f}/с)", file=sys.stderr)
+
+
+def purge(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    """Окончательно удалить мягко удалённые записи старше срока хранения."""
+
+    before = datetime.now(timezone.utc) - timedelta(days=args.retention_days)
+    started = time.perf_counter()
+    purged = 0
+    # сначала дети, потом родители, как в фоновой очистке PurgeService
+    for repository in (
+        container.response_repository(),
+        container.job_repository(),
+        container.user_repository(),
+    ):
+        while True:
+            deleted = repository.purge_deleted(before=before, batch_size=args.batch_size)
+            purged += deleted
+            if deleted < args.batch_size:
+                break
+    report("удалено записей", purged, time.perf_counter() - started)
+
+
+def export_jobs(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    """Выгрузить вакансии в JSON Lines, включая удалённые (с deleted_at)."""
+
+    since = datetime.fromisoformat(args.since) if args.since else None
+    output = open(args.output, "w") if args.output != "-" else sys.stdout
+    started = time.perf_counter()
+    count = 0
+    try:
+        for job in container.job_repository().iter_updated_since(since, args.batch_size):
+            row = dataclasses.asdict(job)
+            row.pop("responses")
+            output.write(json.dumps(row, default=str, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    report("выгружено вакансий", count, time.perf_counter() - started)
+
+
+def find_duplicates(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    """Найти пары похожих активных вакансий одного работодателя по MinHash/LSH."""
+
+    index = LshIndex(threshold=args.threshold)
+    owners: dict[int, int] = {}
+    started = time.perf_counter()
+    count = 0
+    for job in container.job_repository().iter_updated_since(batch_size=args.batch_size):
+        if not job.is_active or job.deleted_at is not None:
+            continue
+
+        count += 1
+        signature = index.hasher.signature(f"{job.title} {job.description}")
+        for duplicate_id, similarity in index.query(signature):
+            if owners[duplicate_id] == job.user_id:
+                print(f"{duplicate_id}\t{job.id}\t{similarity:.2f}")
+        index.insert(job.id, signature)
+        owners[job.id] = job.user_id
+    report("проверено вакансий", count, time.perf_counter() - started)
+
+
+def seed_database(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    """Заполнить БД сгенерированными пользователями, вакансиями и откликами."""
+
+    dsn = str(DBSettings(_env_file=env_file_path).pg_sync_dsn)
+    engine = create_engine(dsn)
+    try:
+        plan = plan_from_database(
+            engine,
+            users=args.users,
+            jobs=args.jobs,
+            responses=args.responses,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            # один хеш на всех: bcrypt на миллион паролей занял бы часы
+            hashed_password=hash_password(args.password),
+            now=datetime.fromisoformat(args.now) if args.now else datetime.now(timezone.utc),
+        )
+    finally:
+        engine.dispose()
+
+    started = time.perf_counter()
+    total = 0
+    for table, loaded, elapsed in seed(dsn, plan, workers=args.workers):
+        total += loaded
+        report(table, loaded, elapsed)
+    report("всего строк", total, time.perf_counter() - started)
+
+
+def import_feed(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    """Вставить или обновить вакансии компании из ленты партнёра (XML или JSON)."""
+
+    try:
+        user = container.user_repository().retrieve(id=args.user_id)
+    except EntityNotFoundError:
+        sys.exit(f"Пользователь {args.user_id} не найден")
+    if not user.is_company:
+        sys.exit("Загружать вакансии могут только компании")
+
+    feed_format = args.format or ("xml" if args.path.endswith(".xml") else "json")
+    job_repository = container.job_repository()
+    feed_report = FeedReport()
+    with open(args.path, "rb") if args.path != "-" else sys.stdin.buffer as stream:
+        batches = FeedBatches(FEED_PARSERS[feed_format](stream), feed_report, args.batch_size)
+        for batch in batches:
+            started = time.perf_counter()
+            counts = job_repository.upsert_many(user_id=args.user_id, jobs=batch)
+            record_upsert(feed_report, len(batch), counts, time.perf_counter() - started)
+
+    for stage in ("parsing", "validation", "upsert"):
+        stats = getattr(feed_report, stage)
+        report(stage, stats.items, stats.seconds)
+    print(
+        f"вставлено {feed_report.inserted}, обновлено {feed_report.updated}, "
+        f"без изменений {feed_report.unchanged}, повторов {feed_report.duplicates}, "
+        f"с ошибками {feed_report.invalid}",
+        file=sys.stderr,
+    )
+    for error in feed_report.errors:
+        print(error, file=sys.stderr)
+    if feed_report.error:
+        sys.exit(feed_report.error)
+
+
+def issue_token(container: SyncRepositoriesContainer, args: argparse.Namespace) -> None:
+    try:
+        container.user_repository().retrieve(id=args.user_id)
+    except EntityNotFoundError:
+        sys.exit(f"Пользователь {args.user_id} не найден")
+
+    payload = {"sub": str(args.user_id), args.claim: True}
+    print(create_access_token(payload, expire_minutes=args.minutes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пакетные операции биржи труда")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("purge", help=purge.__doc__)
+    command.add_argument("--retention-days", type=float, default=7)
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(handler=purge)
+
+    command = commands.add_parser("export-jobs", help=export_jobs.__doc__)
+    command.add_argument("--since", help="дата ISO 8601: только изменённые начиная с неё")
+    command.add_argument("--output", default="-")
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(handler=export_jobs)
+
+    command = commands.add_parser("find-duplicates", help=find_duplicates.__doc__)
+    command.add_argument("--threshold", type=float, default=0.8)
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(handler=find_duplicates)
+
+    command = commands.add_parser("seed", help=seed_database.__doc__)
+    command.add_argument("--users", type=int, default=100_000)
+    command.add_argument("--jobs", type=int, default=100_000)
+    command.add_argument("--responses", type=int, default=500_000)
+    command.add_argument("--seed", type=int, default=0)
+    command.add_argument("--workers", type=int, default=os.cpu_count())
+    command.add_argument("--chunk-size", type=int, default=10_000)
+    command.add_argument("--password", default="password", help="пароль всех пользователей")
+    command.add_argument("--now", help="дата ISO 8601, от которой отсчитываются даты записей")
+    command.set_defaults(handler=seed_database)
+
+    command = commands.add_parser("import-feed", help=import_feed.__doc__)
+    command.add_argument("path", help="файл ленты, - — стандартный ввод")
+    command.add_argument("--user-id", type=int, required=True, help="id компании")
+    command.add_argument("--format", choices=sorted(FEED_PARSERS), help="по умолчанию по имени")
+    command.add_argument("--batch-size", type=int, default=1000)
+    command.set_defaults(handler=import_feed)
+
+    for name, claim, description in (
+        ("profile-token", PROFILE_CLAIM, "Выпустить токен с правом профилировать воркеры API."),
+        ("stats-token", STATS_CLAIM, "Выпустить токен с доступом к статистике биржи."),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("--user-id", type=int, required=True)
+        command.add_argument("--minutes", type=float, default=15, help="срок действия токена")
+        command.set_defaults(handler=issue_token, claim=claim)
+
+    args = parser.parse_args()
+    args.handler(create_container(), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
 from .auth import AuthSettings  # noqa
 from .db_settings import DBSettings  # noqa
+from .server import ServerSettings  # noqa
+from .web import WebSettings  # noqa
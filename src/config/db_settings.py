@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Literal, Optional
+from uuid import uuid4
 
 from pydantic import PostgresDsn, field_validator
 from pydantic_core.core_schema import ValidationInfo
@@ -6,7 +7,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class DBSettings(BaseSettings):
-    model_config = SettingsConfigDict(env_file=(".env",))
+    model_config = SettingsConfigDict(env_file=(".env",), extra="ignore")
 
     postgres_user: str = ""
     postgres_password: str = ""
@@ -17,6 +18,27 @@ class DBSettings(BaseSettings):
     pg_sync_dsn: Optional[PostgresDsn | str] = None
     pg_async_dsn: Optional[PostgresDsn | str] = None
 
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    # бюджет соединений сервера: max_connections минус резерв под миграции, psql и т.п.
+    pg_max_connections: int = 100
+    pg_reserved_connections: int = 10
+
+    # кэш скомпилированных запросов SQLAlchemy на движок: ключ — структура запроса
+    query_cache_size: int = 500
+    # кэш подготовленных выражений asyncpg на каждое соединение пула, 0 — не кэшировать
+    prepared_statement_cache_size: int = 100
+    # за PgBouncer в режиме transaction соседние транзакции клиента попадают в разные
+    # серверные соединения: подготовленные выражения нельзя переиспользовать,
+    # а их имена должны быть уникальными. Пул воркера в этом режиме не нужен (NullPool),
+    # бюджет серверных соединений задаёт default_pool_size PgBouncer
+    pgbouncer: bool = False
+
+    # memory — репозитории поверх InMemoryStore вместо PostgreSQL: для тестов и бенчмарков
+    # сервисов без БД. Данные живут в процессе воркера и теряются при перезапуске
+    repository_backend: Literal["sqlalchemy", "memory"] = "sqlalchemy"
+
     @field_validator("pg_sync_dsn")  # noqa
     @classmethod
     def create_sync_connection(cls, v: str, values: ValidationInfo) -> PostgresDsn:
@@ -40,3 +62,36 @@ class DBSettings(BaseSettings):
             port=values.data.get("postgres_port"),
             path=values.data.get("db_name"),
         )
+
+    def pool_limits(self, workers: int) -> tuple[int, int]:
+        """Размер пула и max_overflow одного воркера в пределах бюджета соединений.
+
+        ValueError, если бюджета не хватает даже на одно соединение на воркер.
+        """
+
+        connections = self.pg_max_connections - self.pg_reserved_connections
+        if workers > connections:
+            raise ValueError(
+                f"{workers} воркеров не помещаются в бюджет {connections} соединений "
+                "(PG_MAX_CONNECTIONS - PG_RESERVED_CONNECTIONS): уменьшите число воркеров "
+                "или включите PGBOUNCER"
+            )
+        budget = connections // workers
+        pool_size = min(self.pool_size, budget)
+        max_overflow = min(self.max_overflow, budget - pool_size)
+        return pool_size, max_overflow
+
+    def asyncpg_connect_args(self) -> dict:
+        """Параметры соединения asyncpg для create_async_engine(connect_args=...)."""
+
+        if self.pgbouncer:
+            return dict(
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=unique_statement_name,
+                statement_cache_size=0,
+            )
+        return dict(prepared_statement_cache_size=self.prepared_statement_cache_size)
+
+
+def unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4().hex}__"
@@ -0,0 +1,22 @@
+import os
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ServerSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=(".env",), extra="ignore")
+
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = Field(default_factory=lambda: os.cpu_count() or 1, gt=0)
+    # импорт приложения в мастер-процессе до fork: модули грузятся один раз
+    preload: bool = True
+
+    loop: Literal["auto", "asyncio", "uvloop"] = "uvloop"
+    http: Literal["auto", "h11", "httptools"] = "httptools"
+    backlog: int = 2048
+    timeout_keep_alive: int = 5
+    timeout_graceful_shutdown: int = 30
+    limit_max_requests: int | None = None
@@ -0,0 +1,73 @@
+from typing import Annotated, Literal, Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+RESPONSE_CLASSES = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+class WebSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=(".env",), extra="ignore")
+
+    response_class: Literal["json", "orjson"] = "orjson"
+    gzip_enabled: bool = True
+    gzip_minimum_size: int = 1024
+    gzip_compresslevel: int = 6
+
+    rate_limit_enabled: bool = True
+    # memory - корзины в памяти воркера, postgres - общие для всех воркеров
+    rate_limit_backend: Literal["memory", "postgres"] = "memory"
+    # корзина, к которой не обращались дольше периода любого лимита, полна: её можно удалить
+    rate_limit_purge_interval_seconds: float = Field(default=600, ge=0)
+    rate_limit_idle_seconds: float = Field(default=3600, gt=0)
+
+    job_duplicates_enabled: bool = True
+    # оценка коэффициента Жаккара шинглов, начиная с которой вакансия считается перепостом
+    job_duplicate_threshold: float = Field(default=0.8, gt=0, le=1)
+
+    # период пересчёта материализованной статистики /stats, 0 - не пересчитывать из приложения
+    stats_refresh_seconds: float = Field(default=300, ge=0)
+
+    # мягко удалённые записи хранятся неделю, потом удаляются пачками раз в `purge_interval`
+    purge_interval_seconds: float = Field(default=3600, ge=0)
+    purge_retention_seconds: float = Field(default=7 * 24 * 3600, ge=0)
+    purge_batch_size: int = Field(default=1000, gt=0)
+
+    # срок обработки запроса по умолчанию, 0 — без срока; клиент может сократить его
+    # заголовком `request_timeout_header` (секунды), маршрут — задать свой (RequestTimeout)
+    request_timeout_seconds: float = Field(default=30, ge=0)
+    request_timeout_header: str = "X-Request-Timeout"
+
+    # адаптивный лимит одновременных запросов воркера: растёт, пока ответы укладываются
+    # в `admission_latency_target_seconds`, запросы сверх лимита получают 503
+    admission_enabled: bool = True
+    admission_initial_limit: int = Field(default=20, gt=0)
+    admission_min_limit: int = Field(default=2, gt=0)
+    admission_max_limit: int = Field(default=200, gt=0)
+    admission_latency_target_seconds: float = Field(default=0.5, gt=0)
+
+    # логи — JSON в stdout через очередь; `log_sql` — запросы SQLAlchemy на уровне INFO
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    log_sql: bool = False
+    request_id_header: str = "X-Request-ID"
+    # доля запросов маршрута ("GET /jobs"), записи которых ниже WARNING попадают в лог
+    log_sample_rates: dict[str, Annotated[float, Field(ge=0, le=1)]] = {"GET /jobs": 0.01}
+
+    # /debug/profile и ?profile=1 для токенов с claim profile; выключено — ни маршрута,
+    # ни middleware в приложении нет
+    profiling_enabled: bool = False
+
+    # трассировка OpenTelemetry (extra tracing): спаны запросов, сервисов, репозиториев и SQL;
+    # `tracing_endpoint` — адрес коллектора OTLP/HTTP или файл для exporter=file
+    tracing_enabled: bool = False
+    tracing_exporter: Literal["otlp", "file"] = "otlp"
+    tracing_endpoint: Optional[str] = None
+    tracing_service_name: str = "labor-exchange"
+
+    @property
+    def default_response_class(self) -> type[JSONResponse]:
+        return RESPONSE_CLASSES[self.response_class]
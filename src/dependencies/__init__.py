@@ -1 +1,3 @@
-from .current_user import get_current_user  # noqa
+from .current_user import get_current_user, require_profile_claim, require_stats_claim  # noqa
+from .deadline import RequestTimeout  # noqa
+from .rate_limit import ConcurrencyLimit, RateLimit  # noqa
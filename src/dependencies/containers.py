@@ -1,14 +1,26 @@
 from dependency_injector import containers, providers
 
 from interfaces.i_sqlalchemy import ISQLAlchemy
-from repositories import JobRepository, ResponseRepository, UserRepository
-from services import JobService, ResponseService, UserService
+from repositories import JobRepository, ResponseRepository, StatsRepository, UserRepository
+from repositories.sync import JobRepositorySync, ResponseRepositorySync, UserRepositorySync
+from services import (
+    FeedService,
+    JobDuplicateIndex,
+    JobService,
+    JobTextIndex,
+    PurgeService,
+    RecommendationService,
+    ResponseRankingService,
+    ResponseScoreCache,
+    ResponseService,
+    StatsService,
+    UserService,
+)
+from storage.rate_limit import InMemoryRateLimitBackend
 
 
 class RepositoriesContainer(containers.DeclarativeContainer):
-    wiring_config = containers.WiringConfiguration(packages=["services", "dependencies"])
-
-    db = providers.AbstractFactory(ISQLAlchemy)
+    db = providers.AbstractSingleton(ISQLAlchemy)
 
     user_repository = providers.Factory(
         UserRepository,
@@ -25,9 +37,49 @@ class RepositoriesContainer(containers.DeclarativeContainer):
         session=db.provided.get_db,
     )
 
+    stats_repository = providers.Factory(
+        StatsRepository,
+        session=db.provided.get_db,
+    )
+
+    rate_limit_backend = providers.Singleton(InMemoryRateLimitBackend)
+
+
+class SyncRepositoriesContainer(containers.DeclarativeContainer):
+    """Синхронные репозитории для пакетных задач и CLI: SqlAlchemySync поверх psycopg2."""
+
+    db = providers.AbstractSingleton(ISQLAlchemy)
+
+    user_repository = providers.Factory(
+        UserRepositorySync,
+        session=db.provided.get_db,
+    )
+
+    job_repository = providers.Factory(
+        JobRepositorySync,
+        session=db.provided.get_db,
+    )
+
+    response_repository = providers.Factory(
+        ResponseRepositorySync,
+        session=db.provided.get_db,
+    )
+
 
 class ServicesContainer(containers.DeclarativeContainer):
-    wiring_config = containers.WiringConfiguration(packages=["web.routers"])
+    # модули перечислены явно, wiring вызывается в create_app, а не при создании контейнера
+    wiring_config = containers.WiringConfiguration(
+        modules=[
+            "dependencies.current_user",
+            "dependencies.rate_limit",
+            "web.routers.auth",
+            "web.routers.job",
+            "web.routers.response",
+            "web.routers.stats",
+            "web.routers.user",
+        ],
+        auto_wire=False,
+    )
     repositories_container = providers.Container(RepositoriesContainer)
 
     user_service = providers.Factory(
@@ -35,13 +87,54 @@ class ServicesContainer(containers.DeclarativeContainer):
         user_repository=repositories_container.user_repository,
     )
 
+    # индекс вакансий живёт в памяти воркера и общий для всех запросов
+    job_index = providers.Singleton(JobTextIndex)
+    job_duplicate_index = providers.Singleton(JobDuplicateIndex)
+
     job_service = providers.Factory(
         JobService,
         job_repository=repositories_container.job_repository,
         user_repository=repositories_container.user_repository,
+        job_index=job_index,
+        duplicate_index=job_duplicate_index,
     )
 
+    feed_service = providers.Factory(
+        FeedService,
+        job_repository=repositories_container.job_repository,
+    )
+
+    # оценки откликов по вакансиям, как и индекс вакансий, общие для запросов воркера
+    response_score_cache = providers.Singleton(ResponseScoreCache)
+
     response_service = providers.Factory(
         ResponseService,
         response_repository=repositories_container.response_repository,
+        score_cache=response_score_cache,
+    )
+
+    response_ranking_service = providers.Factory(
+        ResponseRankingService,
+        job_repository=repositories_container.job_repository,
+        response_repository=repositories_container.response_repository,
+        score_cache=response_score_cache,
+    )
+
+    recommendation_service = providers.Factory(
+        RecommendationService,
+        job_repository=repositories_container.job_repository,
+        response_repository=repositories_container.response_repository,
+        job_index=job_index,
+    )
+
+    stats_service = providers.Factory(
+        StatsService,
+        stats_repository=repositories_container.stats_repository,
+    )
+
+    purge_service = providers.Factory(
+        PurgeService,
+        user_repository=repositories_container.user_repository,
+        job_repository=repositories_container.job_repository,
+        response_repository=repositories_container.response_repository,
     )
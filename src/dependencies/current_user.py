@@ -4,7 +4,8 @@ from fastapi import Depends, HTTPException, status
 from dependencies.containers import ServicesContainer
 from models import User
 from repositories import UserRepository
-from tools.security import JWTBearer, decode_access_token
+from tools.profiler import can_profile
+from tools.security import STATS_CLAIM, JWTBearer, decode_access_token
 
 
 @inject
@@ -25,3 +26,18 @@ async def get_current_user(
     if user is None:
         raise cred_exception
     return user
+
+
+async def require_profile_claim(token: str = Depends(JWTBearer())) -> None:
+    """Доступ к профилированию воркера: токен с claim profile (выпускает оператор)."""
+
+    if not can_profile(decode_access_token(token)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+
+
+async def require_stats_claim(token: str = Depends(JWTBearer())) -> None:
+    """Доступ к статистике биржи: токен с claim stats (выпускает оператор)."""
+
+    payload = decode_access_token(token)
+    if not (payload and payload.get(STATS_CLAIM)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from tools.admission import current_latency_target
+from tools.deadline import current_deadline
+
+
+class RequestTimeout:
+    """Срок обработки маршрута вместо срока по умолчанию из DeadlineMiddleware.
+
+    Срок отсчитывается от начала разбора зависимостей и не продлевает срок,
+    переданный клиентом в заголовке. None снимает срок по умолчанию. Время ответа
+    такого маршрута контроль допуска сравнивает с его сроком, а не с общей целью.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+
+    async def __call__(self) -> None:
+        deadline = current_deadline.get()
+        if deadline is not None:
+            deadline.reschedule(self.seconds)
+        target = current_latency_target.get()
+        if target is not None:
+            target.extend(self.seconds)
@@ -0,0 +1,101 @@
+import math
+from collections import defaultdict
+from typing import AsyncIterator, Literal, Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends, HTTPException, Request, status
+
+from dependencies.containers import ServicesContainer
+from interfaces import IRateLimitBackend
+from tools.security import decode_access_token
+
+
+class RateLimit:
+    """Ограничение частоты запросов по алгоритму token bucket.
+
+    `times` запросов за `seconds` секунд с допустимым всплеском `burst`.
+    Ключ корзины строится из маршрута и клиента: id пользователя из JWT (`sub`)
+    при `key="user"` или IP-адреса при `key="ip"` и для анонимных запросов.
+    """
+
+    def __init__(
+        self,
+        times: int,
+        seconds: float,
+        burst: Optional[int] = None,
+        key: Literal["ip", "user"] = "ip",
+    ):
+        self.rate = times / seconds
+        self.capacity = burst or times
+        self.key = key
+
+    @inject
+    async def __call__(
+        self,
+        request: Request,
+        backend: Optional[IRateLimitBackend] = Depends(
+            Provide[ServicesContainer.repositories_container.rate_limit_backend]
+        ),
+    ) -> None:
+        if backend is None:
+            return
+
+        retry_after = await backend.acquire(self._bucket_key(request), self.rate, self.capacity)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много запросов",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    def _bucket_key(self, request: Request) -> str:
+        return f"{_route_key(request)}:{_client_key(request, self.key)}"
+
+
+class ConcurrencyLimit:
+    """Не больше `limit` одновременных запросов маршрута от одного клиента.
+
+    Для дорогих маршрутов, где один запрос занимает воркер надолго (ранжирование,
+    рекомендации, загрузка ленты): частота таких запросов мала, но несколько
+    параллельных от одного пользователя забирают весь воркер. Счётчики — в памяти
+    воркера: при N воркерах клиент получает не больше N * `limit` запросов.
+    """
+
+    def __init__(self, limit: int, key: Literal["ip", "user"] = "user"):
+        self.limit = limit
+        self.key = key
+        self._active: dict[str, int] = defaultdict(int)
+
+    async def __call__(self, request: Request) -> AsyncIterator[None]:
+        key = f"{_route_key(request)}:{_client_key(request, self.key)}"
+        if self._active[key] >= self.limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много одновременных запросов",
+                headers={"Retry-After": "1"},
+            )
+
+        self._active[key] += 1
+        try:
+            yield
+        finally:
+            self._active[key] -= 1
+            if not self._active[key]:
+                del self._active[key]
+
+
+def _route_key(request: Request) -> str:
+    route = request.scope.get("route")
+    path = route.path if route else request.url.path
+    return f"{request.method}:{path}"
+
+
+def _client_key(request: Request, key: Literal["ip", "user"]) -> str:
+    if key == "user":
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        payload = decode_access_token(token) if scheme.lower() == "bearer" else None
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
@@ -1,2 +1,3 @@
-from .i_repository import IRepositoryAsync  # noqa
+from .i_rate_limit import IRateLimitBackend  # noqa
+from .i_repository import IRepositoryAsync, IRepositorySync  # noqa
 from .i_sqlalchemy import ISQLAlchemy  # noqa
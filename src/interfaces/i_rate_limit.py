@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class IRateLimitBackend(ABC):
+    """Хранилище корзин токенов для ограничения частоты запросов."""
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        """Забрать токен из корзины `key`.
+
+        Возвращает 0, если запрос разрешён, иначе число секунд до появления токена.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def purge_idle(self, idle_seconds: float) -> int:
+        """Удалить корзины, к которым не обращались `idle_seconds` секунд.
+
+        Такая корзина уже полна и ничем не отличается от отсутствующей.
+        Возвращает число удалённых корзин.
+        """
+
+        raise NotImplementedError
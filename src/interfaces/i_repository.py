@@ -34,3 +34,37 @@ class IRepositoryAsync(ABC):
         """Удалить объект на основе заданных аргументов."""
 
         raise NotImplementedError
+
+
+class IRepositorySync(ABC):
+    """Базовый интерфейс для синхронного клиента: пакетные задачи и CLI вне цикла событий."""
+
+    @abstractmethod
+    def create(self, *args, **kwargs):
+        """Создать новый объект с заданными аргументами."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def retrieve(self, *args, **kwargs):
+        """Получить объект на основе заданных аргументов."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def retrieve_many(self, *args, **kwargs):
+        """Получить несколько объектов на основе заданных аргументов."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, *args, **kwargs):
+        """Обновить существующий объект заданными аргументами."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *args, **kwargs):
+        """Удалить объект на основе заданных аргументов."""
+
+        raise NotImplementedError
@@ -1,42 +1,251 @@
-import uvicorn
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import cache
+
 from dependency_injector import providers
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
-from config import DBSettings
+from config import DBSettings, ServerSettings, WebSettings
 from config.common import env_file_path
 from dependencies.containers import RepositoriesContainer, ServicesContainer
+from services import JobDuplicateIndex
+from storage.rate_limit import purge_idle_buckets_periodically
 from storage.sqlalchemy.client import SqlAlchemyAsync
-from web.routers import auth_router, job_router, response_router, user_router
+from tools.admission import AdmissionController
+from tools.logs import setup_logging
+from web.middlewares import (
+    AdmissionMiddleware,
+    DeadlineMiddleware,
+    DeadlineStats,
+    ProfileMiddleware,
+    RequestLogMiddleware,
+    add_timeout_handlers,
+)
+from web.routers import (
+    auth_router,
+    debug_router,
+    job_router,
+    response_router,
+    stats_router,
+    user_router,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = app.container
+    tasks = []
+
+    # поток вывода логов запускается в воркере: при preload приложение собрано в мастере
+    log_listener = app.state.log_listener
+    log_listener.start()
+
+    # индексы вакансий (рекомендации, дубликаты) строятся в фоне: приложение принимает
+    # запросы сразу после старта, а векторизация и упаковка идут в потоках
+    job_repository = container.repositories_container.job_repository()
+    for job_index in (container.job_index(), container.job_duplicate_index()):
+        if job_index is not None:
+            tasks.append(asyncio.create_task(job_index.sync(job_repository)))
+
+    settings = app.state.web_settings
+    if settings.stats_refresh_seconds:
+        stats_service = container.stats_service()
+        tasks.append(
+            asyncio.create_task(stats_service.refresh_periodically(settings.stats_refresh_seconds))
+        )
+
+    if settings.purge_interval_seconds:
+        purge_service = container.purge_service()
+        tasks.append(
+            asyncio.create_task(
+                purge_service.purge_periodically(
+                    settings.purge_interval_seconds,
+                    retention=timedelta(seconds=settings.purge_retention_seconds),
+                    batch_size=settings.purge_batch_size,
+                )
+            )
+        )
+
+    rate_limit_backend = container.repositories_container.rate_limit_backend()
+    if rate_limit_backend is not None and settings.rate_limit_purge_interval_seconds:
+        tasks.append(
+            asyncio.create_task(
+                purge_idle_buckets_periodically(
+                    rate_limit_backend,
+                    settings.rate_limit_purge_interval_seconds,
+                    idle_seconds=settings.rate_limit_idle_seconds,
+                )
+            )
+        )
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    if app.state.tracer_provider is not None:
+        app.state.tracer_provider.shutdown()
+    log_listener.stop()
+
+
+def override_with_memory_repositories(repo_container: RepositoriesContainer) -> None:
+    """Подменить репозитории реализациями в памяти с общим хранилищем на воркер."""
+
+    from repositories.memory import (
+        InMemoryJobRepository,
+        InMemoryResponseRepository,
+        InMemoryStatsRepository,
+        InMemoryStore,
+        InMemoryUserRepository,
+    )
+
+    store = providers.Singleton(InMemoryStore)
+    repo_container.user_repository.override(providers.Factory(InMemoryUserRepository, store))
+    repo_container.job_repository.override(providers.Factory(InMemoryJobRepository, store))
+    repo_container.response_repository.override(
+        providers.Factory(InMemoryResponseRepository, store)
+    )
+    repo_container.stats_repository.override(providers.Factory(InMemoryStatsRepository, store))
 
 
 def create_app():
     repo_container = RepositoriesContainer()
     settings = DBSettings(_env_file=env_file_path)
+    web_settings = WebSettings(_env_file=env_file_path)
+    server_settings = ServerSettings(_env_file=env_file_path)
+    log_listener = setup_logging(web_settings.log_level, sql=web_settings.log_sql)
 
     # выбор синхронных / асинхронных реализаций
-    repo_container.db.override(
-        providers.Factory(
-            SqlAlchemyAsync,
-            pg_settings=settings,
-        ),
-    )
+    if settings.repository_backend == "memory":
+        override_with_memory_repositories(repo_container)
+    else:
+        # Singleton: один движок и один пул соединений на воркер
+        repo_container.db.override(
+            providers.Singleton(
+                SqlAlchemyAsync,
+                pg_settings=settings,
+                workers=server_settings.workers,
+            ),
+        )
+    if not web_settings.rate_limit_enabled:
+        repo_container.rate_limit_backend.override(providers.Object(None))
+    elif web_settings.rate_limit_backend == "postgres" and settings.repository_backend != "memory":
+        from storage.sqlalchemy.rate_limit import SqlAlchemyRateLimitBackend
+
+        repo_container.rate_limit_backend.override(
+            providers.Singleton(
+                SqlAlchemyRateLimitBackend,
+                session=repo_container.db.provided.get_db,
+            )
+        )
+
     services_container = ServicesContainer()
     services_container.init_resources()
     services_container.repositories_container.override(repo_container)
+    if web_settings.job_duplicates_enabled:
+        services_container.job_duplicate_index.override(
+            providers.Singleton(JobDuplicateIndex, threshold=web_settings.job_duplicate_threshold)
+        )
+    else:
+        services_container.job_duplicate_index.override(providers.Object(None))
+
+    tracer_provider = None
+    if web_settings.tracing_enabled:
+        # opentelemetry — необязательная зависимость и импортируется только здесь
+        from tools.tracing import instrument_container, instrument_engine, setup_tracing
+
+        tracer_provider = setup_tracing(
+            web_settings.tracing_service_name,
+            exporter=web_settings.tracing_exporter,
+            endpoint=web_settings.tracing_endpoint,
+        )
+        # после всех override: спаны получают и подменённые реализации репозиториев
+        instrument_container(repo_container, "repository")
+        instrument_container(services_container, "service")
+        if settings.repository_backend != "memory":
+            instrument_engine(repo_container.db().engine.sync_engine)
+
+    # wiring только явно перечисленных модулей и только при сборке приложения
+    services_container.wire()
 
     # инициализация приложения
-    app = FastAPI()
+    app = FastAPI(default_response_class=web_settings.default_response_class, lifespan=lifespan)
     app.container = services_container
+    app.state.web_settings = web_settings
+    app.state.log_listener = log_listener
+    app.state.tracer_provider = tracer_provider
+
+    # профиль запроса — самый внутренний слой: кадр middleware в стеке задачи обработчика
+    if web_settings.profiling_enabled:
+        app.add_middleware(ProfileMiddleware)
+        app.include_router(debug_router)
+
+    if web_settings.gzip_enabled:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=web_settings.gzip_minimum_size,
+            compresslevel=web_settings.gzip_compresslevel,
+        )
+
+    # срок запроса внешний: в него входит и сжатие ответа
+    app.state.deadline_stats = DeadlineStats()
+    app.add_middleware(
+        DeadlineMiddleware,
+        default_seconds=web_settings.request_timeout_seconds,
+        header=web_settings.request_timeout_header,
+        stats=app.state.deadline_stats,
+    )
+    add_timeout_handlers(app, app.state.deadline_stats)
+
+    # лимит одновременных запросов внешний: отклонённый запрос не тратит ничего, кроме 503
+    if web_settings.admission_enabled:
+        app.state.admission = AdmissionController(
+            initial_limit=web_settings.admission_initial_limit,
+            min_limit=web_settings.admission_min_limit,
+            max_limit=web_settings.admission_max_limit,
+            latency_target=web_settings.admission_latency_target_seconds,
+            pool_status=(
+                repo_container.db().pool_status if settings.repository_backend != "memory" else None
+            ),
+        )
+        app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+
+    # id запроса выдаётся раньше всех: отклонённые и прерванные запросы тоже попадают в лог
+    app.add_middleware(
+        RequestLogMiddleware,
+        header=web_settings.request_id_header,
+        sample_rates=web_settings.log_sample_rates,
+    )
+
+    # серверный спан — самый внешний слой: в него входят и отклонённые запросы
+    if web_settings.tracing_enabled:
+        from web.tracing import TracingMiddleware
+
+        app.add_middleware(TracingMiddleware)
 
     app.include_router(auth_router)
     app.include_router(user_router)
     app.include_router(job_router)
     app.include_router(response_router)
+    app.include_router(stats_router)
 
     return app
 
 
-app = create_app()
+@cache
+def get_app() -> FastAPI:
+    return create_app()
+
+
+def __getattr__(name: str):
+    # приложение собирается при первом обращении к main.app, а не при импорте модуля
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("main:app", port=8000, reload=True)
@@ -26,7 +26,8 @@ config.set_section_option(section, "PG_DSN", str(settings.pg_sync_dsn))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# При запуске из кода (фикстуры тестов) логирование вызывающего процесса не трогаем
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -72,6 +73,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # соединение может передать вызывающий код: миграции идут в его транзакции
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -0,0 +1,34 @@
+"""Дата изменения вакансии
+
+Revision ID: a84e0f6c21d7
+Revises: 3f1a7c2b9d40
+Create Date: 2026-10-19 11:20:05.102934
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a84e0f6c21d7"
+down_revision = "3f1a7c2b9d40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Дата последнего изменения записи",
+        ),
+    )
+    op.execute("UPDATE jobs SET updated_at = created_at")
+    op.alter_column("jobs", "updated_at", existing_type=sa.DateTime(timezone=True), nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "updated_at")
@@ -0,0 +1,78 @@
+"""Материализованная статистика
+
+Revision ID: e4a71c09b3d2
+Revises: 5b9e2f7d1c48
+Create Date: 2026-10-19 16:50:38.640127
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4a71c09b3d2"
+down_revision = "5b9e2f7d1c48"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "responses",
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Дата создания записи",
+        ),
+    )
+    op.create_index(
+        op.f("ix_responses_created_at"), "responses", ["created_at"], unique=False
+    )
+
+    # одна строка сводки; уникальный индекс нужен для REFRESH ... CONCURRENTLY
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW stats_summary AS
+        SELECT
+            1 AS id,
+            (SELECT count(*) FROM users) AS users_total,
+            (SELECT count(*) FROM users WHERE is_company) AS companies_total,
+            (SELECT count(*) FROM jobs) AS jobs_total,
+            (SELECT count(*) FROM jobs WHERE is_active) AS active_jobs_total,
+            (SELECT count(*) FROM responses) AS responses_total,
+            salaries.salary_from_percentiles,
+            salaries.salary_to_percentiles,
+            now() AS refreshed_at
+        FROM (
+            SELECT
+                percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY salary_from)
+                    AS salary_from_percentiles,
+                percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY salary_to)
+                    AS salary_to_percentiles
+            FROM jobs
+            WHERE is_active
+        ) AS salaries
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX ix_stats_summary_id ON stats_summary (id)")
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW stats_responses_daily AS
+        SELECT
+            (created_at AT TIME ZONE 'UTC')::date AS day,
+            count(*) AS responses
+        FROM responses
+        WHERE created_at >= date_trunc('day', now() AT TIME ZONE 'UTC') - interval '29 days'
+        GROUP BY 1
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX ix_stats_responses_daily_day ON stats_responses_daily (day)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW stats_responses_daily")
+    op.execute("DROP MATERIALIZED VIEW stats_summary")
+    op.drop_index(op.f("ix_responses_created_at"), table_name="responses")
+    op.drop_column("responses", "created_at")
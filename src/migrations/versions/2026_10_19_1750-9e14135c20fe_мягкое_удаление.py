@@ -0,0 +1,181 @@
+"""Мягкое удаление и каскадные внешние ключи
+
+Revision ID: 9e14135c20fe
+Revises: e4a71c09b3d2
+Create Date: 2026-10-19 17:50:11.847648
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e14135c20fe"
+down_revision = "e4a71c09b3d2"
+branch_labels = None
+depends_on = None
+
+FOREIGN_KEYS = [
+    ("jobs_user_id_fkey", "jobs", "users", "user_id"),
+    ("responses_job_id_fkey", "responses", "jobs", "job_id"),
+    ("responses_user_id_fkey", "responses", "users", "user_id"),
+]
+
+STATS_SUMMARY = """
+    CREATE MATERIALIZED VIEW stats_summary AS
+    SELECT
+        1 AS id,
+        (SELECT count(*) FROM users {users_filter}) AS users_total,
+        (SELECT count(*) FROM users WHERE is_company {and_users_filter}) AS companies_total,
+        (SELECT count(*) FROM jobs {jobs_filter}) AS jobs_total,
+        (SELECT count(*) FROM jobs WHERE is_active {and_jobs_filter}) AS active_jobs_total,
+        (SELECT count(*) FROM responses {responses_filter}) AS responses_total,
+        salaries.salary_from_percentiles,
+        salaries.salary_to_percentiles,
+        now() AS refreshed_at
+    FROM (
+        SELECT
+            percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY salary_from)
+                AS salary_from_percentiles,
+            percentile_cont(ARRAY[0.25, 0.5, 0.75]) WITHIN GROUP (ORDER BY salary_to)
+                AS salary_to_percentiles
+        FROM jobs
+        WHERE is_active {and_jobs_filter}
+    ) AS salaries
+"""
+
+STATS_RESPONSES_DAILY = """
+    CREATE MATERIALIZED VIEW stats_responses_daily AS
+    SELECT
+        (created_at AT TIME ZONE 'UTC')::date AS day,
+        count(*) AS responses
+    FROM responses
+    WHERE created_at >= date_trunc('day', now() AT TIME ZONE 'UTC') - interval '29 days'
+        {and_responses_filter}
+    GROUP BY 1
+"""
+
+# отклики удалённых пользователей и вакансий живут до фоновой очистки, в статистику не попадают
+ALIVE_RESPONSES = """
+    NOT EXISTS (
+        SELECT 1 FROM users WHERE users.id = responses.user_id AND users.deleted_at IS NOT NULL
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM jobs WHERE jobs.id = responses.job_id AND jobs.deleted_at IS NOT NULL
+    )
+"""
+
+
+def create_stats_views(soft_delete: bool) -> None:
+    filters = dict(
+        users_filter="WHERE deleted_at IS NULL" if soft_delete else "",
+        and_users_filter="AND deleted_at IS NULL" if soft_delete else "",
+        jobs_filter="WHERE deleted_at IS NULL" if soft_delete else "",
+        and_jobs_filter="AND deleted_at IS NULL" if soft_delete else "",
+        responses_filter=f"WHERE {ALIVE_RESPONSES}" if soft_delete else "",
+        and_responses_filter=f"AND {ALIVE_RESPONSES}" if soft_delete else "",
+    )
+    op.execute(STATS_SUMMARY.format(**filters))
+    op.execute("CREATE UNIQUE INDEX ix_stats_summary_id ON stats_summary (id)")
+    op.execute(STATS_RESPONSES_DAILY.format(**filters))
+    op.execute("CREATE UNIQUE INDEX ix_stats_responses_daily_day ON stats_responses_daily (day)")
+
+
+def drop_stats_views() -> None:
+    op.execute("DROP MATERIALIZED VIEW stats_responses_daily")
+    op.execute("DROP MATERIALIZED VIEW stats_summary")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Дата мягкого удаления",
+        ),
+    )
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Дата мягкого удаления",
+        ),
+    )
+
+    op.drop_constraint("users_email_key", "users", type_="unique")
+    op.create_index(
+        "ix_users_email_not_deleted",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+    op.drop_index(
+        "ix_jobs_active_created_at_id",
+        table_name="jobs",
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_jobs_active_created_at_id",
+        "jobs",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active AND deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_jobs_deleted_at",
+        "jobs",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+    for name, source, referent, column in FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_="foreignkey")
+        op.create_foreign_key(name, source, referent, [column], ["id"], ondelete="CASCADE")
+
+    drop_stats_views()
+    create_stats_views(soft_delete=True)
+
+
+def downgrade() -> None:
+    drop_stats_views()
+    create_stats_views(soft_delete=False)
+
+    for name, source, referent, column in FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_="foreignkey")
+        op.create_foreign_key(name, source, referent, [column], ["id"])
+
+    op.drop_index(
+        "ix_jobs_deleted_at",
+        table_name="jobs",
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    op.drop_index(
+        "ix_jobs_active_created_at_id",
+        table_name="jobs",
+        postgresql_where=sa.text("is_active AND deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_jobs_active_created_at_id",
+        "jobs",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+    # удалённые аккаунты могли освободить email: такие строки нужно удалить до отката
+    op.drop_index(
+        "ix_users_email_not_deleted",
+        table_name="users",
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_unique_constraint("users_email_key", "users", ["email"])
+
+    op.drop_column("jobs", "deleted_at")
+    op.drop_column("users", "deleted_at")
@@ -0,0 +1,34 @@
+"""Индекс вакансий пользователя
+
+Revision ID: 7c3d52a9e0b1
+Revises: 9e14135c20fe
+Create Date: 2026-10-19 18:50:42.318406
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c3d52a9e0b1"
+down_revision = "9e14135c20fe"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_jobs_user_id_created_at_id",
+        "jobs",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_jobs_user_id_created_at_id",
+        table_name="jobs",
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
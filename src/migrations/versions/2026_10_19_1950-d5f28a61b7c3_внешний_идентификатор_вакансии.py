@@ -0,0 +1,34 @@
+"""Внешний идентификатор вакансии
+
+Revision ID: d5f28a61b7c3
+Revises: 7c3d52a9e0b1
+Create Date: 2026-10-19 19:50:12.604913
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d5f28a61b7c3"
+down_revision = "7c3d52a9e0b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "external_id",
+            sa.String(length=255),
+            nullable=True,
+            comment="Идентификатор вакансии в ленте партнёра",
+        ),
+    )
+    op.create_index("ux_jobs_user_id_external_id", "jobs", ["user_id", "external_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ux_jobs_user_id_external_id", table_name="jobs")
+    op.drop_column("jobs", "external_id")
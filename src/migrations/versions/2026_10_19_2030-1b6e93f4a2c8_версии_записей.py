@@ -0,0 +1,38 @@
+"""Версии записей
+
+Revision ID: 1b6e93f4a2c8
+Revises: d5f28a61b7c3
+Create Date: 2026-10-19 20:30:27.915307
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1b6e93f4a2c8"
+down_revision = "d5f28a61b7c3"
+branch_labels = None
+depends_on = None
+
+TABLES = ("users", "jobs", "responses")
+
+
+def upgrade() -> None:
+    # колонка с постоянным значением по умолчанию добавляется без перезаписи таблицы
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version",
+                sa.Integer(),
+                server_default=sa.text("1"),
+                nullable=False,
+                comment="Версия записи, растёт при каждом изменении",
+            ),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "version")
@@ -1,3 +1,6 @@
+from .feed import FeedReport, StageStats  # noqa
 from .job import Job  # noqa
+from .profile import ProfileJob, UserProfile  # noqa
 from .response import Response  # noqa
+from .stats import SalaryPercentiles, Stats  # noqa
 from .user import User  # noqa
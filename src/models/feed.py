@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class FeedReport:
+    """Итог загрузки ленты вакансий: счётчики и пропускная способность по этапам."""
+
+    parsing: StageStats = field(default_factory=StageStats)
+    validation: StageStats = field(default_factory=StageStats)
+    upsert: StageStats = field(default_factory=StageStats)
+    inserted: int = 0
+    updated: int = 0
+    # запись совпала с вакансией в БД, строка не переписывалась
+    unchanged: int = 0
+    # повтор external_id в пределах одной пачки: сохраняется последняя запись
+    duplicates: int = 0
+    invalid: int = 0
+    # первые ошибки проверки записей, не больше max_errors
+    errors: list[str] = field(default_factory=list)
+    # лента не дочитана: ошибка разбора файла; загруженные до неё пачки сохранены
+    error: Optional[str] = None
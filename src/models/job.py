@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
+from datetime import datetime
 from decimal import Decimal
+from typing import Optional
 
 from models.response import Response
 
@@ -13,5 +15,9 @@ class Job:
     salary_from: Decimal
     salary_to: Decimal
     is_active: bool
+    updated_at: Optional[datetime] = None
+    deleted_at: Optional[datetime] = None
+    external_id: Optional[str] = None
+    version: int = 1
 
     responses: list[Response] = field(default_factory=list)
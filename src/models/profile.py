@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+
+from models.job import Job
+from models.response import Response
+from models.user import User
+
+
+@dataclass
+class ProfileJob(Job):
+    responses_total: int = 0
+
+
+@dataclass
+class UserProfile:
+    user: User
+    jobs_total: int
+    active_jobs_total: int
+    # у компании — отклики на её вакансии, у соискателя — его отклики
+    responses_total: int
+    jobs: list[ProfileJob] = field(default_factory=list)
+    responses: list[Response] = field(default_factory=list)
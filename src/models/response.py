@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 
 
 @dataclass
@@ -7,3 +9,5 @@ class Response:
     job_id: int
     user_id: int
     message: str
+    created_at: Optional[datetime] = None
+    version: int = 1
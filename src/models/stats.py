@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+
+@dataclass
+class SalaryPercentiles:
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+
+
+@dataclass
+class Stats:
+    users_total: int
+    companies_total: int
+    jobs_total: int
+    active_jobs_total: int
+    responses_total: int
+    salary_from: SalaryPercentiles
+    salary_to: SalaryPercentiles
+    refreshed_at: datetime
+    responses_per_day: dict[date, int] = field(default_factory=dict)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 
-from models import Job, Response
+from models.job import Job
+from models.response import Response
 
 
 @dataclass
@@ -10,6 +11,7 @@ class User:
     email: str
     hashed_password: str
     is_company: bool
+    version: int = 1
 
     jobs: list[Job] = field(default_factory=list)
     responses: list[Response] = field(default_factory=list)
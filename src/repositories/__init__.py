@@ -1,3 +1,4 @@
 from .job_repository import JobRepository  # noqa
 from .response_repository import ResponseRepository  # noqa
+from .stats_repository import StatsRepository  # noqa
 from .user_repository import UserRepository  # noqa
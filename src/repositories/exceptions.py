@@ -8,3 +8,15 @@ class UniqueError(RepositoryError):
 
 class EntityNotFoundError(RepositoryError):
     """Сущность не найдена"""
+
+
+class CheckViolationError(RepositoryError):
+    """Значения записи после изменения нарушают её ограничение"""
+
+
+class VersionConflictError(RepositoryError):
+    """Запись изменена после чтения: версия не совпала"""
+
+    def __init__(self, message: str, version: int):
+        super().__init__(message)
+        self.version = version
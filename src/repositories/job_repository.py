@@ -1,32 +1,188 @@
 from contextlib import AbstractContextManager
-from typing import Callable
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    Delete,
+    Insert,
+    Select,
+    Update,
+    bindparam,
+    delete,
+    literal_column,
+    null,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session, selectinload
 
 from interfaces import IRepositoryAsync
 from models import Job as JobModel
-from repositories.exceptions import EntityNotFoundError
+from repositories.exceptions import CheckViolationError, EntityNotFoundError, VersionConflictError
+from repositories.soft_delete import now, response_is_visible
+from repositories.statements import (
+    BY_ID,
+    FilterKey,
+    filter_by_params,
+    filter_key,
+    filter_params,
+    patch_query,
+    version_query,
+)
 from storage.sqlalchemy.tables import Job
 from tools import to_model, update_fields
-from web.schemas import JobCreateSchema
+from web.schemas import JobCreateSchema, JobFeedItemSchema
 
+RETRIEVE_VERSION = select(Job.updated_at).filter_by(id=bindparam("id"), deleted_at=None).limit(1)
 
-class JobRepository(IRepositoryAsync):
+FEED_FIELDS = ("title", "description", "salary_from", "salary_to", "is_active")
+
+
+def upsert_query() -> Insert:
+    """INSERT ... ON CONFLICT (user_id, external_id) DO UPDATE для вакансий из ленты.
+
+    Строка переписывается, только если поля из ленты изменились или вакансия была
+    удалена: повторная загрузка той же ленты не плодит версии строк и не сдвигает
+    updated_at, по которому синхронизируются индексы в памяти. RETURNING отдаёт
+    только вставленные и изменённые строки, xmax = 0 отличает вставку от обновления.
+
+    Пачка строк уходит одной командой (insertmanyvalues) только пока параметры есть
+    лишь в VALUES: поэтому NULL и 0 вне VALUES записаны литералами, а вставка идёт в
+    таблицу, а не через ORM.
+    """
+
+    query = insert(Job.__table__)
+    excluded = query.excluded
+    changed = or_(
+        Job.deleted_at.is_not(None),
+        tuple_(*(Job.__table__.c[field] for field in FEED_FIELDS)).is_distinct_from(
+            tuple_(*(excluded[field] for field in FEED_FIELDS))
+        ),
+    )
+    return query.on_conflict_do_update(
+        index_elements=[Job.user_id, Job.external_id],
+        set_={
+            **{field: excluded[field] for field in FEED_FIELDS},
+            "updated_at": excluded.updated_at,
+            "deleted_at": null(),
+            "version": Job.__table__.c.version + literal_column("1"),
+        },
+        where=changed,
+    ).returning(literal_column("xmax = 0", Boolean))
+
+
+UPSERT_JOBS = upsert_query()
+
+
+class JobQueries:
+    """Запросы вакансий, общие для асинхронного и синхронного репозиториев."""
+
+    @staticmethod
+    def _new_job(user_id: int, job_create_dto: JobCreateSchema) -> Job:
+        return Job(
+            user_id=user_id,
+            title=job_create_dto.title,
+            description=job_create_dto.description,
+            salary_from=job_create_dto.salary_from,
+            salary_to=job_create_dto.salary_to,
+            is_active=job_create_dto.is_active,
+        )
+
+    @staticmethod
+    def _upsert_rows(user_id: int, jobs: list[JobFeedItemSchema]) -> list[dict]:
+        updated_at = now()
+        return [
+            dict(
+                user_id=user_id,
+                external_id=job.external_id,
+                **job.model_dump(include=set(FEED_FIELDS)),
+                created_at=updated_at,
+                updated_at=updated_at,
+            )
+            for job in jobs
+        ]
+
+    @staticmethod
+    def _upsert_counts(inserted: list[bool]) -> tuple[int, int]:
+        return sum(inserted), len(inserted) - sum(inserted)
+
+    @staticmethod
+    def _apply_update(job: Job, job_update_dto: JobCreateSchema) -> Job:
+        updated_job = update_fields(job_update_dto.model_dump(), job)
+        updated_job.updated_at = now()
+        updated_job.version = Job.version + 1
+        return updated_job
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _retrieve_query(key: FilterKey, include_relations: bool) -> Select:
+        query = filter_by_params(select(Job).filter_by(deleted_at=None), key).limit(1)
+        if include_relations:
+            query = query.options(JobQueries._relations())
+        return query
+
+    @staticmethod
+    def _relations():
+        return selectinload(Job.responses.and_(response_is_visible()))
+
+    @staticmethod
+    def _by_ids(ids: list[int]) -> Select:
+        return select(Job).filter(Job.id.in_(ids), Job.deleted_at.is_(None))
+
+    @staticmethod
+    def _updated_since(since: Optional[datetime], batch_size: int) -> Select:
+        query = select(Job).order_by(Job.updated_at, Job.id).execution_options(yield_per=batch_size)
+        if since is not None:
+            query = query.filter(Job.updated_at >= since)
+        return query
+
+    @staticmethod
+    def _soft_delete(id: int, user_id: int) -> Update:
+        deleted_at = now()
+        return (
+            update(Job)
+            .filter_by(id=id, user_id=user_id, deleted_at=None)
+            .values(deleted_at=deleted_at, updated_at=deleted_at)
+            .returning(Job)
+        )
+
+    @staticmethod
+    def _purge(before: datetime, batch_size: int) -> Delete:
+        ids = (
+            select(Job.id)
+            .filter(Job.deleted_at < before)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return delete(Job).filter(Job.id.in_(ids.scalar_subquery()))
+
+    @staticmethod
+    def _paginate(query: Select, limit: int, skip: int, is_active: Optional[bool]) -> Select:
+        query = (
+            query.filter(Job.deleted_at.is_(None))
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .limit(limit)
+            .offset(skip)
+        )
+        if is_active is not None:
+            # is_active=True обслуживается частичным индексом ix_jobs_active_created_at_id;
+            # условие через "=", а не IS TRUE: иначе планировщик не сопоставит его с индексом
+            query = query.filter(Job.is_active == is_active)
+        return query
+
+
+class JobRepository(JobQueries, IRepositoryAsync):
     def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
         self.session = session
 
     async def create(self, user_id: int, job_create_dto: JobCreateSchema) -> JobModel:
         async with self.session() as session:
-            job = Job(
-                user_id=user_id,
-                title=job_create_dto.title,
-                description=job_create_dto.description,
-                salary_from=job_create_dto.salary_from,
-                salary_to=job_create_dto.salary_to,
-                is_active=job_create_dto.is_active,
-            )
-
+            job = self._new_job(user_id, job_create_dto)
             session.add(job)
             await session.commit()
             await session.refresh(job)
@@ -35,11 +191,8 @@ class JobRepository(IRepositoryAsync):
 
     async def retrieve(self, include_relations: bool = False, **kwargs) -> JobModel:
         async with self.session() as session:
-            query = select(Job).filter_by(**kwargs).limit(1)
-            if include_relations:
-                query = query.options(selectinload(Job.responses))
-
-            res = await session.execute(query)
+            query = self._retrieve_query(filter_key(kwargs), include_relations)
+            res = await session.execute(query, filter_params(kwargs))
             job_from_db = res.scalars().first()
             if not job_from_db:
                 raise EntityNotFoundError("Вакансия не найдена")
@@ -47,12 +200,16 @@ class JobRepository(IRepositoryAsync):
         return to_model(job_from_db, JobModel)
 
     async def retrieve_many(
-        self, limit: int = 100, skip: int = 0, include_relations: bool = False
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        include_relations: bool = False,
+        is_active: Optional[bool] = None,
     ) -> list[JobModel]:
         async with self.session() as session:
-            query = select(Job).limit(limit).offset(skip)
+            query = self._paginate(select(Job), limit=limit, skip=skip, is_active=is_active)
             if include_relations:
-                query = query.options(selectinload(Job.responses))
+                query = query.options(self._relations())
 
             res = await session.execute(query)
             jobs_from_db = res.scalars().all()
@@ -64,16 +221,56 @@ class JobRepository(IRepositoryAsync):
 
         return jobs_model
 
-    async def update(self, id: int, job_update_dto: JobCreateSchema) -> JobModel:
+    async def retrieve_many_by_ids(self, ids: list[int]) -> list[JobModel]:
+        async with self.session() as session:
+            res = await session.execute(self._by_ids(ids))
+            jobs_from_db = {job.id: job for job in res.scalars().all()}
+
+        return [to_model(jobs_from_db[id], JobModel) for id in ids if id in jobs_from_db]
+
+    async def iter_updated_since(
+        self, since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[JobModel]:
+        """Потоково отдаёт вакансии, изменённые начиная с `since`, в порядке изменения.
+
+        Это лента изменений для индексов в памяти, поэтому в неё попадают и удалённые
+        вакансии: по deleted_at индекс понимает, что вакансию нужно убрать.
+        """
+
+        async with self.session() as session:
+            res = await session.stream_scalars(self._updated_since(since, batch_size))
+            async for job in res:
+                yield to_model(job, JobModel)
+
+    async def retrieve_version(self, id: int) -> datetime:
         async with self.session() as session:
-            query = select(Job).filter_by(id=id).limit(1)
+            res = await session.execute(RETRIEVE_VERSION, {"id": id})
+            updated_at = res.scalars().first()
+            if not updated_at:
+                raise EntityNotFoundError("Вакансия не найдена")
+
+        return updated_at
+
+    async def retrieve_many_versions(
+        self, limit: int = 100, skip: int = 0, is_active: Optional[bool] = None
+    ) -> list[tuple[int, datetime]]:
+        async with self.session() as session:
+            query = self._paginate(
+                select(Job.id, Job.updated_at), limit=limit, skip=skip, is_active=is_active
+            )
             res = await session.execute(query)
+
+        return [(id, updated_at) for id, updated_at in res.all()]
+
+    async def update(self, id: int, job_update_dto: JobCreateSchema) -> JobModel:
+        async with self.session() as session:
+            res = await session.execute(self._retrieve_query(BY_ID, False), {"id": id})
             job_from_db = res.scalars().first()
 
             if not job_from_db:
                 raise EntityNotFoundError("Вакансия не найдена")
 
-            updated_job = update_fields(job_update_dto.model_dump(), job_from_db)
+            updated_job = self._apply_update(job_from_db, job_update_dto)
 
             session.add(updated_job)
             await session.commit()
@@ -81,16 +278,84 @@ class JobRepository(IRepositoryAsync):
 
         return to_model(job_from_db, JobModel)
 
-    async def delete(self, id: int, user_id: int):
+    async def patch(
+        self, id: int, user_id: int, values: dict, version: Optional[int] = None
+    ) -> JobModel:
+        """Изменить переданные поля вакансии одним UPDATE, не читая её.
+
+        Вакансия другого работодателя не отличается от отсутствующей. С `version`
+        вакансия меняется, только если её не изменили после чтения клиентом.
+        Если передана одна граница зарплаты, она сравнивается с сохранённой второй
+        в той же команде: зарплата 'от' не может стать больше зарплаты 'до'.
+        """
+
+        filters = dict(id=id, user_id=user_id, deleted_at=None)
+        salary_range = self._salary_range(values)
         async with self.session() as session:
-            query = select(Job).filter_by(id=id, user_id=user_id).limit(1)
+            query = patch_query(
+                Job, {**values, "updated_at": now()}, version, *salary_range, **filters
+            )
             res = await session.execute(query)
             job_from_db = res.scalars().first()
 
+            if not job_from_db:
+                current = await session.scalar(version_query(Job, **filters))
+                if current is None:
+                    raise EntityNotFoundError("Вакансия не найдена")
+                if salary_range and (version is None or current == version):
+                    raise CheckViolationError("Зарплата 'от' не может быть больше зарплаты 'до'")
+                raise VersionConflictError("Вакансия изменена другим запросом", current)
+            await session.commit()
+
+        return to_model(job_from_db, JobModel)
+
+    @staticmethod
+    def _salary_range(values: dict) -> list:
+        # обе границы в одном PATCH проверяет схема, одну — условие на сохранённую вторую
+        salary_from, salary_to = values.get("salary_from"), values.get("salary_to")
+        if salary_from is not None and "salary_to" not in values:
+            return [Job.salary_to >= salary_from]
+        if salary_to is not None and "salary_from" not in values:
+            return [Job.salary_from <= salary_to]
+        return []
+
+    async def upsert_many(self, user_id: int, jobs: list[JobFeedItemSchema]) -> tuple[int, int]:
+        """Вставить или обновить вакансии работодателя по external_id одной командой.
+
+        Возвращает число вставленных и обновлённых строк; external_id в `jobs`
+        не должны повторяться.
+        """
+
+        if not jobs:
+            return 0, 0
+        async with self.session() as session:
+            res = await session.execute(UPSERT_JOBS, self._upsert_rows(user_id, jobs))
+            inserted = res.scalars().all()
+            await session.commit()
+
+        return self._upsert_counts(inserted)
+
+    async def delete(self, id: int, user_id: int):
+        """Мягкое удаление: отклики остаются в БД до фоновой очистки."""
+
+        async with self.session() as session:
+            res = await session.execute(self._soft_delete(id, user_id))
+            job_from_db = res.scalars().first()
+
             if not job_from_db:
                 raise EntityNotFoundError("Вакансия не найдена")
-            else:
-                await session.delete(job_from_db)
-                await session.commit()
+            await session.commit()
 
         return to_model(job_from_db, JobModel)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        """Окончательно удалить пачку вакансий, помеченных удалёнными раньше `before`.
+
+        Оставшиеся отклики удаляет каскад ON DELETE CASCADE.
+        """
+
+        async with self.session() as session:
+            res = await session.execute(self._purge(before, batch_size))
+            await session.commit()
+
+        return res.rowcount
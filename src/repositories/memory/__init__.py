@@ -0,0 +1,5 @@
+from .job_repository import InMemoryJobRepository  # noqa
+from .response_repository import InMemoryResponseRepository  # noqa
+from .stats_repository import InMemoryStatsRepository  # noqa
+from .store import InMemoryStore  # noqa
+from .user_repository import InMemoryUserRepository  # noqa
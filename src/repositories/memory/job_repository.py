@@ -0,0 +1,181 @@
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from interfaces import IRepositoryAsync
+from models import Job as JobModel
+from models import Response as ResponseModel
+from repositories.exceptions import CheckViolationError, EntityNotFoundError, VersionConflictError
+from repositories.job_repository import FEED_FIELDS
+from repositories.memory.store import InMemoryStore, JobRow, matches
+from repositories.soft_delete import now
+from tools import to_model, update_fields
+from web.schemas import JobCreateSchema, JobFeedItemSchema
+
+
+class InMemoryJobRepository(IRepositoryAsync):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, user_id: int, job_create_dto: JobCreateSchema) -> JobModel:
+        if user_id not in self.store.users:
+            raise EntityNotFoundError("Связанная запись не найдена")
+
+        created_at = now()
+        job = JobRow(
+            id=next(self.store.job_ids),
+            user_id=user_id,
+            title=job_create_dto.title,
+            description=job_create_dto.description,
+            salary_from=job_create_dto.salary_from,
+            salary_to=job_create_dto.salary_to,
+            is_active=job_create_dto.is_active,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        self.store.add_job(job)
+        return to_model(job, JobModel)
+
+    async def retrieve(self, include_relations: bool = False, **kwargs) -> JobModel:
+        if kwargs.keys() == {"id"}:
+            candidates = [self.store.jobs.get(kwargs["id"])]
+        else:
+            candidates = self.store.jobs.values()
+
+        for job in candidates:
+            if job is not None and job.deleted_at is None and matches(job, kwargs):
+                return self._to_model(job, include_relations)
+        raise EntityNotFoundError("Вакансия не найдена")
+
+    async def retrieve_many(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        include_relations: bool = False,
+        is_active: Optional[bool] = None,
+    ) -> list[JobModel]:
+        return [
+            self._to_model(job, include_relations) for job in self._page(limit, skip, is_active)
+        ]
+
+    async def retrieve_many_by_ids(self, ids: list[int]) -> list[JobModel]:
+        jobs = (self.store.jobs.get(id) for id in ids)
+        return [to_model(job, JobModel) for job in jobs if job and job.deleted_at is None]
+
+    async def iter_updated_since(
+        self, since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> AsyncIterator[JobModel]:
+        """Вакансии, изменённые начиная с `since`, в порядке изменения, включая удалённые."""
+
+        for _, id in self.store.changes.since((since, 0) if since else None):
+            job = self.store.jobs.get(id)
+            if job is not None:
+                yield to_model(job, JobModel)
+
+    async def retrieve_version(self, id: int) -> datetime:
+        job = self.store.jobs.get(id)
+        if job is None or job.deleted_at is not None:
+            raise EntityNotFoundError("Вакансия не найдена")
+        return job.updated_at
+
+    async def retrieve_many_versions(
+        self, limit: int = 100, skip: int = 0, is_active: Optional[bool] = None
+    ) -> list[tuple[int, datetime]]:
+        return [(job.id, job.updated_at) for job in self._page(limit, skip, is_active)]
+
+    async def update(self, id: int, job_update_dto: JobCreateSchema) -> JobModel:
+        job = self.store.jobs.get(id)
+        if job is None or job.deleted_at is not None:
+            raise EntityNotFoundError("Вакансия не найдена")
+
+        # изменения собираются на копии: индексы хранилища перестраиваются по старым ключам
+        updated = update_fields(job_update_dto.model_dump(), JobRow(**vars(job)))
+        updated.updated_at = now()
+        updated.version = job.version + 1
+        self.store.change_job(job, **vars(updated))
+        return to_model(job, JobModel)
+
+    async def patch(
+        self, id: int, user_id: int, values: dict, version: Optional[int] = None
+    ) -> JobModel:
+        job = self.store.jobs.get(id)
+        if job is None or job.user_id != user_id or job.deleted_at is not None:
+            raise EntityNotFoundError("Вакансия не найдена")
+        if version is not None and job.version != version:
+            raise VersionConflictError("Вакансия изменена другим запросом", job.version)
+        salary_from = values.get("salary_from", job.salary_from)
+        salary_to = values.get("salary_to", job.salary_to)
+        if salary_from is not None and salary_to is not None and salary_from > salary_to:
+            raise CheckViolationError("Зарплата 'от' не может быть больше зарплаты 'до'")
+
+        self.store.change_job(job, **values, updated_at=now(), version=job.version + 1)
+        return to_model(job, JobModel)
+
+    async def upsert_many(self, user_id: int, jobs: list[JobFeedItemSchema]) -> tuple[int, int]:
+        if jobs and user_id not in self.store.users:
+            raise EntityNotFoundError("Связанная запись не найдена")
+
+        inserted = updated = 0
+        updated_at = now()
+        for job_dto in jobs:
+            values = job_dto.model_dump(include=set(FEED_FIELDS))
+            id = self.store.external_jobs.get((user_id, job_dto.external_id))
+            if id is None:
+                job = JobRow(
+                    id=next(self.store.job_ids),
+                    user_id=user_id,
+                    external_id=job_dto.external_id,
+                    created_at=updated_at,
+                    updated_at=updated_at,
+                    **values,
+                )
+                self.store.add_job(job)
+                inserted += 1
+                continue
+
+            job = self.store.jobs[id]
+            if job.deleted_at is None and all(
+                getattr(job, field) == value for field, value in values.items()
+            ):
+                continue
+            self.store.change_job(
+                job, updated_at=updated_at, deleted_at=None, version=job.version + 1, **values
+            )
+            updated += 1
+        return inserted, updated
+
+    async def delete(self, id: int, user_id: int) -> JobModel:
+        """Мягкое удаление: отклики остаются в хранилище до очистки."""
+
+        job = self.store.jobs.get(id)
+        if job is None or job.user_id != user_id or job.deleted_at is not None:
+            raise EntityNotFoundError("Вакансия не найдена")
+
+        deleted_at = now()
+        self.store.change_job(job, deleted_at=deleted_at, updated_at=deleted_at)
+        return to_model(job, JobModel)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        keys = self.store.deleted_jobs.before((before, 0), batch_size)
+        for _, id in keys:
+            self.store.remove_job(id)
+        return len(keys)
+
+    def _page(self, limit: int, skip: int, is_active: Optional[bool]) -> list[JobRow]:
+        if is_active is None:
+            feed = self.store.feed
+        else:
+            feed = self.store.active_feed if is_active else self.store.inactive_feed
+        return [self.store.jobs[-id] for _, id in feed.page(limit, skip)]
+
+    def _to_model(self, job: JobRow, include_relations: bool) -> JobModel:
+        model = to_model(job, JobModel)
+        if include_relations:
+            responses = (
+                self.store.responses[id] for id in self.store.job_responses.get(job.id, ())
+            )
+            model.responses = [
+                to_model(response, ResponseModel)
+                for response in responses
+                if self.store.response_is_visible(response)
+            ]
+        return model
@@ -0,0 +1,135 @@
+from bisect import bisect_right
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Iterable, Optional
+
+from interfaces import IRepositoryAsync
+from models import Response as ResponseModel
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
+from repositories.memory.store import InMemoryStore, ResponseRow, matches
+from repositories.soft_delete import now
+from tools import to_model, update_fields
+from web.schemas import ResponseCreateSchema, ResponseUpdateSchema
+
+
+class InMemoryResponseRepository(IRepositoryAsync):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(
+        self, user_id: int, job_id: int, response_create_dto: ResponseCreateSchema
+    ) -> ResponseModel:
+        job = self.store.jobs.get(job_id)
+        if job is None or job.deleted_at is not None:
+            raise EntityNotFoundError("Вакансия не найдена")
+        if user_id not in self.store.users:
+            raise EntityNotFoundError("Связанная запись не найдена")
+        if (user_id, job_id) in self.store.response_pairs:
+            raise UniqueError("Вы уже откликнулись на эту вакансию")
+
+        response = ResponseRow(
+            id=next(self.store.response_ids),
+            job_id=job_id,
+            user_id=user_id,
+            message=response_create_dto.message,
+            created_at=now(),
+        )
+        self.store.add_response(response)
+        return to_model(response, ResponseModel)
+
+    async def retrieve(self, **kwargs) -> ResponseModel:
+        for response in self._candidates(kwargs):
+            return to_model(response, ResponseModel)
+        raise EntityNotFoundError("Отклик не найден")
+
+    async def retrieve_many(self, limit: int = 100, skip: int = 0, **kwargs) -> list[ResponseModel]:
+        responses = islice(self._candidates(kwargs), skip, skip + limit)
+        return [to_model(response, ResponseModel) for response in responses]
+
+    async def retrieve_many_by_ids(self, ids: list[int]) -> list[ResponseModel]:
+        responses = (self.store.responses.get(id) for id in ids)
+        return [
+            to_model(response, ResponseModel)
+            for response in responses
+            if response is not None and self.store.response_is_visible(response)
+        ]
+
+    async def iter_by_job(
+        self, job_id: int, after_id: Optional[int] = None, batch_size: int = 1000
+    ) -> AsyncIterator[ResponseModel]:
+        ids = self.store.job_responses.get(job_id, [])
+        start = bisect_right(ids, after_id) if after_id is not None else 0
+        for id in ids[start:]:
+            response = self.store.responses.get(id)
+            if response is not None and self.store.response_is_visible(response):
+                yield to_model(response, ResponseModel)
+
+    async def update(self, id: int, response_update_dto: ResponseUpdateSchema) -> ResponseModel:
+        response = self._visible(id)
+        update_fields(response_update_dto.model_dump(), response)
+        response.version += 1
+        return to_model(response, ResponseModel)
+
+    async def patch(
+        self, id: int, user_id: int, values: dict, version: Optional[int] = None
+    ) -> ResponseModel:
+        response = self._visible(id)
+        if response.user_id != user_id:
+            raise EntityNotFoundError("Отклик не найден")
+        if version is not None and response.version != version:
+            raise VersionConflictError("Отклик изменён другим запросом", response.version)
+
+        for field, value in values.items():
+            setattr(response, field, value)
+        response.version += 1
+        return to_model(response, ResponseModel)
+
+    async def delete(self, id: int, user_id: int) -> None:
+        response = self._visible(id)
+        if response.user_id != user_id:
+            raise EntityNotFoundError("Отклик не найден")
+        self.store.remove_response(id)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        """Удалить пачку откликов пользователей и вакансий, удалённых раньше `before`."""
+
+        ids = []
+        for index, owned in (
+            (self.store.deleted_jobs, self.store.job_responses),
+            (self.store.deleted_users, self.store.user_responses),
+        ):
+            for _, owner_id in index.before((before, 0), len(index)):
+                ids.extend(islice(owned.get(owner_id, ()), batch_size - len(ids)))
+                if len(ids) >= batch_size:
+                    break
+
+        # отклик удалённого пользователя на удалённую вакансию попадает в список дважды
+        ids = list(dict.fromkeys(ids))
+        for id in ids:
+            self.store.remove_response(id)
+        return len(ids)
+
+    def _visible(self, id: int) -> ResponseRow:
+        response = self.store.responses.get(id)
+        if response is None or not self.store.response_is_visible(response):
+            raise EntityNotFoundError("Отклик не найден")
+        return response
+
+    def _candidates(self, kwargs: dict) -> Iterable[ResponseRow]:
+        if "id" in kwargs:
+            ids = [kwargs["id"]]
+        elif "job_id" in kwargs:
+            ids = self.store.job_responses.get(kwargs["job_id"], [])
+        elif "user_id" in kwargs:
+            ids = sorted(self.store.user_responses.get(kwargs["user_id"], ()))
+        else:
+            ids = self.store.responses
+
+        for id in list(ids):
+            response = self.store.responses.get(id)
+            if (
+                response is not None
+                and matches(response, kwargs)
+                and self.store.response_is_visible(response)
+            ):
+                yield response
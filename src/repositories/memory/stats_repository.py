@@ -0,0 +1,70 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from models import SalaryPercentiles, Stats
+from repositories.memory.store import InMemoryStore
+from repositories.soft_delete import now
+
+PERCENTILES = (0.25, 0.5, 0.75)
+DAILY_RESPONSES_DAYS = 30
+
+
+class InMemoryStatsRepository:
+    """Статистика по хранилищу в памяти: считается при каждом запросе, пересчёт не нужен."""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def retrieve(self) -> Stats:
+        users = [user for user in self.store.users.values() if user.deleted_at is None]
+        jobs = [job for job in self.store.jobs.values() if job.deleted_at is None]
+        active_jobs = [job for job in jobs if job.is_active]
+        responses = [
+            response
+            for response in self.store.responses.values()
+            if self.store.response_is_visible(response)
+        ]
+
+        refreshed_at = now()
+        since = datetime.combine(
+            refreshed_at.date() - timedelta(days=DAILY_RESPONSES_DAYS - 1),
+            datetime.min.time(),
+            timezone.utc,
+        )
+        daily = Counter(
+            response.created_at.astimezone(timezone.utc).date()
+            for response in responses
+            if response.created_at >= since
+        )
+
+        return Stats(
+            users_total=len(users),
+            companies_total=sum(user.is_company for user in users),
+            jobs_total=len(jobs),
+            active_jobs_total=len(active_jobs),
+            responses_total=len(responses),
+            salary_from=percentiles([job.salary_from for job in active_jobs]),
+            salary_to=percentiles([job.salary_to for job in active_jobs]),
+            refreshed_at=refreshed_at,
+            responses_per_day=dict(sorted(daily.items())),
+        )
+
+    async def refresh(self, max_age: timedelta = timedelta(0)) -> bool:
+        return True
+
+
+def percentiles(values: list) -> SalaryPercentiles:
+    """Перцентили с линейной интерполяцией, как percentile_cont в PostgreSQL."""
+
+    values = sorted(float(value) for value in values if value is not None)
+    return SalaryPercentiles(*(percentile_cont(values, fraction) for fraction in PERCENTILES))
+
+
+def percentile_cont(values: list[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    position = fraction * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
@@ -0,0 +1,241 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from itertools import count
+from typing import Optional
+
+FeedKey = tuple[float, int]
+ChangeKey = tuple[datetime, int]
+
+
+@dataclass
+class UserRow:
+    id: int
+    name: str
+    email: str
+    hashed_password: str
+    is_company: bool
+    created_at: datetime
+    deleted_at: Optional[datetime] = None
+    version: int = 1
+
+    @property
+    def deleted_key(self) -> Optional[ChangeKey]:
+        return (self.deleted_at, self.id) if self.deleted_at else None
+
+
+@dataclass
+class JobRow:
+    id: int
+    user_id: int
+    title: str
+    description: str
+    salary_from: Decimal
+    salary_to: Decimal
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: Optional[datetime] = None
+    external_id: Optional[str] = None
+    version: int = 1
+
+    @property
+    def feed_key(self) -> FeedKey:
+        # лента идёт от новых к старым: ключ по убыванию created_at и id
+        return -self.created_at.timestamp(), -self.id
+
+    @property
+    def change_key(self) -> ChangeKey:
+        return self.updated_at, self.id
+
+    @property
+    def deleted_key(self) -> Optional[ChangeKey]:
+        return (self.deleted_at, self.id) if self.deleted_at else None
+
+
+@dataclass
+class ResponseRow:
+    id: int
+    job_id: int
+    user_id: int
+    message: Optional[str]
+    created_at: datetime
+    version: int = 1
+
+
+class SortedKeys:
+    """Отсортированный список ключей: вставка и удаление через bisect, срезы для страниц."""
+
+    def __init__(self) -> None:
+        self._keys: list = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key) -> None:
+        insort(self._keys, key)
+
+    def discard(self, key) -> None:
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def page(self, limit: int, skip: int) -> list:
+        end = skip + limit
+        return self._keys[skip:end]
+
+    def before(self, key, limit: int) -> list:
+        end = min(bisect_left(self._keys, key), limit)
+        return self._keys[:end]
+
+    def since(self, key=None) -> list:
+        """Копия ключей начиная с `key` (все ключи, если он не задан)."""
+
+        start = bisect_left(self._keys, key) if key is not None else 0
+        return self._keys[start:]
+
+
+class InMemoryStore:
+    """Таблицы пользователей, вакансий и откликов в памяти процесса.
+
+    Общая для всех репозиториев воркера: ограничения между таблицами (внешние ключи,
+    каскад при очистке) проверяются по одному хранилищу. Рядом со строками
+    поддерживаются индексы под запросы репозиториев, как в схеме БД.
+    """
+
+    def __init__(self) -> None:
+        self.users: dict[int, UserRow] = {}
+        self.jobs: dict[int, JobRow] = {}
+        self.responses: dict[int, ResponseRow] = {}
+
+        self.user_ids = count(1)
+        self.job_ids = count(1)
+        self.response_ids = count(1)
+
+        # уникальный индекс email среди неудалённых пользователей
+        self.emails: dict[str, int] = {}
+        self.user_jobs: dict[int, set[int]] = defaultdict(set)
+        self.user_responses: dict[int, set[int]] = defaultdict(set)
+        # id откликов вакансии по возрастанию: новые id всегда больше прежних
+        self.job_responses: dict[int, list[int]] = defaultdict(list)
+        self.response_pairs: dict[tuple[int, int], int] = {}
+        # уникальный индекс (user_id, external_id) вакансий из лент партнёров
+        self.external_jobs: dict[tuple[int, str], int] = {}
+
+        # лента неудалённых вакансий, отдельно активных и неактивных (как частичные индексы
+        # jobs в Postgres), лента изменений для индексов
+        self.feed = SortedKeys()
+        self.active_feed = SortedKeys()
+        self.inactive_feed = SortedKeys()
+        self.changes = SortedKeys()
+        # мягко удалённые записи по дате удаления: очистка берёт самые старые
+        self.deleted_users = SortedKeys()
+        self.deleted_jobs = SortedKeys()
+
+    def add_user(self, user: UserRow) -> None:
+        self.users[user.id] = user
+        self.emails[user.email] = user.id
+
+    def change_user(self, user: UserRow, **values) -> None:
+        """Изменить поля пользователя, сохранив индексы согласованными."""
+
+        if self.emails.get(user.email) == user.id:
+            del self.emails[user.email]
+        if user.deleted_at is not None:
+            self.deleted_users.discard(user.deleted_key)
+        for field, value in values.items():
+            setattr(user, field, value)
+        if user.deleted_at is None:
+            self.emails[user.email] = user.id
+        else:
+            self.deleted_users.add(user.deleted_key)
+
+    def add_job(self, job: JobRow) -> None:
+        self.jobs[job.id] = job
+        self.user_jobs[job.user_id].add(job.id)
+        if job.external_id is not None:
+            self.external_jobs[job.user_id, job.external_id] = job.id
+        self.changes.add(job.change_key)
+        self._add_to_feed(job)
+
+    def change_job(self, job: JobRow, **values) -> None:
+        """Изменить поля вакансии, сохранив индексы согласованными."""
+
+        self.changes.discard(job.change_key)
+        self._remove_from_feed(job)
+        if job.deleted_at is not None:
+            self.deleted_jobs.discard(job.deleted_key)
+        for field, value in values.items():
+            setattr(job, field, value)
+        self.changes.add(job.change_key)
+        self._add_to_feed(job)
+        if job.deleted_at is not None:
+            self.deleted_jobs.add(job.deleted_key)
+
+    def remove_job(self, id: int) -> None:
+        job = self.jobs.pop(id)
+        self.changes.discard(job.change_key)
+        if job.deleted_at is not None:
+            self.deleted_jobs.discard(job.deleted_key)
+        self._remove_from_feed(job)
+        self.user_jobs[job.user_id].discard(id)
+        if job.external_id is not None:
+            del self.external_jobs[job.user_id, job.external_id]
+        for response_id in list(self.job_responses.get(id, ())):
+            self.remove_response(response_id)
+        self.job_responses.pop(id, None)
+
+    def add_response(self, response: ResponseRow) -> None:
+        self.responses[response.id] = response
+        self.user_responses[response.user_id].add(response.id)
+        self.job_responses[response.job_id].append(response.id)
+        self.response_pairs[response.user_id, response.job_id] = response.id
+
+    def remove_response(self, id: int) -> None:
+        response = self.responses.pop(id)
+        self.user_responses[response.user_id].discard(id)
+        job_responses = self.job_responses.get(response.job_id)
+        if job_responses:
+            del job_responses[bisect_left(job_responses, id)]
+        del self.response_pairs[response.user_id, response.job_id]
+
+    def remove_user(self, id: int) -> None:
+        user = self.users.pop(id)
+        if self.emails.get(user.email) == id:
+            del self.emails[user.email]
+        if user.deleted_at is not None:
+            self.deleted_users.discard(user.deleted_key)
+        # ON DELETE CASCADE: вакансии пользователя вместе с откликами на них, его отклики
+        for job_id in list(self.user_jobs.get(id, ())):
+            self.remove_job(job_id)
+        for response_id in list(self.user_responses.get(id, ())):
+            self.remove_response(response_id)
+        self.user_jobs.pop(id, None)
+        self.user_responses.pop(id, None)
+
+    def response_is_visible(self, response: ResponseRow) -> bool:
+        return (
+            self.users[response.user_id].deleted_at is None
+            and self.jobs[response.job_id].deleted_at is None
+        )
+
+    def _add_to_feed(self, job: JobRow) -> None:
+        if job.deleted_at is None:
+            self.feed.add(job.feed_key)
+            if job.is_active:
+                self.active_feed.add(job.feed_key)
+            else:
+                self.inactive_feed.add(job.feed_key)
+
+    def _remove_from_feed(self, job: JobRow) -> None:
+        self.feed.discard(job.feed_key)
+        self.active_feed.discard(job.feed_key)
+        self.inactive_feed.discard(job.feed_key)
+
+
+def matches(row, kwargs: dict) -> bool:
+    """Условие filter_by(**kwargs) для строки хранилища."""
+
+    return all(getattr(row, field) == value for field, value in kwargs.items())
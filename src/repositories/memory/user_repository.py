@@ -0,0 +1,154 @@
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+from interfaces import IRepositoryAsync
+from models import Job as JobModel
+from models import ProfileJob
+from models import Response as ResponseModel
+from models import User as UserModel
+from models import UserProfile
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
+from repositories.memory.store import InMemoryStore, UserRow, matches
+from repositories.soft_delete import now
+from tools import to_model, update_fields
+from web.schemas import UserCreateSchema, UserUpdateSchema
+
+
+class InMemoryUserRepository(IRepositoryAsync):
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    async def create(self, user_create_dto: UserCreateSchema, hashed_password: str) -> UserModel:
+        if user_create_dto.email in self.store.emails:
+            raise UniqueError("Пользователь с таким email уже существует")
+
+        user = UserRow(
+            id=next(self.store.user_ids),
+            name=user_create_dto.name,
+            email=user_create_dto.email,
+            is_company=user_create_dto.is_company,
+            hashed_password=hashed_password,
+            created_at=now(),
+        )
+        self.store.add_user(user)
+        return to_model(user, UserModel)
+
+    async def retrieve(self, include_relations: bool = False, **kwargs) -> UserModel:
+        if "id" in kwargs:
+            candidates = [self.store.users.get(kwargs["id"])]
+        elif "email" in kwargs:
+            candidates = [self.store.users.get(self.store.emails.get(kwargs["email"]))]
+        else:
+            candidates = self.store.users.values()
+
+        for user in candidates:
+            if user is not None and user.deleted_at is None and matches(user, kwargs):
+                return self._to_model(user, include_relations)
+        raise EntityNotFoundError("Пользователь не найден")
+
+    async def retrieve_many(
+        self, limit: int = 100, skip: int = 0, include_relations: bool = False
+    ) -> list[UserModel]:
+        # словарь хранит пользователей в порядке создания, то есть по возрастанию id
+        users = (user for user in self.store.users.values() if user.deleted_at is None)
+        return [
+            self._to_model(user, include_relations) for user in islice(users, skip, skip + limit)
+        ]
+
+    async def retrieve_profile(self, id: int, limit: int = 5) -> UserProfile:
+        user = self.store.users.get(id)
+        if user is None or user.deleted_at is not None:
+            raise EntityNotFoundError("Пользователь не найден")
+
+        jobs = [self.store.jobs[job_id] for job_id in self.store.user_jobs.get(id, ())]
+        jobs = sorted((job for job in jobs if job.deleted_at is None), key=lambda job: job.feed_key)
+        if user.is_company:
+            response_ids = [
+                response_id for job in jobs for response_id in self.store.job_responses[job.id]
+            ]
+        else:
+            response_ids = self.store.user_responses.get(id, ())
+        responses = [self.store.responses[response_id] for response_id in response_ids]
+        responses = [response for response in responses if self.store.response_is_visible(response)]
+        responses.sort(key=lambda response: (response.created_at, response.id), reverse=True)
+
+        return UserProfile(
+            user=to_model(user, UserModel),
+            jobs_total=len(jobs),
+            active_jobs_total=sum(job.is_active for job in jobs),
+            responses_total=len(responses),
+            jobs=[
+                ProfileJob(
+                    **vars(to_model(job, JobModel)), responses_total=self._responses_total(job.id)
+                )
+                for job in jobs[:limit]
+            ],
+            responses=[to_model(response, ResponseModel) for response in responses[:limit]],
+        )
+
+    async def update(self, id: int, user_update_dto: UserUpdateSchema) -> UserModel:
+        user = self.store.users.get(id)
+        if user is None or user.deleted_at is not None:
+            raise EntityNotFoundError("Пользователь не найден")
+
+        values = vars(update_fields(user_update_dto.model_dump(), UserRow(**vars(user))))
+        values.pop("version")
+        if self.store.emails.get(values["email"], id) != id:
+            raise UniqueError("Пользователь с таким email уже существует")
+
+        self.store.change_user(user, **values, version=user.version + 1)
+        return to_model(user, UserModel)
+
+    async def patch(self, id: int, values: dict, version: Optional[int] = None) -> UserModel:
+        user = self.store.users.get(id)
+        if user is None or user.deleted_at is not None:
+            raise EntityNotFoundError("Пользователь не найден")
+        if version is not None and user.version != version:
+            raise VersionConflictError("Пользователь изменён другим запросом", user.version)
+        if self.store.emails.get(values.get("email"), id) != id:
+            raise UniqueError("Пользователь с таким email уже существует")
+
+        self.store.change_user(user, **values, version=user.version + 1)
+        return to_model(user, UserModel)
+
+    async def delete(self, id: int) -> UserModel:
+        """Мягкое удаление пользователя и его вакансий."""
+
+        user = self.store.users.get(id)
+        if user is None or user.deleted_at is not None:
+            raise EntityNotFoundError("Пользователь не найден")
+
+        deleted_at = now()
+        self.store.change_user(user, deleted_at=deleted_at)
+        for job_id in list(self.store.user_jobs.get(id, ())):
+            job = self.store.jobs[job_id]
+            if job.deleted_at is None:
+                self.store.change_job(job, deleted_at=deleted_at, updated_at=deleted_at)
+        return to_model(user, UserModel)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        keys = self.store.deleted_users.before((before, 0), batch_size)
+        for _, id in keys:
+            self.store.remove_user(id)
+        return len(keys)
+
+    def _responses_total(self, job_id: int) -> int:
+        responses = (self.store.responses[id] for id in self.store.job_responses.get(job_id, ()))
+        return sum(self.store.response_is_visible(response) for response in responses)
+
+    def _to_model(self, user: UserRow, include_relations: bool) -> UserModel:
+        model = to_model(user, UserModel)
+        if include_relations:
+            jobs = (self.store.jobs[id] for id in sorted(self.store.user_jobs.get(user.id, ())))
+            model.jobs = [to_model(job, JobModel) for job in jobs if job.deleted_at is None]
+            responses = (
+                self.store.responses[id]
+                for id in sorted(self.store.user_responses.get(user.id, ()))
+            )
+            model.responses = [
+                to_model(response, ResponseModel)
+                for response in responses
+                if self.store.response_is_visible(response)
+            ]
+        return model
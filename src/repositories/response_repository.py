@@ -1,19 +1,98 @@
 from contextlib import AbstractContextManager
-from typing import Callable
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Delete, Select, bindparam, delete, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from interfaces import IRepositoryAsync
 from models import Response as ResponseModel
-from repositories.exceptions import EntityNotFoundError, UniqueError
-from storage.sqlalchemy.tables import Response
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
+from repositories.soft_delete import response_is_visible
+from repositories.statements import (
+    BY_ID,
+    FilterKey,
+    filter_by_params,
+    filter_key,
+    filter_params,
+    patch_query,
+    version_query,
+)
+from storage.sqlalchemy.tables import Job, Response, User
 from tools.common import to_model, update_fields
 from web.schemas import ResponseCreateSchema, ResponseUpdateSchema
 
-
-class ResponseRepository(IRepositoryAsync):
+JOB_EXISTS = select(Job.id).filter_by(id=bindparam("job_id"), deleted_at=None)
+
+
+class ResponseQueries:
+    """Запросы откликов, общие для асинхронного и синхронного репозиториев."""
+
+    @staticmethod
+    def _new_response(
+        user_id: int, job_id: int, response_create_dto: ResponseCreateSchema
+    ) -> Response:
+        return Response(user_id=user_id, job_id=job_id, message=response_create_dto.message)
+
+    @staticmethod
+    def _integrity_error(error: IntegrityError) -> Exception:
+        if "violates unique constraint" in str(error).lower():
+            return UniqueError("Вы уже откликнулись на эту вакансию")
+        return EntityNotFoundError("Связанная запись не найдена")
+
+    @staticmethod
+    def _apply_update(response: Response, response_update_dto: ResponseUpdateSchema) -> Response:
+        updated_response = update_fields(response_update_dto.model_dump(), response)
+        updated_response.version = Response.version + 1
+        return updated_response
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _retrieve_query(key: FilterKey) -> Select:
+        return filter_by_params(select(Response), key).filter(response_is_visible()).limit(1)
+
+    @staticmethod
+    def _page(limit: int, skip: int, **kwargs) -> Select:
+        return (
+            select(Response)
+            .filter_by(**kwargs)
+            .filter(response_is_visible())
+            .limit(limit)
+            .offset(skip)
+        )
+
+    @staticmethod
+    def _by_ids(ids: list[int]) -> Select:
+        return select(Response).filter(Response.id.in_(ids), response_is_visible())
+
+    @staticmethod
+    def _by_job(job_id: int, after_id: Optional[int], batch_size: int) -> Select:
+        query = (
+            select(Response)
+            .filter(Response.job_id == job_id, response_is_visible())
+            .order_by(Response.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if after_id is not None:
+            query = query.filter(Response.id > after_id)
+        return query
+
+    @staticmethod
+    def _purge(before: datetime, batch_size: int) -> Delete:
+        deleted_jobs = select(Job.id).filter(Job.deleted_at < before)
+        deleted_users = select(User.id).filter(User.deleted_at < before)
+        ids = (
+            select(Response.id)
+            .filter(or_(Response.job_id.in_(deleted_jobs), Response.user_id.in_(deleted_users)))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return delete(Response).filter(Response.id.in_(ids.scalar_subquery()))
+
+
+class ResponseRepository(ResponseQueries, IRepositoryAsync):
     def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
         self.session = session
 
@@ -22,29 +101,23 @@ class ResponseRepository(IRepositoryAsync):
     ) -> ResponseModel:
         try:
             async with self.session() as session:
-                response = Response(
-                    user_id=user_id,
-                    job_id=job_id,
-                    message=response_create_dto.message,
-                )
+                # внешний ключ не знает о мягком удалении: удалённая вакансия проверяется явно
+                if (await session.execute(JOB_EXISTS, {"job_id": job_id})).first() is None:
+                    raise EntityNotFoundError("Вакансия не найдена")
 
+                response = self._new_response(user_id, job_id, response_create_dto)
                 session.add(response)
                 await session.commit()
                 await session.refresh(response)
 
             return to_model(response, ResponseModel)
         except IntegrityError as e:
-            if "violates foreign key constraint" in str(e).lower():
-                raise EntityNotFoundError("Связанная запись не найдена") from e
-            elif "violates unique constraint" in str(e).lower():
-                raise UniqueError("Вы уже откликнулись на эту вакансию") from e
-        except Exception:
-            raise
+            raise self._integrity_error(e) from e
 
     async def retrieve(self, **kwargs) -> ResponseModel:
         async with self.session() as session:
-            query = select(Response).filter_by(**kwargs).limit(1)
-            res = await session.execute(query)
+            query = self._retrieve_query(filter_key(kwargs))
+            res = await session.execute(query, filter_params(kwargs))
             response_from_db = res.scalars().first()
             if not response_from_db:
                 raise EntityNotFoundError("Отклик не найден")
@@ -53,8 +126,7 @@ class ResponseRepository(IRepositoryAsync):
 
     async def retrieve_many(self, limit: int = 100, skip: int = 0, **kwargs) -> list[ResponseModel]:
         async with self.session() as session:
-            query = select(Response).limit(limit).offset(skip)
-            res = await session.execute(query)
+            res = await session.execute(self._page(limit, skip, **kwargs))
             response_from_db = res.scalars().all()
 
         responses_model = []
@@ -64,16 +136,34 @@ class ResponseRepository(IRepositoryAsync):
 
         return responses_model
 
+    async def retrieve_many_by_ids(self, ids: list[int]) -> list[ResponseModel]:
+        async with self.session() as session:
+            res = await session.execute(self._by_ids(ids))
+            responses_from_db = {response.id: response for response in res.scalars().all()}
+
+        return [
+            to_model(responses_from_db[id], ResponseModel) for id in ids if id in responses_from_db
+        ]
+
+    async def iter_by_job(
+        self, job_id: int, after_id: Optional[int] = None, batch_size: int = 1000
+    ) -> AsyncIterator[ResponseModel]:
+        """Потоково отдаёт отклики на вакансию с id больше `after_id` в порядке id."""
+
+        async with self.session() as session:
+            res = await session.stream_scalars(self._by_job(job_id, after_id, batch_size))
+            async for response in res:
+                yield to_model(response, ResponseModel)
+
     async def update(self, id: int, response_update_dto: ResponseUpdateSchema) -> ResponseModel:
         async with self.session() as session:
-            query = select(Response).filter_by(id=id).limit(1)
-            res = await session.execute(query)
+            res = await session.execute(self._retrieve_query(BY_ID), {"id": id})
             response_from_db = res.scalars().first()
 
             if not response_from_db:
                 raise EntityNotFoundError("Отклик не найден")
 
-            updated_response = update_fields(response_update_dto.model_dump(), response_from_db)
+            updated_response = self._apply_update(response_from_db, response_update_dto)
 
             session.add(updated_response)
             await session.commit()
@@ -81,10 +171,30 @@ class ResponseRepository(IRepositoryAsync):
 
         return to_model(response_from_db, ResponseModel)
 
+    async def patch(
+        self, id: int, user_id: int, values: dict, version: Optional[int] = None
+    ) -> ResponseModel:
+        """Изменить переданные поля отклика автора одним UPDATE, не читая отклик."""
+
+        filters = dict(id=id, user_id=user_id)
+        visible = response_is_visible()
+        async with self.session() as session:
+            res = await session.execute(patch_query(Response, values, version, visible, **filters))
+            response_from_db = res.scalars().first()
+
+            if not response_from_db:
+                current = await session.scalar(version_query(Response, visible, **filters))
+                if current is None:
+                    raise EntityNotFoundError("Отклик не найден")
+                raise VersionConflictError("Отклик изменён другим запросом", current)
+            await session.commit()
+
+        return to_model(response_from_db, ResponseModel)
+
     async def delete(self, id: int, user_id: int):
         async with self.session() as session:
-            query = select(Response).filter_by(id=id, user_id=user_id).limit(1)
-            res = await session.execute(query)
+            query = self._retrieve_query(filter_key({"id": id, "user_id": user_id}))
+            res = await session.execute(query, {"id": id, "user_id": user_id})
             response_from_db = res.scalars().first()
 
             if not response_from_db:
@@ -94,3 +204,16 @@ class ResponseRepository(IRepositoryAsync):
                 await session.commit()
 
         # return to_model(response_from_db, ResponseModel)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        """Удалить пачку откликов пользователей и вакансий, помеченных удалёнными раньше `before`.
+
+        Отклики чистятся отдельными пачками до вакансий и пользователей, чтобы каскад
+        при удалении родителя не удалял тысячи строк одной транзакцией.
+        """
+
+        async with self.session() as session:
+            res = await session.execute(self._purge(before, batch_size))
+            await session.commit()
+
+        return res.rowcount
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import ColumnElement, and_
+
+from storage.sqlalchemy.tables import Job, Response, User
+
+
+def now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def response_is_visible() -> ColumnElement[bool]:
+    """Отклик виден, пока не удалены ни его автор, ни вакансия.
+
+    Сами отклики при мягком удалении не помечаются: их удаляет фоновая очистка.
+    """
+
+    return and_(
+        Response.user.has(User.deleted_at.is_(None)),
+        Response.job.has(Job.deleted_at.is_(None)),
+    )
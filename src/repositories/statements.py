@@ -0,0 +1,60 @@
+"""Запросы горячих выборок, собираемые один раз.
+
+SQLAlchemy кэширует скомпилированный SQL, но на каждом вызове заново строит объект
+запроса и считает по нему ключ кэша. Запрос с bindparam вместо значений собирается
+один раз на структуру фильтра, его ключ мемоизирован на объекте, а одинаковый текст SQL
+попадает и в кэш подготовленных выражений asyncpg.
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, Select, Update, bindparam, select, update
+
+FilterKey = tuple[tuple[str, bool], ...]
+BY_ID: FilterKey = (("id", False),)
+
+
+def filter_key(kwargs: dict[str, Any]) -> FilterKey:
+    """Структура фильтра filter_by(**kwargs): поля и то, какие из них сравниваются с NULL."""
+
+    return tuple(sorted((field, value is None) for field, value in kwargs.items()))
+
+
+def filter_params(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # сравнение с NULL зашито в запрос как IS NULL, параметром оно не передаётся
+    return {field: value for field, value in kwargs.items() if value is not None}
+
+
+def filter_by_params(query: Select, key: FilterKey) -> Select:
+    return query.filter_by(
+        **{field: None if is_null else bindparam(field) for field, is_null in key}
+    )
+
+
+def patch_query(
+    entity, values: dict[str, Any], version: Optional[int], *criteria: ColumnElement, **filters
+) -> Update:
+    """UPDATE ... SET только переданных колонок без чтения строки; версия растёт на единицу.
+
+    С `version` строка меняется, только если её версия та же, что прочитал клиент:
+    конфликт одновременных правок виден по пустому RETURNING без блокировки строки.
+    """
+
+    query = (
+        update(entity)
+        .filter_by(**filters)
+        .filter(*criteria)
+        .values(**values, version=entity.version + 1)
+        .returning(entity)
+        # вернуть значения после UPDATE, даже если запись уже есть в identity map сессии
+        .execution_options(populate_existing=True)
+    )
+    if version is not None:
+        query = query.filter(entity.version == version)
+    return query
+
+
+def version_query(entity, *criteria: ColumnElement, **filters) -> Select:
+    """Текущая версия записи: после пустого RETURNING отличает конфликт от отсутствия записи."""
+
+    return select(entity.version).filter_by(**filters).filter(*criteria)
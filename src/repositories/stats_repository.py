@@ -0,0 +1,76 @@
+from contextlib import AbstractContextManager
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import SalaryPercentiles, Stats
+from repositories.exceptions import EntityNotFoundError, RepositoryError
+from storage.sqlalchemy.tables import stats_responses_daily, stats_summary
+
+# ключ advisory-блокировки: обновлять представления одновременно может только один воркер
+STATS_REFRESH_LOCK = 0x5747_5354
+
+
+class StatsRepository:
+    """Чтение и обновление материализованной статистики."""
+
+    def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
+        self.session = session
+
+    async def retrieve(self) -> Stats:
+        async with self.session() as session:
+            res = await session.execute(select(stats_summary))
+            summary = res.mappings().first()
+            if not summary:
+                raise EntityNotFoundError("Статистика ещё не рассчитана")
+
+            res = await session.execute(
+                select(stats_responses_daily).order_by(stats_responses_daily.c.day)
+            )
+            daily = res.all()
+
+        return Stats(
+            users_total=summary["users_total"],
+            companies_total=summary["companies_total"],
+            jobs_total=summary["jobs_total"],
+            active_jobs_total=summary["active_jobs_total"],
+            responses_total=summary["responses_total"],
+            salary_from=SalaryPercentiles(*(summary["salary_from_percentiles"] or ())),
+            salary_to=SalaryPercentiles(*(summary["salary_to_percentiles"] or ())),
+            refreshed_at=summary["refreshed_at"],
+            responses_per_day={day: responses for day, responses in daily},
+        )
+
+    async def refresh(self, max_age: timedelta = timedelta(0)) -> bool:
+        """Пересчитать представления, если они старше `max_age`.
+
+        Возвращает False, если пересчёт не понадобился или его уже выполняет другой воркер.
+        """
+
+        try:
+            async with self.session() as session:
+                res = await session.execute(
+                    select(func.pg_try_advisory_xact_lock(STATS_REFRESH_LOCK))
+                )
+                if not res.scalar():
+                    return False
+
+                res = await session.execute(
+                    select(stats_summary.c.refreshed_at > func.now() - max_age)
+                )
+                if res.scalar():
+                    return False
+
+                # CONCURRENTLY не блокирует чтение: /stats отдаёт прежние данные до конца пересчёта
+                await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY stats_summary"))
+                await session.execute(
+                    text("REFRESH MATERIALIZED VIEW CONCURRENTLY stats_responses_daily")
+                )
+                await session.commit()
+        except (SQLAlchemyError, OSError) as e:
+            raise RepositoryError("Не удалось обновить статистику") from e
+
+        return True
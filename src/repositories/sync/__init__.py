@@ -0,0 +1,3 @@
+from .job_repository import JobRepositorySync  # noqa
+from .response_repository import ResponseRepositorySync  # noqa
+from .user_repository import UserRepositorySync  # noqa
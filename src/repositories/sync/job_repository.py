@@ -0,0 +1,108 @@
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from interfaces import IRepositorySync
+from models import Job as JobModel
+from repositories.exceptions import EntityNotFoundError
+from repositories.job_repository import UPSERT_JOBS, JobQueries
+from repositories.statements import BY_ID, filter_key, filter_params
+from storage.sqlalchemy.tables import Job
+from tools import to_model
+from web.schemas import JobCreateSchema, JobFeedItemSchema
+
+
+class JobRepositorySync(JobQueries, IRepositorySync):
+    def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
+        self.session = session
+
+    def create(self, user_id: int, job_create_dto: JobCreateSchema) -> JobModel:
+        with self.session() as session:
+            job = self._new_job(user_id, job_create_dto)
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+
+        return to_model(job, JobModel)
+
+    def retrieve(self, include_relations: bool = False, **kwargs) -> JobModel:
+        with self.session() as session:
+            query = self._retrieve_query(filter_key(kwargs), include_relations)
+            job_from_db = session.execute(query, filter_params(kwargs)).scalars().first()
+            if not job_from_db:
+                raise EntityNotFoundError("Вакансия не найдена")
+
+        return to_model(job_from_db, JobModel)
+
+    def retrieve_many(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        include_relations: bool = False,
+        is_active: Optional[bool] = None,
+    ) -> list[JobModel]:
+        with self.session() as session:
+            query = self._paginate(select(Job), limit=limit, skip=skip, is_active=is_active)
+            if include_relations:
+                query = query.options(self._relations())
+            jobs_from_db = session.execute(query).scalars().all()
+
+        return [to_model(job, JobModel) for job in jobs_from_db]
+
+    def iter_updated_since(
+        self, since: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[JobModel]:
+        """Потоково отдаёт вакансии, изменённые начиная с `since`, включая удалённые.
+
+        yield_per читает строки серверным курсором psycopg2 пачками по `batch_size`:
+        память процесса не растёт с размером таблицы.
+        """
+
+        with self.session() as session:
+            for job in session.scalars(self._updated_since(since, batch_size)):
+                yield to_model(job, JobModel)
+
+    def update(self, id: int, job_update_dto: JobCreateSchema) -> JobModel:
+        with self.session() as session:
+            res = session.execute(self._retrieve_query(BY_ID, False), {"id": id})
+            job_from_db = res.scalars().first()
+            if not job_from_db:
+                raise EntityNotFoundError("Вакансия не найдена")
+
+            updated_job = self._apply_update(job_from_db, job_update_dto)
+            session.add(updated_job)
+            session.commit()
+            session.refresh(updated_job)
+
+        return to_model(updated_job, JobModel)
+
+    def upsert_many(self, user_id: int, jobs: list[JobFeedItemSchema]) -> tuple[int, int]:
+        if not jobs:
+            return 0, 0
+        with self.session() as session:
+            res = session.execute(UPSERT_JOBS, self._upsert_rows(user_id, jobs))
+            inserted = res.scalars().all()
+            session.commit()
+
+        return self._upsert_counts(inserted)
+
+    def delete(self, id: int, user_id: int) -> JobModel:
+        """Мягкое удаление: отклики остаются в БД до очистки."""
+
+        with self.session() as session:
+            job_from_db = session.execute(self._soft_delete(id, user_id)).scalars().first()
+            if not job_from_db:
+                raise EntityNotFoundError("Вакансия не найдена")
+            session.commit()
+
+        return to_model(job_from_db, JobModel)
+
+    def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        with self.session() as session:
+            res = session.execute(self._purge(before, batch_size))
+            session.commit()
+
+        return res.rowcount
@@ -0,0 +1,90 @@
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from interfaces import IRepositorySync
+from models import Response as ResponseModel
+from repositories.exceptions import EntityNotFoundError
+from repositories.response_repository import JOB_EXISTS, ResponseQueries
+from repositories.statements import BY_ID, filter_key, filter_params
+from tools import to_model
+from web.schemas import ResponseCreateSchema, ResponseUpdateSchema
+
+
+class ResponseRepositorySync(ResponseQueries, IRepositorySync):
+    def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
+        self.session = session
+
+    def create(
+        self, user_id: int, job_id: int, response_create_dto: ResponseCreateSchema
+    ) -> ResponseModel:
+        try:
+            with self.session() as session:
+                if session.execute(JOB_EXISTS, {"job_id": job_id}).first() is None:
+                    raise EntityNotFoundError("Вакансия не найдена")
+
+                response = self._new_response(user_id, job_id, response_create_dto)
+                session.add(response)
+                session.commit()
+                session.refresh(response)
+
+            return to_model(response, ResponseModel)
+        except IntegrityError as e:
+            raise self._integrity_error(e) from e
+
+    def retrieve(self, **kwargs) -> ResponseModel:
+        with self.session() as session:
+            query = self._retrieve_query(filter_key(kwargs))
+            response_from_db = session.execute(query, filter_params(kwargs)).scalars().first()
+            if not response_from_db:
+                raise EntityNotFoundError("Отклик не найден")
+
+        return to_model(response_from_db, ResponseModel)
+
+    def retrieve_many(self, limit: int = 100, skip: int = 0, **kwargs) -> list[ResponseModel]:
+        with self.session() as session:
+            responses_from_db = session.execute(self._page(limit, skip, **kwargs)).scalars().all()
+
+        return [to_model(response, ResponseModel) for response in responses_from_db]
+
+    def iter_by_job(
+        self, job_id: int, after_id: Optional[int] = None, batch_size: int = 1000
+    ) -> Iterator[ResponseModel]:
+        with self.session() as session:
+            for response in session.scalars(self._by_job(job_id, after_id, batch_size)):
+                yield to_model(response, ResponseModel)
+
+    def update(self, id: int, response_update_dto: ResponseUpdateSchema) -> ResponseModel:
+        with self.session() as session:
+            res = session.execute(self._retrieve_query(BY_ID), {"id": id})
+            response_from_db = res.scalars().first()
+            if not response_from_db:
+                raise EntityNotFoundError("Отклик не найден")
+
+            updated_response = self._apply_update(response_from_db, response_update_dto)
+            session.add(updated_response)
+            session.commit()
+            session.refresh(updated_response)
+
+        return to_model(updated_response, ResponseModel)
+
+    def delete(self, id: int, user_id: int) -> None:
+        with self.session() as session:
+            params = {"id": id, "user_id": user_id}
+            query = self._retrieve_query(filter_key(params))
+            response_from_db = session.execute(query, params).scalars().first()
+            if not response_from_db:
+                raise EntityNotFoundError("Отклик не найден")
+
+            session.delete(response_from_db)
+            session.commit()
+
+    def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        with self.session() as session:
+            res = session.execute(self._purge(before, batch_size))
+            session.commit()
+
+        return res.rowcount
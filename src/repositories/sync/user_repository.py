@@ -0,0 +1,87 @@
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from interfaces import IRepositorySync
+from models import User as UserModel
+from repositories.exceptions import EntityNotFoundError, UniqueError
+from repositories.soft_delete import now
+from repositories.statements import BY_ID, filter_key, filter_params
+from repositories.user_repository import UserQueries
+from tools import to_model
+from web.schemas import UserCreateSchema, UserUpdateSchema
+
+
+class UserRepositorySync(UserQueries, IRepositorySync):
+    def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
+        self.session = session
+
+    def create(self, user_create_dto: UserCreateSchema, hashed_password: str) -> UserModel:
+        try:
+            with self.session() as session:
+                user = self._new_user(user_create_dto, hashed_password)
+                session.add(user)
+                session.commit()
+                session.refresh(user)
+
+            return to_model(user, UserModel)
+        except IntegrityError as e:
+            raise UniqueError("Пользователь с таким email уже существует") from e
+
+    def retrieve(self, include_relations: bool = False, **kwargs) -> UserModel:
+        with self.session() as session:
+            query = self._retrieve_query(filter_key(kwargs), include_relations)
+            user_from_db = session.execute(query, filter_params(kwargs)).scalars().first()
+            if not user_from_db:
+                raise EntityNotFoundError("Пользователь не найден")
+
+        return to_model(user_from_db, UserModel)
+
+    def retrieve_many(
+        self, limit: int = 100, skip: int = 0, include_relations: bool = False
+    ) -> list[UserModel]:
+        with self.session() as session:
+            query = self._page(limit, skip)
+            if include_relations:
+                query = query.options(*self._relations())
+            users_from_db = session.execute(query).scalars().all()
+
+        return [to_model(user, UserModel) for user in users_from_db]
+
+    def update(self, id: int, user_update_dto: UserUpdateSchema) -> UserModel:
+        with self.session() as session:
+            res = session.execute(self._retrieve_query(BY_ID, False), {"id": id})
+            user_from_db = res.scalars().first()
+            if not user_from_db:
+                raise EntityNotFoundError("Пользователь не найден")
+
+            updated_user = self._apply_update(user_from_db, user_update_dto)
+            session.add(updated_user)
+            session.commit()
+            session.refresh(updated_user)
+
+        return to_model(updated_user, UserModel)
+
+    def delete(self, id: int) -> UserModel:
+        """Мягкое удаление пользователя и его вакансий."""
+
+        with self.session() as session:
+            deleted_at = now()
+            user_from_db = session.execute(self._soft_delete(id, deleted_at)).scalars().first()
+            if not user_from_db:
+                raise EntityNotFoundError("Пользователь не найден")
+
+            session.execute(self._soft_delete_jobs(id, deleted_at))
+            session.commit()
+
+        return to_model(user_from_db, UserModel)
+
+    def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        with self.session() as session:
+            res = session.execute(self._purge(before, batch_size))
+            session.commit()
+
+        return res.rowcount
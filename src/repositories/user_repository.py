@@ -1,32 +1,208 @@
+import json
 from contextlib import AbstractContextManager
-from typing import Callable
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Delete,
+    Select,
+    Subquery,
+    Text,
+    Update,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, aliased, selectinload
 
 from interfaces import IRepositoryAsync
+from models import ProfileJob
+from models import Response as ResponseModel
 from models import User as UserModel
-from repositories.exceptions import EntityNotFoundError, UniqueError
-from storage.sqlalchemy.tables import User
-from tools import to_model, update_fields
+from models import UserProfile
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
+from repositories.soft_delete import now, response_is_visible
+from repositories.statements import (
+    BY_ID,
+    FilterKey,
+    filter_by_params,
+    filter_key,
+    filter_params,
+    patch_query,
+    version_query,
+)
+from storage.sqlalchemy.tables import Job, Response, User
+from tools import from_json, to_model, update_fields
 from web.schemas import UserCreateSchema, UserUpdateSchema
 
 
-class UserRepository(IRepositoryAsync):
+def json_list(query: Select, order_by: Callable[[Subquery], tuple]) -> Select:
+    """Строки запроса одним массивом JSON (текстом: драйверы декодируют json по-разному).
+
+    `order_by` повторяет порядок запроса по колонкам подзапроса: json_agg не обязан
+    сохранять порядок строк, в котором их отдал подзапрос.
+    """
+
+    # подзапрос вложен на два уровня: связь с users внешнего запроса задаётся явно
+    rows = query.correlate(User).subquery()
+    rows_json = func.json_agg(aggregate_order_by(rows.table_valued(), *order_by(rows)))
+    return select(cast(func.coalesce(rows_json, literal_column("'[]'")), Text))
+
+
+def profile_query() -> Select:
+    """Пользователь, его последние вакансии и отклики со счётчиками за один запрос.
+
+    Каждая часть профиля — коррелированный подзапрос, который идёт по своему индексу
+    и ограничен `limit` строками. Связанные строки сворачиваются в JSON на стороне
+    PostgreSQL, поэтому весь профиль приходит одной строкой за один round-trip.
+    """
+
+    applicant = aliased(User)
+    live_jobs = and_(Job.user_id == User.id, Job.deleted_at.is_(None))
+    job_responses_total = (
+        select(func.count())
+        .select_from(Response)
+        .join(applicant, applicant.id == Response.user_id)
+        .where(Response.job_id == Job.id, applicant.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+    recent_jobs = json_list(
+        select(*Job.__table__.c, job_responses_total.label("responses_total"))
+        .where(live_jobs)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(bindparam("limit")),
+        lambda rows: (rows.c.created_at.desc(), rows.c.id.desc()),
+    )
+
+    # у компании — отклики на её вакансии от неудалённых соискателей
+    received = (
+        select(Response)
+        .join(Job, Job.id == Response.job_id)
+        .join(applicant, applicant.id == Response.user_id)
+        .where(live_jobs, applicant.deleted_at.is_(None))
+    )
+    # у соискателя — его отклики на неудалённые вакансии
+    sent = (
+        select(Response)
+        .join(Job, Job.id == Response.job_id)
+        .where(Response.user_id == User.id, Job.deleted_at.is_(None))
+    )
+
+    def recent(responses: Select) -> Select:
+        return json_list(
+            responses.order_by(Response.created_at.desc().nulls_last(), Response.id.desc()).limit(
+                bindparam("limit")
+            ),
+            lambda rows: (rows.c.created_at.desc().nulls_last(), rows.c.id.desc()),
+        )
+
+    def total(responses: Select) -> Select:
+        return responses.with_only_columns(func.count()).scalar_subquery()
+
+    return select(
+        User,
+        select(func.count()).where(live_jobs).scalar_subquery().label("jobs_total"),
+        select(func.count())
+        .where(live_jobs, Job.is_active)
+        .scalar_subquery()
+        .label("active_jobs_total"),
+        # CASE выполняет только подзапрос своей ветки
+        case((User.is_company, total(received)), else_=total(sent)).label("responses_total"),
+        recent_jobs.scalar_subquery().label("jobs"),
+        case(
+            (User.is_company, recent(received).scalar_subquery()),
+            else_=recent(sent).scalar_subquery(),
+        ).label("responses"),
+    ).filter_by(id=bindparam("id"), deleted_at=None)
+
+
+RETRIEVE_PROFILE = profile_query()
+
+
+class UserQueries:
+    """Запросы пользователей, общие для асинхронного и синхронного репозиториев."""
+
+    @staticmethod
+    def _new_user(user_create_dto: UserCreateSchema, hashed_password: str) -> User:
+        return User(
+            name=user_create_dto.name,
+            email=user_create_dto.email,
+            is_company=user_create_dto.is_company,
+            hashed_password=hashed_password,
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _retrieve_query(key: FilterKey, include_relations: bool) -> Select:
+        query = filter_by_params(select(User).filter_by(deleted_at=None), key).limit(1)
+        if include_relations:
+            query = query.options(*UserQueries._relations())
+        return query
+
+    @staticmethod
+    def _relations():
+        return (
+            selectinload(User.jobs.and_(Job.deleted_at.is_(None))),
+            selectinload(User.responses.and_(response_is_visible())),
+        )
+
+    @staticmethod
+    def _apply_update(user: User, user_update_dto: UserUpdateSchema) -> User:
+        updated_user = update_fields(user_update_dto.model_dump(), user)
+        updated_user.version = User.version + 1
+        return updated_user
+
+    @staticmethod
+    def _page(limit: int, skip: int) -> Select:
+        return select(User).filter_by(deleted_at=None).limit(limit).offset(skip)
+
+    @staticmethod
+    def _soft_delete(id: int, deleted_at: datetime) -> Update:
+        return (
+            update(User)
+            .filter_by(id=id, deleted_at=None)
+            .values(deleted_at=deleted_at)
+            .returning(User)
+        )
+
+    @staticmethod
+    def _soft_delete_jobs(user_id: int, deleted_at: datetime) -> Update:
+        # updated_at сдвигается, чтобы индексы вакансий в памяти увидели удаление
+        return (
+            update(Job)
+            .filter_by(user_id=user_id, deleted_at=None)
+            .values(deleted_at=deleted_at, updated_at=deleted_at)
+        )
+
+    @staticmethod
+    def _purge(before: datetime, batch_size: int) -> Delete:
+        ids = (
+            select(User.id)
+            .filter(User.deleted_at < before)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return delete(User).filter(User.id.in_(ids.scalar_subquery()))
+
+
+class UserRepository(UserQueries, IRepositoryAsync):
     def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
         self.session = session
 
     async def create(self, user_create_dto: UserCreateSchema, hashed_password: str) -> UserModel:
         try:
             async with self.session() as session:
-                user = User(
-                    name=user_create_dto.name,
-                    email=user_create_dto.email,
-                    is_company=user_create_dto.is_company,
-                    hashed_password=hashed_password,
-                )
-
+                user = self._new_user(user_create_dto, hashed_password)
                 session.add(user)
                 await session.commit()
                 await session.refresh(user)
@@ -40,11 +216,8 @@ class UserRepository(IRepositoryAsync):
 
     async def retrieve(self, include_relations: bool = False, **kwargs) -> UserModel:
         async with self.session() as session:
-            query = select(User).filter_by(**kwargs).limit(1)
-            if include_relations:
-                query = query.options(selectinload(User.jobs)).options(selectinload(User.responses))
-
-            res = await session.execute(query)
+            query = self._retrieve_query(filter_key(kwargs), include_relations)
+            res = await session.execute(query, filter_params(kwargs))
             user_from_db = res.scalars().first()
             if not user_from_db:
                 raise EntityNotFoundError("Пользователь не найден")
@@ -55,9 +228,9 @@ class UserRepository(IRepositoryAsync):
         self, limit: int = 100, skip: int = 0, include_relations: bool = False
     ) -> list[UserModel]:
         async with self.session() as session:
-            query = select(User).limit(limit).offset(skip)
+            query = self._page(limit, skip)
             if include_relations:
-                query = query.options(selectinload(User.jobs)).options(selectinload(User.responses))
+                query = query.options(*self._relations())
 
             res = await session.execute(query)
             users_from_db = res.scalars().all()
@@ -69,16 +242,33 @@ class UserRepository(IRepositoryAsync):
 
         return users_model
 
+    async def retrieve_profile(self, id: int, limit: int = 5) -> UserProfile:
+        async with self.session() as session:
+            res = await session.execute(RETRIEVE_PROFILE, {"id": id, "limit": limit})
+            row = res.first()
+            if not row:
+                raise EntityNotFoundError("Пользователь не найден")
+
+        return UserProfile(
+            user=to_model(row.User, UserModel),
+            jobs_total=row.jobs_total,
+            active_jobs_total=row.active_jobs_total,
+            responses_total=row.responses_total,
+            jobs=[from_json(job, ProfileJob) for job in json.loads(row.jobs, parse_float=Decimal)],
+            responses=[
+                from_json(response, ResponseModel) for response in json.loads(row.responses)
+            ],
+        )
+
     async def update(self, id: int, user_update_dto: UserUpdateSchema) -> UserModel:
         async with self.session() as session:
-            query = select(User).filter_by(id=id).limit(1)
-            res = await session.execute(query)
+            res = await session.execute(self._retrieve_query(BY_ID, False), {"id": id})
             user_from_db = res.scalars().first()
 
             if not user_from_db:
                 raise EntityNotFoundError("Пользователь не найден")
 
-            updated_user = update_fields(user_update_dto.model_dump(), user_from_db)
+            updated_user = self._apply_update(user_from_db, user_update_dto)
 
             session.add(updated_user)
             await session.commit()
@@ -86,16 +276,48 @@ class UserRepository(IRepositoryAsync):
 
         return to_model(user_from_db, UserModel)
 
+    async def patch(self, id: int, values: dict, version: Optional[int] = None) -> UserModel:
+        """Изменить переданные поля пользователя одним UPDATE, не читая его."""
+
+        filters = dict(id=id, deleted_at=None)
+        # IntegrityError выходит из контекста сессии: она откатывает транзакцию
+        try:
+            async with self.session() as session:
+                res = await session.execute(patch_query(User, values, version, **filters))
+                user_from_db = res.scalars().first()
+
+                if not user_from_db:
+                    current = await session.scalar(version_query(User, **filters))
+                    if current is None:
+                        raise EntityNotFoundError("Пользователь не найден")
+                    raise VersionConflictError("Пользователь изменён другим запросом", current)
+                await session.commit()
+        except IntegrityError as e:
+            raise UniqueError("Пользователь с таким email уже существует") from e
+
+        return to_model(user_from_db, UserModel)
+
     async def delete(self, id: int):
+        """Мягкое удаление пользователя и его вакансий двумя UPDATE без загрузки в память."""
+
         async with self.session() as session:
-            query = select(User).filter_by(id=id).limit(1)
-            res = await session.execute(query)
+            deleted_at = now()
+            res = await session.execute(self._soft_delete(id, deleted_at))
             user_from_db = res.scalars().first()
 
-            if user_from_db:
-                await session.delete(user_from_db)
-                await session.commit()
-            else:
+            if not user_from_db:
                 raise EntityNotFoundError("Пользователь не найден")
 
+            await session.execute(self._soft_delete_jobs(id, deleted_at))
+            await session.commit()
+
         return to_model(user_from_db, UserModel)
+
+    async def purge_deleted(self, before: datetime, batch_size: int = 1000) -> int:
+        """Окончательно удалить пачку пользователей, помеченных удалёнными раньше `before`."""
+
+        async with self.session() as session:
+            res = await session.execute(self._purge(before, batch_size))
+            await session.commit()
+
+        return res.rowcount
@@ -0,0 +1,113 @@
+"""Продакшен-запуск приложения в несколько воркеров.
+
+Запуск из каталога src:
+    python server.py --workers 4
+
+Параметры по умолчанию берутся из ServerSettings (.env.<STAGE>).
+"""
+
+import argparse
+import os
+import signal
+
+import uvicorn
+
+from config import DBSettings, ServerSettings
+from config.common import env_file_path
+
+APP = "main:app"
+
+
+def server_options(settings: ServerSettings) -> dict:
+    return dict(
+        host=settings.host,
+        port=settings.port,
+        loop=settings.loop,
+        http=settings.http,
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.timeout_keep_alive,
+        timeout_graceful_shutdown=settings.timeout_graceful_shutdown,
+        limit_max_requests=settings.limit_max_requests,
+        proxy_headers=True,
+        access_log=False,
+        # логи uvicorn идут в корневой логгер приложения (JSON через очередь)
+        log_config=None,
+    )
+
+
+def run_preforked(config: uvicorn.Config, workers: int) -> None:
+    """Мастер импортирует приложение и открывает сокет, воркеры получают их через fork."""
+
+    config.load()
+    sock = config.bind_socket()
+    children: set[int] = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        # упавший воркер перезапускаем, пока мастер не получил сигнал остановки
+        if not stopping:
+            spawn()
+
+    sock.close()
+
+
+def main() -> None:
+    settings = ServerSettings(_env_file=env_file_path)
+
+    parser = argparse.ArgumentParser(description="Запуск API биржи труда")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--no-preload", dest="preload", action="store_false")
+    parser.set_defaults(preload=settings.preload)
+    args = parser.parse_args()
+
+    settings = settings.model_copy(
+        update={"host": args.host, "port": args.port, "workers": args.workers}
+    )
+    # пул каждого воркера — хотя бы одно соединение: проверяем бюджет до запуска воркеров
+    db_settings = DBSettings(_env_file=env_file_path)
+    if not db_settings.pgbouncer and db_settings.repository_backend == "sqlalchemy":
+        try:
+            db_settings.pool_limits(settings.workers)
+        except ValueError as e:
+            parser.error(str(e))
+    # воркеры читают число воркеров из окружения при расчёте размера пула БД
+    os.environ["WORKERS"] = str(settings.workers)
+    options = server_options(settings)
+
+    if settings.workers > 1 and args.preload and hasattr(os, "fork"):
+        run_preforked(uvicorn.Config(APP, **options), settings.workers)
+    else:
+        # без preload uvicorn сам запускает воркеры, каждый импортирует приложение заново
+        uvicorn.run(APP, workers=settings.workers, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,9 @@
+from .duplicates import JobDuplicateIndex  # noqa
+from .feed import FeedBatches, FeedService, record_upsert  # noqa
 from .job import JobService  # noqa
+from .purge import PurgeService  # noqa
+from .ranking import ResponseRankingService, ResponseScoreCache  # noqa
+from .recommendation import JobTextIndex, RecommendationService  # noqa
 from .response import ResponseService  # noqa
+from .stats import StatsService  # noqa
 from .user import UserService  # noqa
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Optional
+
+import numpy as np
+
+from models import Job
+from services.job_sync import JobIndexSyncMixin
+from tools.minhash import LshIndex
+
+
+class JobDuplicateIndex(JobIndexSyncMixin, LshIndex):
+    """LSH-индекс активных вакансий для поиска перепостов.
+
+    Строится целиком при старте приложения в фоне и дальше поддерживается
+    инкрементально. Дубликатом считается только вакансия той же компании.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._owners: dict[int, int] = {}
+
+    def signature(self, title: Optional[str], description: Optional[str]) -> np.ndarray:
+        return self.hasher.signature(f"{title or ''} {description or ''}")
+
+    def upsert_job(self, job: Job, signature: Optional[np.ndarray] = None) -> None:
+        if not job.is_active or job.deleted_at is not None:
+            self.remove(job.id)
+            return
+
+        if signature is None:
+            signature = self.signature(job.title, job.description)
+        self.insert(job.id, signature)
+        self._owners[job.id] = job.user_id
+
+    async def upsert_jobs(self, jobs: list[Job]) -> None:
+        # сигнатуры считаются в потоке, индекс меняется только в цикле событий
+        signatures = await asyncio.to_thread(
+            lambda: [self.signature(job.title, job.description) for job in jobs]
+        )
+        for job, signature in zip(jobs, signatures):
+            self.upsert_job(job, signature)
+
+    def remove(self, id: int) -> None:
+        super().remove(id)
+        self._owners.pop(id, None)
+
+    def find_duplicate(
+        self,
+        user_id: int,
+        title: Optional[str],
+        description: Optional[str],
+        exclude_id: Optional[int] = None,
+    ) -> Optional[int]:
+        exclude = () if exclude_id is None else (exclude_id,)
+        for id, _ in self.query(self.signature(title, description), exclude=exclude):
+            if self._owners.get(id) == user_id:
+                return id
+        return None
@@ -10,6 +10,18 @@ class JobNotFoundError(Exception):
     """Вакансия не найдена"""
 
 
+class JobDuplicateError(Exception):
+    """Похожая вакансия уже опубликована"""
+
+    def __init__(self, message: str, duplicate_id: int):
+        super().__init__(message)
+        self.duplicate_id = duplicate_id
+
+
+class JobSalaryRangeError(Exception):
+    """Зарплата 'от' вакансии больше зарплаты 'до'"""
+
+
 class ResponseAlreadyExistsError(Exception):
     """Отклик уже существует в системе"""
 
@@ -20,3 +32,15 @@ class ResponseCreationError(Exception):
 
 class ResponseNotFoundError(Exception):
     """Отклик не найден"""
+
+
+class StatsNotReadyError(Exception):
+    """Статистика ещё не рассчитана"""
+
+
+class EditConflictError(Exception):
+    """Запись изменена другим запросом после того, как клиент её прочитал"""
+
+    def __init__(self, message: str, version: int):
+        super().__init__(message)
+        self.version = version
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from interfaces import IRepositoryAsync
+from models import FeedReport
+from tools.feeds import FeedFormatError
+from web.schemas import JobFeedItemSchema
+
+
+class FeedBatches:
+    """Разбор и проверка ленты вакансий пачками для upsert_many.
+
+    В памяти одновременно не больше `batch_size` проверенных вакансий. Повтор
+    external_id внутри пачки сводится к последней записи: ON CONFLICT DO UPDATE
+    не может изменить одну строку дважды за команду. Время разбора и проверки
+    копится в отчёте по этапам.
+    """
+
+    def __init__(
+        self,
+        items: Iterator[dict],
+        report: FeedReport,
+        batch_size: int = 1000,
+        max_errors: int = 100,
+    ):
+        self.items = items
+        self.report = report
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.position = 0
+
+    def __iter__(self) -> Iterator[list[JobFeedItemSchema]]:
+        while batch := self.next_batch():
+            yield batch
+
+    def next_batch(self) -> list[JobFeedItemSchema]:
+        """Следующая пачка вакансий, пустой список — лента закончилась."""
+
+        report = self.report
+        batch: dict[str, JobFeedItemSchema] = {}
+        while len(batch) < self.batch_size:
+            started = time.perf_counter()
+            try:
+                item = next(self.items, None)
+            except FeedFormatError as e:
+                report.error = str(e)
+                item = None
+            parsed = time.perf_counter()
+            report.parsing.seconds += parsed - started
+            if item is None:
+                break
+
+            self.position += 1
+            report.parsing.items += 1
+            try:
+                job = JobFeedItemSchema.model_validate(item)
+            except ValidationError as e:
+                report.invalid += 1
+                if len(report.errors) < self.max_errors:
+                    error = e.errors()[0]
+                    where = ", ".join([f"запись {self.position}", *map(str, error["loc"])])
+                    report.errors.append(f"{where}: {error['msg']}")
+            else:
+                report.validation.items += 1
+                if job.external_id in batch:
+                    report.duplicates += 1
+                batch[job.external_id] = job
+            report.validation.seconds += time.perf_counter() - parsed
+        return list(batch.values())
+
+
+def record_upsert(
+    report: FeedReport, batch_size: int, counts: tuple[int, int], seconds: float
+) -> None:
+    inserted, updated = counts
+    report.inserted += inserted
+    report.updated += updated
+    report.unchanged += batch_size - inserted - updated
+    report.upsert.items += batch_size
+    report.upsert.seconds += seconds
+
+
+class FeedService:
+    def __init__(self, job_repository: IRepositoryAsync):
+        self.job_repository = job_repository
+
+    async def ingest(
+        self, user_id: int, is_company: bool, items: Iterator[dict], batch_size: int = 1000
+    ) -> FeedReport:
+        """Загрузить вакансии работодателя из ленты; каждая пачка — своя транзакция."""
+
+        if not is_company:
+            raise PermissionError("Загружать вакансии могут только компании")
+
+        report = FeedReport()
+        batches = FeedBatches(items, report, batch_size)
+        # разбор читает файл и занимает процессор, поэтому идёт в пуле потоков: следующая
+        # пачка разбирается, пока предыдущая записывается в БД, в памяти не больше двух пачек
+        pending = asyncio.ensure_future(asyncio.to_thread(batches.next_batch))
+        try:
+            # shield: отмена запроса не отменяет задачу разбора, её поток всё равно дорабатывает
+            while batch := await asyncio.shield(pending):
+                pending = asyncio.ensure_future(asyncio.to_thread(batches.next_batch))
+                started = time.perf_counter()
+                counts = await self.job_repository.upsert_many(user_id=user_id, jobs=batch)
+                record_upsert(report, len(batch), counts, time.perf_counter() - started)
+        finally:
+            # поток не прервать: после ошибки записи дождаться разбираемой пачки, иначе он
+            # читал бы файл, который FastAPI закрывает по окончании запроса
+            await asyncio.wait([pending])
+            if not pending.cancelled():
+                pending.exception()
+        return report
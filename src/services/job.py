@@ -1,19 +1,47 @@
+from typing import Optional
+
 from interfaces.i_repository import IRepositoryAsync
-from repositories.exceptions import EntityNotFoundError
-from services.exception import JobNotFoundError
-from web.schemas.job import JobCreateSchema, JobUpdateSchema
+from repositories.exceptions import CheckViolationError, EntityNotFoundError, VersionConflictError
+from services.duplicates import JobDuplicateIndex
+from services.exception import (
+    EditConflictError,
+    JobDuplicateError,
+    JobNotFoundError,
+    JobSalaryRangeError,
+)
+from services.recommendation import JobTextIndex
+from web.schemas.job import JobCreateSchema, JobPatchSchema, JobUpdateSchema
 
 
 class JobService:
-    def __init__(self, job_repository: IRepositoryAsync, user_repository: IRepositoryAsync):
+    def __init__(
+        self,
+        job_repository: IRepositoryAsync,
+        user_repository: IRepositoryAsync,
+        job_index: Optional[JobTextIndex] = None,
+        duplicate_index: Optional[JobDuplicateIndex] = None,
+    ):
         self.job_repository = job_repository
         self.user_repository = user_repository
+        self.job_index = job_index
+        self.duplicate_index = duplicate_index
 
-    async def create(self, user_id: int, is_company: bool, job_create_dto: JobCreateSchema):
+    async def create(
+        self,
+        user_id: int,
+        is_company: bool,
+        job_create_dto: JobCreateSchema,
+        allow_duplicate: bool = False,
+    ):
         if not is_company:
             raise PermissionError("Содавать вакансии могут только компании")
 
-        return await self.job_repository.create(user_id=user_id, job_create_dto=job_create_dto)
+        if job_create_dto.is_active and not allow_duplicate:
+            await self._check_duplicate(user_id, job_create_dto.title, job_create_dto.description)
+
+        job = await self.job_repository.create(user_id=user_id, job_create_dto=job_create_dto)
+        self._index(job)
+        return job
 
     async def retrieve(self, **kwargs):
         try:
@@ -21,21 +49,117 @@ class JobService:
         except EntityNotFoundError as e:
             raise JobNotFoundError("Вакансия не найдена") from e
 
-    async def retrieve_many(self, limit: int, skip: int):
-        return await self.job_repository.retrieve_many(limit=limit, skip=skip)
+    async def retrieve_many(self, limit: int, skip: int, is_active: Optional[bool] = None):
+        return await self.job_repository.retrieve_many(limit=limit, skip=skip, is_active=is_active)
+
+    async def retrieve_version(self, id: int):
+        try:
+            return await self.job_repository.retrieve_version(id=id)
+        except EntityNotFoundError as e:
+            raise JobNotFoundError("Вакансия не найдена") from e
+
+    async def retrieve_many_versions(self, limit: int, skip: int, is_active: Optional[bool] = None):
+        return await self.job_repository.retrieve_many_versions(
+            limit=limit, skip=skip, is_active=is_active
+        )
 
-    async def update(self, id: int, job_update_dto: JobUpdateSchema, user_id: int):
+    async def update(
+        self,
+        id: int,
+        job_update_dto: JobUpdateSchema,
+        user_id: int,
+        allow_duplicate: bool = False,
+    ):
         try:
             job = await self.job_repository.retrieve(id=id)
             if job.user_id != user_id:
                 raise PermissionError("Недостаточно прав")
 
-            return await self.job_repository.update(id=id, job_update_dto=job_update_dto)
+            # незаполненные поля обновление не меняет
+            is_active = (
+                job.is_active if job_update_dto.is_active is None else job_update_dto.is_active
+            )
+            if is_active and not allow_duplicate:
+                await self._check_duplicate(
+                    user_id,
+                    job_update_dto.title or job.title,
+                    job_update_dto.description or job.description,
+                    exclude_id=id,
+                )
+
+            job = await self.job_repository.update(id=id, job_update_dto=job_update_dto)
         except EntityNotFoundError as e:
             raise JobNotFoundError("Вакансия не найдена") from e
 
+        self._index(job)
+        return job
+
+    async def patch(
+        self,
+        id: int,
+        job_patch_dto: JobPatchSchema,
+        user_id: int,
+        allow_duplicate: bool = False,
+    ):
+        values = job_patch_dto.changes()
+        try:
+            # вакансия читается, только если без неё не проверить дубликаты
+            if (
+                self.duplicate_index is not None
+                and not allow_duplicate
+                and values.keys() & {"title", "description", "is_active"}
+            ):
+                job = await self.job_repository.retrieve(id=id)
+                if job.user_id != user_id:
+                    raise JobNotFoundError("Вакансия не найдена")
+                if values.get("is_active", job.is_active):
+                    await self._check_duplicate(
+                        user_id,
+                        values.get("title", job.title),
+                        values.get("description", job.description),
+                        exclude_id=id,
+                    )
+
+            job = await self.job_repository.patch(
+                id=id, user_id=user_id, values=values, version=job_patch_dto.version
+            )
+        except EntityNotFoundError as e:
+            raise JobNotFoundError("Вакансия не найдена") from e
+        except VersionConflictError as e:
+            raise EditConflictError(str(e), e.version) from e
+        except CheckViolationError as e:
+            raise JobSalaryRangeError(str(e)) from e
+
+        self._index(job)
+        return job
+
     async def delete(self, id: int, user_id: int):
         try:
-            return await self.job_repository.delete(id=id, user_id=user_id)
+            job = await self.job_repository.delete(id=id, user_id=user_id)
         except EntityNotFoundError as e:
             raise JobNotFoundError("Вакансия не найдена") from e
+
+        self._index(job)
+        return job
+
+    async def _check_duplicate(
+        self,
+        user_id: int,
+        title: Optional[str],
+        description: Optional[str],
+        exclude_id: Optional[int] = None,
+    ) -> None:
+        if self.duplicate_index is None:
+            return
+
+        # пока индекс строится при старте, проверка идёт по уже загруженной части
+        await self.duplicate_index.sync(self.job_repository, wait=False)
+        duplicate_id = self.duplicate_index.find_duplicate(user_id, title, description, exclude_id)
+        if duplicate_id is not None:
+            raise JobDuplicateError("Похожая вакансия уже опубликована", duplicate_id)
+
+    def _index(self, job) -> None:
+        if self.job_index is not None:
+            self.job_index.upsert_job(job)
+        if self.duplicate_index is not None:
+            self.duplicate_index.upsert_job(job)
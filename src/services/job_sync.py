@@ -0,0 +1,99 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, nullcontext
+from datetime import datetime, timedelta
+from typing import Optional
+
+from interfaces.i_repository import IRepositoryAsync
+from models import Job
+
+
+class JobIndexSyncMixin(ABC):
+    """Синхронизация индекса вакансий в памяти воркера с таблицей jobs.
+
+    Изменения из этого воркера попадают в индекс сразу через JobService,
+    изменения из других воркеров подтягиваются по updated_at не реже `refresh_seconds`.
+
+    updated_at — время начала транзакции, поэтому долгая транзакция фиксирует строку
+    со временем раньше уже прочитанных. Каждая догрузка перечитывает последние
+    `lag_seconds` до отметки; `lag_seconds` должен быть больше самой долгой транзакции,
+    меняющей вакансии (срок запроса — 30 с).
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 30,
+        batch_size: int = 1000,
+        lag_seconds: float = 120,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self.lag = timedelta(seconds=lag_seconds)
+        self.synced_until: Optional[datetime] = None
+        self.synced_at: float = float("-inf")
+        self._lock = asyncio.Lock()
+        # версии вакансий из окна перечитывания: повторно их в индекс не вносим
+        self._recent: dict[int, datetime] = {}
+
+    @abstractmethod
+    def upsert_job(self, job: Job) -> None:
+        """Добавить вакансию в индекс, заменить прежнюю версию или убрать неактивную."""
+
+    async def upsert_jobs(self, jobs: list[Job]) -> None:
+        for job in jobs:
+            self.upsert_job(job)
+
+    def bulk_load(self) -> AbstractAsyncContextManager:
+        return nullcontext()
+
+    @property
+    def ready(self) -> bool:
+        """Индекс построен: первая синхронизация завершилась."""
+
+        return self.synced_at > float("-inf")
+
+    async def sync(self, job_repository: IRepositoryAsync, wait: bool = True) -> None:
+        """Догрузить изменения; с wait=False не ждать уже идущую синхронизацию."""
+
+        if time.monotonic() - self.synced_at < self.refresh_seconds:
+            return
+        if not wait and self._lock.locked():
+            return
+
+        async with self._lock:
+            if time.monotonic() - self.synced_at < self.refresh_seconds:
+                return
+
+            # первый вызов строит индекс целиком, дальше догружаются только изменения
+            if self.synced_until is None:
+                initial, since = self.bulk_load(), None
+            else:
+                initial, since = nullcontext(), self.synced_until - self.lag
+            async with initial:
+                batch = []
+                async for job in job_repository.iter_updated_since(
+                    since, batch_size=self.batch_size
+                ):
+                    if self._recent.get(job.id) == job.updated_at:
+                        continue
+                    batch.append(job)
+                    if len(batch) >= self.batch_size:
+                        await self._apply(batch)
+                        batch = []
+                await self._apply(batch)
+            self.synced_at = time.monotonic()
+
+    async def _apply(self, jobs: list[Job]) -> None:
+        if not jobs:
+            return
+
+        await self.upsert_jobs(jobs)
+        # поздно зафиксированные строки старше отметки: она не должна уходить назад
+        if self.synced_until is None or jobs[-1].updated_at > self.synced_until:
+            self.synced_until = jobs[-1].updated_at
+        since = self.synced_until - self.lag
+        self._recent = {id: at for id, at in self._recent.items() if at >= since}
+        self._recent.update((job.id, job.updated_at) for job in jobs if job.updated_at >= since)
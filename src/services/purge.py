@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from interfaces.i_repository import IRepositoryAsync
+from repositories.exceptions import RepositoryError
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeService:
+    """Окончательное удаление мягко удалённых записей небольшими транзакциями."""
+
+    def __init__(
+        self,
+        user_repository: IRepositoryAsync,
+        job_repository: IRepositoryAsync,
+        response_repository: IRepositoryAsync,
+    ):
+        self.user_repository = user_repository
+        self.job_repository = job_repository
+        self.response_repository = response_repository
+
+    async def purge(self, retention: timedelta, batch_size: int = 1000, pause: float = 0.1) -> int:
+        before = datetime.now(timezone.utc) - retention
+        purged = 0
+        # сначала дети, потом родители: каскаду остаются единичные строки
+        for repository in (self.response_repository, self.job_repository, self.user_repository):
+            while True:
+                deleted = await repository.purge_deleted(before=before, batch_size=batch_size)
+                purged += deleted
+                if deleted < batch_size:
+                    break
+                # пауза между пачками: очистка не должна вытеснять запросы пользователей
+                await asyncio.sleep(pause)
+        return purged
+
+    async def purge_periodically(
+        self, interval_seconds: float, retention: timedelta, batch_size: int = 1000
+    ) -> None:
+        while True:
+            try:
+                await self.purge(retention=retention, batch_size=batch_size)
+            except (RepositoryError, SQLAlchemyError):
+                # сбой БД не должен останавливать фоновую задачу: повторим через интервал,
+                # остальные ошибки — дефекты кода, они завершают задачу
+                logger.exception("Не удалось очистить удалённые записи")
+            await asyncio.sleep(interval_seconds)
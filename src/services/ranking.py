@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from interfaces.i_repository import IRepositoryAsync
+from models import Job, Response
+from repositories.exceptions import EntityNotFoundError
+from services.exception import JobNotFoundError
+from tools.hashing import HashingVectorizer, Vector
+
+
+@dataclass
+class JobScores:
+    job_version: datetime
+    job_vector: Vector
+    built_at: float
+    last_response_id: Optional[int] = None
+    response_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    order: Optional[np.ndarray] = None
+
+    def extend(self, responses: list[Response], scores: np.ndarray) -> None:
+        response_ids = [response.id for response in responses]
+        self.response_ids = np.concatenate([self.response_ids, response_ids])
+        self.scores = np.concatenate([self.scores, scores])
+        # отклики приходят из iter_by_job по возрастанию id
+        self.last_response_id = response_ids[-1]
+        self.order = None
+
+    def page(self, limit: int, skip: int) -> list[tuple[int, float]]:
+        if self.order is None:
+            # стабильная сортировка: при равных оценках выше тот, кто откликнулся раньше
+            self.order = np.argsort(-self.scores, kind="stable")
+        rows = self.order[skip:][:limit].tolist()
+        return [(int(self.response_ids[row]), float(self.scores[row])) for row in rows]
+
+    def rescore(self, response_id: int, score: float) -> None:
+        rows = np.flatnonzero(self.response_ids == response_id)
+        if len(rows):
+            self.scores[rows] = score
+            self.order = None
+
+    def discard(self, response_ids: set[int]) -> None:
+        keep = ~np.isin(self.response_ids, list(response_ids))
+        self.response_ids = self.response_ids[keep]
+        self.scores = self.scores[keep]
+        self.order = None
+
+
+class ResponseScoreCache:
+    """Оценки откликов по вакансиям в памяти воркера.
+
+    Запись вакансии строится целиком при первом запросе или после изменения вакансии,
+    дальше дочитываются только отклики с id больше последнего учтённого. Не реже
+    `max_age_seconds` запись перестраивается заново: так подтягиваются правки откликов
+    из других воркеров и отклики, закоммиченные не в порядке id.
+    """
+
+    def __init__(
+        self,
+        vectorizer: Optional[HashingVectorizer] = None,
+        max_jobs: int = 1000,
+        max_age_seconds: float = 300,
+    ) -> None:
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.max_jobs = max_jobs
+        self.max_age_seconds = max_age_seconds
+        self._entries: OrderedDict[int, JobScores] = OrderedDict()
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def lock(self, job_id: int) -> asyncio.Lock:
+        return self._locks.setdefault(job_id, asyncio.Lock())
+
+    def get(self, job: Job) -> Optional[JobScores]:
+        entry = self._entries.get(job.id)
+        if entry is None:
+            return None
+        if entry.job_version != job.updated_at:
+            return None
+        if time.monotonic() - entry.built_at > self.max_age_seconds:
+            return None
+
+        self._entries.move_to_end(job.id)
+        return entry
+
+    def reset(self, job: Job) -> JobScores:
+        entry = JobScores(
+            job_version=job.updated_at,
+            job_vector=self.vectorizer.transform(f"{job.title} {job.description}"),
+            built_at=time.monotonic(),
+        )
+        self._entries[job.id] = entry
+        self._entries.move_to_end(job.id)
+        while len(self._entries) > self.max_jobs:
+            job_id, _ = self._entries.popitem(last=False)
+            self._locks.pop(job_id, None)
+        return entry
+
+    def score(self, entry: JobScores, responses: list[Response]) -> np.ndarray:
+        """Оценки пачки откликов; не меняет кэш, поэтому безопасно вызывается из потока."""
+
+        return self.vectorizer.similarity(
+            entry.job_vector,
+            (self.vectorizer.transform(response.message) for response in responses),
+        )
+
+    def update_response(self, response: Response) -> None:
+        entry = self._entries.get(response.job_id)
+        if entry is not None:
+            vector = self.vectorizer.transform(response.message)
+            entry.rescore(
+                response.id, float(self.vectorizer.similarity(entry.job_vector, [vector])[0])
+            )
+
+
+class ResponseRankingService:
+    def __init__(
+        self,
+        job_repository: IRepositoryAsync,
+        response_repository: IRepositoryAsync,
+        score_cache: ResponseScoreCache,
+        batch_size: int = 1000,
+    ):
+        self.job_repository = job_repository
+        self.response_repository = response_repository
+        self.score_cache = score_cache
+        self.batch_size = batch_size
+
+    async def rank(self, job_id: int, user_id: int, limit: int, skip: int):
+        try:
+            job = await self.job_repository.retrieve(id=job_id)
+        except EntityNotFoundError as e:
+            raise JobNotFoundError("Вакансия не найдена") from e
+        if job.user_id != user_id:
+            raise PermissionError("Недостаточно прав")
+
+        async with self.score_cache.lock(job.id):
+            entry = self.score_cache.get(job) or self.score_cache.reset(job)
+            await self._score_new_responses(entry, job.id)
+
+        ranked = entry.page(limit, skip)
+        responses = await self.response_repository.retrieve_many_by_ids([id for id, _ in ranked])
+        found = {response.id for response in responses}
+        deleted = {id for id, _ in ranked if id not in found}
+        if deleted:
+            # отклики удалены после подсчёта: убираем их из кэша, эта страница выйдет короче
+            entry.discard(deleted)
+
+        scores = dict(ranked)
+        return [(response, scores[response.id]) for response in responses]
+
+    async def _score_new_responses(self, entry: JobScores, job_id: int) -> None:
+        batch = []
+        async for response in self.response_repository.iter_by_job(
+            job_id, after_id=entry.last_response_id, batch_size=self.batch_size
+        ):
+            batch.append(response)
+            if len(batch) >= self.batch_size:
+                await self._score_batch(entry, batch)
+                batch = []
+        if batch:
+            await self._score_batch(entry, batch)
+
+    async def _score_batch(self, entry: JobScores, batch: list[Response]) -> None:
+        # векторизация тысяч писем занимает секунды: считаем в потоке, не блокируя цикл событий
+        scores = await asyncio.to_thread(self.score_cache.score, entry, batch)
+        entry.extend(batch, scores)
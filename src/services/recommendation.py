@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from interfaces.i_repository import IRepositoryAsync
+from models import Job
+from services.job_sync import JobIndexSyncMixin
+from tools.tfidf import TfIdfIndex
+
+
+class JobTextIndex(JobIndexSyncMixin, TfIdfIndex):
+    """TF-IDF индекс активных вакансий в памяти воркера.
+
+    Тяжёлая работа идёт вне цикла событий: веса термов считаются в потоке, матрица
+    упаковывается в потоке по снимку документов. В цикле событий остаются вставка
+    готовых векторов и подмена упакованных массивов.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(auto_compact=False, **kwargs)
+        self._bulk = False
+        self._compaction: Optional[asyncio.Task] = None
+        self._compaction_lock = asyncio.Lock()
+
+    def upsert_job(self, job: Job, weights: Optional[dict[str, float]] = None) -> None:
+        searchable = job.is_active and job.deleted_at is None
+        self.upsert(job.id, f"{job.title} {job.description}", searchable, weights)
+        self._schedule_compaction()
+
+    async def upsert_jobs(self, jobs: list[Job]) -> None:
+        # веса считаются в потоке, индекс меняется только в цикле событий
+        weights = await asyncio.to_thread(
+            lambda: [self.term_weights(f"{job.title} {job.description}") for job in jobs]
+        )
+        for number, (job, job_weights) in enumerate(zip(jobs, weights), 1):
+            self.upsert_job(job, job_weights)
+            # вставка вектора ~30 мкс: пачка целиком держала бы цикл событий десятки мс
+            if number % 100 == 0:
+                await asyncio.sleep(0)
+
+    @asynccontextmanager
+    async def bulk_load(self):
+        # при первой загрузке матрица упаковывается один раз в конце
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            await self.compact_in_thread()
+
+    async def compact_in_thread(self) -> None:
+        async with self._compaction_lock:
+            snapshot = self.begin_compaction()
+            self.finish_compaction(await asyncio.to_thread(self.pack, snapshot))
+
+    def _schedule_compaction(self) -> None:
+        if self._bulk or not self.needs_compaction():
+            return
+        if self._compaction is not None and not self._compaction.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # вне цикла событий (CLI, бенчмарк) упаковываем сразу
+            self.compact()
+            return
+        self._compaction = loop.create_task(self.compact_in_thread())
+
+
+class RecommendationService:
+    def __init__(
+        self,
+        job_repository: IRepositoryAsync,
+        response_repository: IRepositoryAsync,
+        job_index: JobTextIndex,
+        max_history: int = 200,
+    ):
+        self.job_repository = job_repository
+        self.response_repository = response_repository
+        self.job_index = job_index
+        self.max_history = max_history
+
+    async def recommend(self, user_id: int, limit: int) -> list[Job]:
+        responded_job_ids = set()
+        # индекс строится в фоне при старте воркера: до конца сборки запрос её не ждёт
+        if self.job_index.ready:
+            await self.job_index.sync(self.job_repository, wait=False)
+            responses = await self.response_repository.retrieve_many(
+                user_id=user_id, limit=self.max_history
+            )
+            responded_job_ids = {response.job_id for response in responses}
+        if not responded_job_ids:
+            # истории откликов нет или индекс не готов: показываем свежие активные вакансии
+            return await self.job_repository.retrieve_many(limit=limit, is_active=True)
+
+        profile = self.job_index.profile(responded_job_ids)
+        scored = self.job_index.search(profile, k=limit, exclude=responded_job_ids)
+        return await self.job_repository.retrieve_many_by_ids([id for id, _ in scored])
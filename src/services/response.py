@@ -1,17 +1,26 @@
+from typing import Optional
+
 from interfaces.i_repository import IRepositoryAsync
-from repositories.exceptions import EntityNotFoundError, UniqueError
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
 from services.exception import (
+    EditConflictError,
     ResponseAlreadyExistsError,
     ResponseCreationError,
     ResponseNotFoundError,
 )
+from services.ranking import ResponseScoreCache
 from web.schemas import ResponseCreateSchema
-from web.schemas.response import ResponseUpdateSchema
+from web.schemas.response import ResponsePatchSchema, ResponseUpdateSchema
 
 
 class ResponseService:
-    def __init__(self, response_repository: IRepositoryAsync):
+    def __init__(
+        self,
+        response_repository: IRepositoryAsync,
+        score_cache: Optional[ResponseScoreCache] = None,
+    ):
         self.response_repository = response_repository
+        self.score_cache = score_cache
 
     async def create(
         self, user_id: int, job_id: int, is_company: bool, response_create_dto: ResponseCreateSchema
@@ -48,10 +57,30 @@ class ResponseService:
             )
             if response.user_id != user_id:
                 raise PermissionError("Недостаточно прав")
-            return response
         except EntityNotFoundError as e:
             raise ResponseNotFoundError("Отклик не найден") from e
 
+        if self.score_cache is not None:
+            self.score_cache.update_response(response)
+        return response
+
+    async def patch(self, id: int, user_id: int, response_patch_dto: ResponsePatchSchema):
+        try:
+            response = await self.response_repository.patch(
+                id=id,
+                user_id=user_id,
+                values=response_patch_dto.changes(),
+                version=response_patch_dto.version,
+            )
+        except EntityNotFoundError as e:
+            raise ResponseNotFoundError("Отклик не найден") from e
+        except VersionConflictError as e:
+            raise EditConflictError(str(e), e.version) from e
+
+        if self.score_cache is not None:
+            self.score_cache.update_response(response)
+        return response
+
     async def delete(self, id: int, user_id: int):
         try:
             return await self.response_repository.delete(id=id, user_id=user_id)
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from repositories import StatsRepository
+from repositories.exceptions import EntityNotFoundError, RepositoryError
+from services.exception import StatsNotReadyError
+
+logger = logging.getLogger(__name__)
+
+
+class StatsService:
+    def __init__(self, stats_repository: StatsRepository):
+        self.stats_repository = stats_repository
+
+    async def retrieve(self):
+        try:
+            return await self.stats_repository.retrieve()
+        except EntityNotFoundError as e:
+            raise StatsNotReadyError("Статистика ещё не рассчитана") from e
+
+    async def refresh(self, max_age: timedelta = timedelta(0)) -> bool:
+        return await self.stats_repository.refresh(max_age=max_age)
+
+    async def refresh_periodically(self, interval_seconds: float) -> None:
+        """Фоновый пересчёт: запускается в каждом воркере, пересчитывает один из них."""
+
+        interval = timedelta(seconds=interval_seconds)
+        while True:
+            try:
+                await self.refresh(max_age=interval)
+            except RepositoryError:
+                # попробуем на следующем шаге, статистика пока остаётся прежней; постоянный
+                # сбой (права, сломанное представление) виден по записи на каждом шаге
+                logger.exception("Не удалось пересчитать статистику")
+            await asyncio.sleep(interval_seconds)
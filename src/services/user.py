@@ -1,9 +1,9 @@
 from interfaces.i_repository import IRepositoryAsync
-from repositories.exceptions import EntityNotFoundError, UniqueError
-from services.exception import UserAlreadyExistsError, UserNotFoundError
+from repositories.exceptions import EntityNotFoundError, UniqueError, VersionConflictError
+from services.exception import EditConflictError, UserAlreadyExistsError, UserNotFoundError
 from tools.security import hash_password
 from web.schemas import UserCreateSchema
-from web.schemas.user import UserUpdateSchema
+from web.schemas.user import UserPatchSchema, UserUpdateSchema
 
 
 class UserService:
@@ -24,6 +24,12 @@ class UserService:
         except EntityNotFoundError as e:
             raise UserNotFoundError("Пользователь не найден") from e
 
+    async def retrieve_profile(self, id: int, limit: int):
+        try:
+            return await self.user_repository.retrieve_profile(id=id, limit=limit)
+        except EntityNotFoundError as e:
+            raise UserNotFoundError("Пользователь не найден") from e
+
     async def retrieve_many(self, limit: int, skip: int):
         return await self.user_repository.retrieve_many(limit=limit, skip=skip)
 
@@ -33,6 +39,18 @@ class UserService:
         except EntityNotFoundError as e:
             raise UserNotFoundError("Пользователь не найден") from e
 
+    async def patch(self, id: int, user_patch_dto: UserPatchSchema):
+        try:
+            return await self.user_repository.patch(
+                id=id, values=user_patch_dto.changes(), version=user_patch_dto.version
+            )
+        except EntityNotFoundError as e:
+            raise UserNotFoundError("Пользователь не найден") from e
+        except UniqueError as e:
+            raise UserAlreadyExistsError("Пользователь с таким email уже существует") from e
+        except VersionConflictError as e:
+            raise EditConflictError(str(e), e.version) from e
+
     async def delete(self, id: int):
         try:
             return await self.user_repository.delete(id=id)
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from interfaces import IRateLimitBackend
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRateLimitBackend(IRateLimitBackend):
+    """Корзины токенов в памяти процесса: подходит для одного воркера."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        if tokens >= 1:
+            self._store(key, tokens - 1, now)
+            return 0
+
+        self._store(key, tokens, now)
+        return (1 - tokens) / rate
+
+    async def purge_idle(self, idle_seconds: float) -> int:
+        # порядок dict — порядок обращений: простаивающие корзины в начале
+        before = time.monotonic() - idle_seconds
+        idle = []
+        for key, (_, updated_at) in self._buckets.items():
+            if updated_at >= before:
+                break
+            idle.append(key)
+        for key in idle:
+            del self._buckets[key]
+        return len(idle)
+
+    def _store(self, key: str, tokens: float, now: float) -> None:
+        # переставляем ключ в конец, чтобы порядок dict совпадал с порядком обращений
+        self._buckets.pop(key, None)
+        if len(self._buckets) >= self.max_keys:
+            self._evict_least_recent()
+        self._buckets[key] = (tokens, now)
+
+    def _evict_least_recent(self) -> None:
+        for key in list(self._buckets)[: self.max_keys // 2]:
+            del self._buckets[key]
+
+
+async def purge_idle_buckets_periodically(
+    backend: IRateLimitBackend, interval_seconds: float, idle_seconds: float
+) -> None:
+    """Фоновая очистка простаивающих корзин: таблица rate_limit_buckets не растёт без предела."""
+
+    while True:
+        try:
+            await backend.purge_idle(idle_seconds)
+        except SQLAlchemyError:
+            logger.exception("Не удалось очистить корзины ограничения частоты запросов")
+        await asyncio.sleep(interval_seconds)
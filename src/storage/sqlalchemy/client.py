@@ -1,12 +1,43 @@
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from functools import cached_property
+from typing import Optional
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Connection, Engine, create_engine, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+from sqlalchemy.orm import (
+    Session,
+    SessionTransaction,
+    declarative_base,
+    scoped_session,
+    sessionmaker,
+)
+from sqlalchemy.pool import NullPool, QueuePool
 
 from config import DBSettings
 from interfaces import ISQLAlchemy
+from tools.admission import PoolStatus
+from tools.deadline import remaining
+
+# запрос к БД прерывается чуть раньше срока запроса: ошибка statement_timeout успевает
+# вернуться до отмены обработчика, а соединение остаётся исправным и возвращается в пул
+STATEMENT_TIMEOUT_MARGIN = 0.1
+
+
+class DeadlineSession(Session):
+    """Сессия, транзакции которой не переживают срок текущего запроса."""
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def apply_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    seconds = remaining()
+    if seconds is None:
+        return
+    # SET LOCAL действует до конца транзакции: за PgBouncer в режиме transaction
+    # настройка не останется на серверном соединении, которое получит другой клиент
+    timeout_ms = max(1, int((seconds - STATEMENT_TIMEOUT_MARGIN) * 1000))
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
 
 
 class SqlAlchemySync(ISQLAlchemy):
@@ -15,18 +46,25 @@ class SqlAlchemySync(ISQLAlchemy):
 
     @cached_property
     def Session(self):  # noqa
-        session_factory = sessionmaker(bind=self._build_engine(), autocommit=False, autoflush=False)
+        session_factory = sessionmaker(
+            bind=self._build_engine(), autocommit=False, autoflush=False, expire_on_commit=False
+        )
         return scoped_session(session_factory)
 
+    @contextmanager
     def get_db(self):
-        db = self.Session()
+        # своя сессия на вызов, а не общая для потока: вложенный запрос репозитория
+        # не закроет сессию, из которой идёт потоковое чтение
+        db = self.Session.session_factory()
         try:
             yield db
         finally:
             db.close()
 
     def _build_engine(self) -> Engine:
-        return create_engine(str(self.pg_settings.pg_sync_dsn))
+        return create_engine(
+            str(self.pg_settings.pg_sync_dsn), query_cache_size=self.pg_settings.query_cache_size
+        )
 
     def __call__(self):
         db = self.Session()
@@ -37,20 +75,36 @@ class SqlAlchemySync(ISQLAlchemy):
 
 
 class SqlAlchemyAsync(ISQLAlchemy):
-    def __init__(self, pg_settings: DBSettings) -> None:
+    def __init__(self, pg_settings: DBSettings, workers: int = 1) -> None:
         self.pg_settings = pg_settings
+        self.workers = workers
 
     @cached_property
     def Session(self):  # noqa
         session_factory = sessionmaker(  # noqa
             autocommit=False,
             autoflush=False,
-            bind=self._build_engine(),
+            bind=self.engine,
             class_=AsyncSession,
+            sync_session_class=DeadlineSession,
             expire_on_commit=False,
         )
         return session_factory
 
+    @cached_property
+    def engine(self) -> AsyncEngine:
+        return self._build_engine()
+
+    def pool_status(self) -> Optional[PoolStatus]:
+        """Занятость пула соединений воркера, None — пула нет (NullPool за PgBouncer)."""
+
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return None
+        return PoolStatus(
+            size=pool.size(), checked_out=pool.checkedout(), max_overflow=pool._max_overflow
+        )
+
     @asynccontextmanager
     async def get_db(self):
         db = self.Session()
@@ -60,7 +114,24 @@ class SqlAlchemyAsync(ISQLAlchemy):
             await db.close()
 
     def _build_engine(self) -> AsyncEngine:
-        return create_async_engine(str(self.pg_settings.pg_async_dsn))
+        if self.pg_settings.pgbouncer:
+            # соединения пулит PgBouncer: свой пул воркера только удерживал бы серверные
+            # соединения, поэтому соединение с PgBouncer открывается на каждую сессию
+            pool_options = dict(poolclass=NullPool)
+        else:
+            pool_size, max_overflow = self.pg_settings.pool_limits(self.workers)
+            pool_options = dict(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=self.pg_settings.pool_timeout,
+            )
+
+        return create_async_engine(
+            str(self.pg_settings.pg_async_dsn),
+            query_cache_size=self.pg_settings.query_cache_size,
+            connect_args=self.pg_settings.asyncpg_connect_args(),
+            **pool_options,
+        )
 
     async def __call__(self):
         db = self.Session()
@@ -0,0 +1,57 @@
+from contextlib import AbstractContextManager
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from interfaces import IRateLimitBackend
+from storage.sqlalchemy.tables import RateLimitBucket
+
+
+class SqlAlchemyRateLimitBackend(IRateLimitBackend):
+    """Корзины токенов в Postgres: общие для всех воркеров и узлов."""
+
+    def __init__(self, session: Callable[..., AbstractContextManager[Session]]):
+        self.session = session
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        # пополнение и списание токена одним атомарным upsert, без блокировок на стороне приложения
+        elapsed = func.extract("epoch", func.now() - RateLimitBucket.updated_at)
+        available = func.least(capacity, RateLimitBucket.tokens + elapsed * rate)
+        allowed = available >= 1
+
+        query = (
+            insert(RateLimitBucket)
+            .values(key=key, tokens=capacity - 1, allowed=True, updated_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={
+                    "tokens": available - case((allowed, 1), else_=0),
+                    "allowed": allowed,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(RateLimitBucket.tokens, RateLimitBucket.allowed)
+        )
+
+        async with self.session() as session:
+            res = await session.execute(query)
+            tokens, is_allowed = res.one()
+            await session.commit()
+
+        if is_allowed:
+            return 0
+        return (1 - tokens) / rate
+
+    async def purge_idle(self, idle_seconds: float) -> int:
+        # без индекса по updated_at: раз в несколько минут таблица активных ключей читается
+        # целиком, зато upsert на каждый запрос не обновляет лишний индекс
+        idle_since = func.now() - timedelta(seconds=idle_seconds)
+        query = delete(RateLimitBucket).filter(RateLimitBucket.updated_at < idle_since)
+        async with self.session() as session:
+            res = await session.execute(query)
+            await session.commit()
+
+        return res.rowcount
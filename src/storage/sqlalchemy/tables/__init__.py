@@ -1,3 +1,5 @@
 from .jobs import Job  # noqa
+from .rate_limits import RateLimitBucket  # noqa
 from .responses import Response  # noqa
+from .stats import stats_responses_daily, stats_summary  # noqa
 from .users import User  # noqa
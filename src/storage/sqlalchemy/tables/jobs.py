@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Numeric
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from storage.sqlalchemy.client import Base
@@ -12,7 +13,7 @@ class Job(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, comment="Идентификатор вакансии")
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), comment="Идентификатор пользователя"
+        ForeignKey("users.id", ondelete="CASCADE"), comment="Идентификатор пользователя"
     )
     title: Mapped[str] = mapped_column(comment="Название вакансии")
     description: Mapped[str] = mapped_column(comment="Описание вакансии")
@@ -24,7 +25,46 @@ class Job(Base):
         default=lambda: datetime.now(timezone.utc),
         comment="Дата создания записи",
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        comment="Дата последнего изменения записи",
+    )
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Дата мягкого удаления"
+    )
+    external_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True, comment="Идентификатор вакансии в ленте партнёра"
+    )
+    version: Mapped[int] = mapped_column(
+        default=1, server_default=text("1"), comment="Версия записи, растёт при каждом изменении"
+    )
     user: Mapped["User"] = relationship(back_populates="jobs")  # noqa
     responses: Mapped[list["Response"]] = relationship(  # noqa
-        back_populates="job", cascade="all, delete-orphan"
+        back_populates="job", cascade="all, delete-orphan", passive_deletes=True
     )
+
+
+# частичный индекс для публичной ленты: только активные неудалённые вакансии, от новых к старым
+Index(
+    "ix_jobs_active_created_at_id",
+    Job.created_at.desc(),
+    Job.id.desc(),
+    postgresql_where=Job.is_active & Job.deleted_at.is_(None),
+)
+
+# профиль пользователя: последние вакансии и их число без сортировки всех вакансий
+Index(
+    "ix_jobs_user_id_created_at_id",
+    Job.user_id,
+    Job.created_at.desc(),
+    Job.id.desc(),
+    postgresql_where=Job.deleted_at.is_(None),
+)
+
+# фоновая очистка выбирает давно удалённые вакансии
+Index("ix_jobs_deleted_at", Job.deleted_at, postgresql_where=Job.deleted_at.is_not(None))
+
+# вакансия из ленты партнёра определяется работодателем и идентификатором в ленте:
+# по этому индексу upsert_many находит конфликт; NULL у созданных через API не конфликтуют
+Index("ux_jobs_user_id_external_id", Job.user_id, Job.external_id, unique=True)
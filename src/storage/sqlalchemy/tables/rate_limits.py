@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from storage.sqlalchemy.client import Base
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(primary_key=True, comment="Ключ корзины (маршрут и клиент)")
+    tokens: Mapped[float] = mapped_column(comment="Оставшиеся токены")
+    allowed: Mapped[bool] = mapped_column(comment="Был ли разрешён последний запрос")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), comment="Время последнего пополнения"
+    )
@@ -1,6 +1,7 @@
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from storage.sqlalchemy.client import Base
@@ -8,15 +9,32 @@ from storage.sqlalchemy.client import Base
 
 class Response(Base):
     __tablename__ = "responses"
-    __table_args__ = (UniqueConstraint("user_id", "job_id", name="user_id_job_id_uc"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="user_id_job_id_uc"),
+        # отклики вакансии в порядке поступления: полное и инкрементальное чтение для ранжирования
+        Index("ix_responses_job_id_id", "job_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, comment="Идентификатор записи")
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id"), comment="Идентификатор пользователя"
+        ForeignKey("users.id", ondelete="CASCADE"), comment="Идентификатор пользователя"
+    )
+    job_id: Mapped[int] = mapped_column(
+        ForeignKey("jobs.id", ondelete="CASCADE"), comment="Идентификатор вакансии"
     )
-    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id"), comment="Идентификатор вакансии")
     message: Mapped[Optional[str]] = mapped_column(
         nullable=True, default=None, comment="Сопроводительное письмо"
     )
+    # у откликов, созданных до появления колонки, дата неизвестна
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+        comment="Дата создания записи",
+    )
+    version: Mapped[int] = mapped_column(
+        default=1, server_default=text("1"), comment="Версия записи, растёт при каждом изменении"
+    )
     user: Mapped["User"] = relationship(back_populates="responses")  # noqa
     job: Mapped["Job"] = relationship(back_populates="responses")  # noqa
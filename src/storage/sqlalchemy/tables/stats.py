@@ -0,0 +1,22 @@
+from sqlalchemy import ARRAY, BigInteger, Date, DateTime, Float, Integer, column, table
+
+# материализованные представления создаются миграцией e4a71c09b3d2 и не входят в Base.metadata:
+# иначе alembic считал бы их обычными таблицами
+stats_summary = table(
+    "stats_summary",
+    column("id", Integer),
+    column("users_total", BigInteger),
+    column("companies_total", BigInteger),
+    column("jobs_total", BigInteger),
+    column("active_jobs_total", BigInteger),
+    column("responses_total", BigInteger),
+    column("salary_from_percentiles", ARRAY(Float)),
+    column("salary_to_percentiles", ARRAY(Float)),
+    column("refreshed_at", DateTime(timezone=True)),
+)
+
+stats_responses_daily = table(
+    "stats_responses_daily",
+    column("day", Date),
+    column("responses", BigInteger),
+)
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
+from typing import Optional
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from storage.sqlalchemy.client import Base
@@ -8,9 +9,18 @@ from storage.sqlalchemy.client import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # email освобождается после удаления аккаунта: уникальность только среди живых записей
+        Index(
+            "ix_users_email_not_deleted",
+            "email",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, comment="Идентификатор пользователя")
-    email: Mapped[str] = mapped_column(unique=True, comment="Email адрес")
+    email: Mapped[str] = mapped_column(comment="Email адрес")
     name: Mapped[str] = mapped_column(comment="Имя пользователя")
     hashed_password: Mapped[str] = mapped_column(comment="Зашифрованный пароль")
     is_company: Mapped[bool] = mapped_column(comment="Флаг компании")
@@ -19,10 +29,17 @@ class User(Base):
         default=lambda: datetime.now(timezone.utc),
         comment="Дата создания записи",
     )
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Дата мягкого удаления"
+    )
+    version: Mapped[int] = mapped_column(
+        default=1, server_default=text("1"), comment="Версия записи, растёт при каждом изменении"
+    )
 
+    # дочерние записи удаляет сама БД (ON DELETE CASCADE), ORM их не загружает
     jobs: Mapped[list["Job"]] = relationship(  # noqa
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
     )
     responses: Mapped[list["Response"]] = relationship(  # noqa
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
     )
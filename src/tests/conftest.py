@@ -1,17 +1,19 @@
-import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from unittest.mock import MagicMock
 
 import pytest
 import pytest_asyncio
+from alembic import command
+from alembic.config import Config
 from dependency_injector import providers
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy import inspect
+from pytest_asyncio import is_async_test
+from sqlalchemy import NullPool, create_engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
 
 from config import DBSettings
 from main import app
@@ -24,12 +26,18 @@ from tools.fixtures.users import UserFactory
 from tools.security import create_access_token
 from web.schemas.auth import TokenSchema
 
+SRC_DIR = Path(__file__).parent.parent.resolve()
 env_file_name = ".env." + os.environ.get("STAGE", "test")
-env_file_path = Path(__file__).parent.parent.resolve() / env_file_name
+env_file_path = SRC_DIR / env_file_name
 settings = DBSettings(_env_file=env_file_path)
 
+# savepoint — миграции и соединение с БД одни на сессию pytest, тест откатывает свою
+# транзакцию; connection — своё соединение на каждый тест (медленнее, но тест не видит
+# состояние соединения после соседних тестов: SET, кэш подготовленных выражений)
+TEST_DB_ISOLATION = os.environ.get("TEST_DB_ISOLATION", "savepoint")
 
-@pytest_asyncio.fixture()
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def current_user(sa_session: AsyncSession):
     new_user = UserFactory.build()
 
@@ -41,7 +49,7 @@ async def current_user(sa_session: AsyncSession):
     return new_user
 
 
-@pytest_asyncio.fixture()
+@pytest_asyncio.fixture(loop_scope="session")
 async def access_token(current_user):
     token = TokenSchema(
         access_token=create_access_token({"sub": current_user.id}), token_type="Bearer"
@@ -49,12 +57,12 @@ async def access_token(current_user):
     return token
 
 
-@pytest_asyncio.fixture()
+@pytest_asyncio.fixture(loop_scope="session")
 async def app_with_di():
     yield app
 
 
-@pytest_asyncio.fixture()
+@pytest_asyncio.fixture(loop_scope="session")
 async def client_with_fake_db(app_with_di, access_token, sa_session):
     # патч репозиториев
     app_with_di.container.job_repository.override(
@@ -74,77 +82,156 @@ async def client_with_fake_db(app_with_di, access_token, sa_session):
         yield client
 
 
+@pytest_asyncio.fixture(loop_scope="session")
+async def memory_app(monkeypatch):
+    """Сборка приложения через create_app на репозиториях в памяти с настройками из `env`."""
+
+    import main
+
+    def make(**env: str):
+        monkeypatch.setenv("REPOSITORY_BACKEND", "memory")
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return main.create_app()
+
+    yield make
+
+    # create_app подключил маршруты к своему контейнеру: вернуть контейнер приложения тестов
+    main.app.container.wire()
+
+
 @pytest.fixture()
 def client_app():
     client = TestClient(app)
     return client
 
 
-@pytest_asyncio.fixture(scope="function")
-async def sa_session():
-    engine = create_async_engine(str(settings.pg_async_dsn))
-    connection = await engine.connect()
-    trans = await connection.begin()
+def pytest_collection_modifyitems(items):
+    # все асинхронные тесты идут в одном цикле событий: в нём открыто общее соединение с БД
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    """Применить миграции один раз на сессию pytest."""
+
+    engine = create_engine(str(settings.pg_sync_dsn), poolclass=NullPool)
+    config = Config(SRC_DIR / "alembic.ini")
+    config.set_main_option("script_location", str(SRC_DIR / "migrations"))
+    config.attributes["configure_logger"] = False
+    try:
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+    finally:
+        engine.dispose()
+
+
+def connection_scope(fixture_name: str, config: pytest.Config) -> str:
+    return "session" if TEST_DB_ISOLATION == "savepoint" else "function"
+
+
+@pytest_asyncio.fixture(scope=connection_scope, loop_scope="session")
+async def sa_connection(migrated_db):
+    engine = create_async_engine(str(settings.pg_async_dsn), poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            yield connection
+    finally:
+        await engine.dispose()
+
 
-    Session = sessionmaker(connection, expire_on_commit=False, class_=AsyncSession)  # noqa
-    session = Session()
+@pytest.fixture(scope=connection_scope)
+def sync_connection(migrated_db):
+    engine = create_engine(str(settings.pg_sync_dsn), poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            yield connection
+    finally:
+        engine.dispose()
 
-    deletion = session.delete
 
-    async def mock_delete(instance):
-        insp = inspect(instance)
-        if not insp.persistent:
-            session.expunge(instance)
-        else:
-            await deletion(instance)
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
+async def sa_session(sa_connection):
+    """Сессия теста внутри внешней транзакции, которая откатывается после теста.
 
-        return await asyncio.sleep(0)
+    commit в репозиториях фиксирует SAVEPOINT (join_transaction_mode="create_savepoint"),
+    rollback после ошибки откатывает только его: тест продолжает работать с БД.
+    """
 
-    session.commit = MagicMock(side_effect=session.flush)
-    session.delete = MagicMock(side_effect=mock_delete)
+    trans = await sa_connection.begin()
+    session = AsyncSession(
+        bind=sa_connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
 
     @asynccontextmanager
     async def db():
-        yield session
-
-    session.commit = MagicMock(side_effect=session.flush)
-    session.delete = MagicMock(side_effect=mock_delete)
+        try:
+            yield session
+        except SQLAlchemyError:
+            # ошибка БД прерывает SAVEPOINT, откат возвращает сессию к внешней транзакции.
+            # Прочие ошибки не откатываем: rollback сбросил бы загруженные тестом объекты
+            await session.rollback()
+            raise
 
     try:
         yield db
     finally:
         await session.close()
         await trans.rollback()
-        await connection.close()
-        await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest.fixture()
+def sync_session(sync_connection):
+    trans = sync_connection.begin()
+    session = Session(
+        bind=sync_connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+
+    @contextmanager
+    def db():
+        try:
+            yield session
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+
+    try:
+        yield db
+    finally:
+        session.close()
+        trans.rollback()
+
+
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def user_repository(sa_session):
     repository = UserRepository(session=sa_session)
     yield repository
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def job_repository(sa_session):
     repository = JobRepository(session=sa_session)
     yield repository
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def response_repository(sa_session):
     repository = ResponseRepository(session=sa_session)
     yield repository
 
 
 # регистрация фабрик
-@pytest_asyncio.fixture(scope="function", autouse=True)
+@pytest_asyncio.fixture(scope="function", loop_scope="session", autouse=True)
 def setup_factories(sa_session: AsyncSession) -> None:
     UserFactory.session = sa_session
     JobFactory.session = sa_session
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def test_user(sa_session):
     async with sa_session() as session:
         user = UserFactory.build(id=1, is_company=False)
@@ -154,7 +241,7 @@ async def test_user(sa_session):
         yield user
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def test_job(sa_session):
     async with sa_session() as session:
         job = JobFactory.build(id=1, user_id=1)
@@ -164,7 +251,7 @@ async def test_job(sa_session):
         yield job
 
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="function", loop_scope="session")
 async def test_response(sa_session, test_user, test_job):
     async with sa_session() as session:
         response = ResponseFactory.build(id=1, user_id=1, job_id=1)
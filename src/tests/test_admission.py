@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from dependencies.deadline import RequestTimeout
+from storage.sqlalchemy.client import SqlAlchemyAsync
+from tests.conftest import settings
+from tools.admission import AdmissionController, PoolStatus, Priority
+from tools.security import create_access_token
+from web.middlewares import AdmissionMiddleware
+
+
+def test_priorities_share_limit():
+    controller = AdmissionController(initial_limit=10)
+
+    admitted = [controller.try_acquire(Priority.LOW) for _ in range(6)]
+    assert admitted == [True] * 5 + [False]
+    assert [controller.try_acquire(Priority.NORMAL) for _ in range(4)] == [True, True, True, False]
+    assert [controller.try_acquire(Priority.HIGH) for _ in range(3)] == [True, True, False]
+    assert controller.in_flight == 10
+    assert controller.shed == {Priority.LOW: 1, Priority.NORMAL: 1, Priority.HIGH: 1}
+
+
+def test_limit_follows_latency():
+    controller = AdmissionController(initial_limit=4, min_limit=2, latency_target=0.1)
+
+    # быстрые ответы под нагрузкой: +1 к лимиту за каждые `limit` ответов
+    for _ in range(4):
+        assert controller.try_acquire(Priority.HIGH)
+    for _ in range(4):
+        controller.release(latency=0.01)
+    assert controller.limit == pytest.approx(4.5, abs=0.1)
+
+    # без нагрузки лимит не растёт
+    controller.try_acquire(Priority.HIGH)
+    controller.release(latency=0.01)
+    assert controller.limit == pytest.approx(4.5, abs=0.1)
+
+    # медленные ответы одного всплеска уменьшают лимит один раз
+    limit = controller.limit
+    for _ in range(3):
+        controller.try_acquire(Priority.HIGH)
+    for _ in range(3):
+        controller.release(latency=1)
+    assert controller.limit == pytest.approx(limit * 0.75)
+
+    # 503/504 — признак перегрузки независимо от времени ответа; лимит не ниже min_limit
+    for _ in range(3):
+        controller._decreased_at = float("-inf")
+        controller.try_acquire(Priority.HIGH)
+        controller.release(latency=0.01, overloaded=True)
+    assert controller.limit == 2
+
+
+def test_saturated_pool_sheds_anonymous_reads():
+    pool = PoolStatus(size=2, checked_out=2, max_overflow=0)
+    controller = AdmissionController(pool_status=lambda: pool)
+
+    assert not controller.try_acquire(Priority.LOW)
+    assert controller.try_acquire(Priority.NORMAL)
+
+    # лимит уменьшается, пока пул исчерпан, даже при быстрых ответах
+    controller.release(latency=0.01)
+    assert controller.limit == 15
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_past_limit():
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/jobs")
+    async def jobs() -> list:
+        await release.wait()
+        return []
+
+    @app.post("/jobs")
+    async def create_job() -> dict:
+        return {}
+
+    controller = AdmissionController(initial_limit=4)
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    transport = ASGITransport(app=app)
+    token = create_access_token({"sub": "1"})
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        scans = [asyncio.create_task(client.get("/jobs")) for _ in range(2)]
+        while controller.in_flight < 2:
+            await asyncio.sleep(0.01)
+
+        shed = await client.get("/jobs")
+        write = await client.post("/jobs", headers={"Authorization": f"Bearer {token}"})
+        release.set()
+        scans = await asyncio.gather(*scans)
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert write.status_code == 200
+    assert [response.status_code for response in scans] == [200, 200]
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_status():
+    db = SqlAlchemyAsync(settings)
+    try:
+        async with db.engine.connect():
+            pool = db.pool_status()
+        assert pool.checked_out == 1
+        assert pool.capacity == sum(settings.pool_limits(1))
+        assert db.pool_status().checked_out == 0
+    finally:
+        await db.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_routes_with_own_deadline_keep_limit():
+    app = FastAPI()
+
+    @app.post("/jobs/feed", dependencies=[Depends(RequestTimeout(seconds=600))])
+    async def upload_feed() -> dict:
+        await asyncio.sleep(0.05)
+        return {}
+
+    @app.get("/jobs")
+    async def jobs() -> list:
+        await asyncio.sleep(0.05)
+        return []
+
+    controller = AdmissionController(initial_limit=10, latency_target=0.01)
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        # долгая загрузка ленты укладывается в свой срок: лимит остальных не меняется
+        assert (await client.post("/jobs/feed")).status_code == 200
+        assert controller.limit == 10
+        assert (await client.get("/jobs")).status_code == 200
+
+    assert controller.limit == 7.5
+    assert controller.in_flight == 0
@@ -0,0 +1,27 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_login_is_rate_limited_per_ip(memory_app):
+    transport = ASGITransport(app=memory_app())
+    credentials = {"email": "nobody@example.com", "password": "password"}
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        statuses = [(await client.post("/auth", json=credentials)).status_code for _ in range(10)]
+        limited = await client.post("/auth", json=credentials)
+
+    assert statuses == [401] * 10
+    assert limited.status_code == 429
+    assert 0 < int(limited.headers["Retry-After"]) <= 6
+
+
+@pytest.mark.asyncio
+async def test_login_is_not_limited_when_disabled(memory_app):
+    transport = ASGITransport(app=memory_app(RATE_LIMIT_ENABLED="false"))
+    credentials = {"email": "nobody@example.com", "password": "password"}
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        statuses = {(await client.post("/auth", json=credentials)).status_code for _ in range(11)}
+
+    assert statuses == {401}
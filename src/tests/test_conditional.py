@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from tools.conditional import cache_headers, is_not_modified, make_etag
+
+UPDATED_AT = datetime(2026, 10, 19, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag(1, UPDATED_AT.isoformat())
+
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag(1, UPDATED_AT.isoformat())
+    assert etag != make_etag(2, UPDATED_AT.isoformat())
+
+
+def test_if_none_match():
+    etag = make_etag(1)
+
+    assert is_not_modified(etag, if_none_match=etag)
+    # слабое сравнение и список тегов
+    assert is_not_modified(etag, if_none_match=f'"other", {etag.removeprefix("W/")}')
+    assert is_not_modified(etag, if_none_match="*")
+    assert not is_not_modified(etag, if_none_match=make_etag(2))
+
+
+def test_if_modified_since_without_if_none_match():
+    etag = make_etag(1)
+    last_modified = cache_headers(etag, UPDATED_AT)["Last-Modified"]
+
+    assert last_modified == "Mon, 19 Oct 2026 09:30:15 GMT"
+    # в заголовке нет микросекунд: дата из Last-Modified считается немодифицированной
+    assert is_not_modified(etag, UPDATED_AT, if_modified_since=last_modified)
+    assert not is_not_modified(etag, UPDATED_AT, if_modified_since="Mon, 19 Oct 2026 09:30:14 GMT")
+    assert not is_not_modified(etag, UPDATED_AT, if_modified_since="not a date")
+    assert not is_not_modified(etag, None, if_modified_since=last_modified)
+
+
+def test_if_none_match_takes_precedence():
+    etag = make_etag(1)
+    last_modified = cache_headers(etag, UPDATED_AT)["Last-Modified"]
+
+    assert not is_not_modified(
+        etag, UPDATED_AT, if_none_match=make_etag(2), if_modified_since=last_modified
+    )
+    assert is_not_modified(
+        etag,
+        UPDATED_AT,
+        if_none_match=etag,
+        if_modified_since="Mon, 19 Oct 2026 09:30:14 GMT",
+    )
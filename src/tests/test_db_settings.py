@@ -0,0 +1,47 @@
+import pytest
+
+from config import DBSettings
+
+CONNECTION = dict(postgres_user="admin", postgres_host="localhost", db_name="labor-exchange")
+
+
+def test_pool_limits_fit_connection_budget():
+    settings = DBSettings(
+        **CONNECTION,
+        pool_size=10,
+        max_overflow=20,
+        pg_max_connections=100,
+        pg_reserved_connections=10,
+    )
+
+    for workers in (1, 4, 16, 90):
+        pool_size, max_overflow = settings.pool_limits(workers)
+        assert pool_size >= 1
+        assert max_overflow >= 0
+        assert (pool_size + max_overflow) * workers <= 90
+
+
+def test_pool_limits_reject_workers_over_budget():
+    settings = DBSettings(**CONNECTION, pg_max_connections=20, pg_reserved_connections=4)
+
+    assert settings.pool_limits(workers=16) == (1, 0)
+    with pytest.raises(ValueError, match="17 воркеров"):
+        settings.pool_limits(workers=17)
+
+
+def test_pool_limits_keep_configured_size_when_budget_allows():
+    settings = DBSettings(**CONNECTION, pool_size=5, max_overflow=10, pg_max_connections=100)
+
+    assert settings.pool_limits(workers=2) == (5, 10)
+    assert settings.pool_limits(workers=6) == (5, 10)
+    assert settings.pool_limits(workers=8) == (5, 6)
+
+
+def test_pgbouncer_mode_disables_statement_caches():
+    settings = DBSettings(**CONNECTION, prepared_statement_cache_size=500)
+    assert settings.asyncpg_connect_args() == dict(prepared_statement_cache_size=500)
+
+    args = DBSettings(**CONNECTION, pgbouncer=True).asyncpg_connect_args()
+    name = args.pop("prepared_statement_name_func")
+    assert args == dict(prepared_statement_cache_size=0, statement_cache_size=0)
+    assert name() != name()
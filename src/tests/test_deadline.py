@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from dependencies.deadline import RequestTimeout
+from storage.sqlalchemy.client import SqlAlchemyAsync
+from tests.conftest import settings
+from tools.deadline import Deadline, current_deadline, remaining
+from web.middlewares import DeadlineMiddleware, DeadlineStats, add_timeout_handlers
+
+
+def create_app(stats: DeadlineStats, default_seconds: float = 0.2) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sleep")
+    async def sleep(seconds: float) -> dict:
+        budget = remaining()
+        await asyncio.sleep(seconds)
+        return {"remaining": budget}
+
+    @app.get("/slow", dependencies=[Depends(RequestTimeout(seconds=1))])
+    async def slow(seconds: float) -> dict:
+        await asyncio.sleep(seconds)
+        return {"remaining": remaining()}
+
+    @app.get("/query")
+    async def query() -> None:
+        async with SqlAlchemyAsync(settings).get_db() as session:
+            await session.execute(text("SELECT pg_sleep(1)"))
+
+    app.add_middleware(DeadlineMiddleware, default_seconds=default_seconds, stats=stats)
+    add_timeout_handlers(app, stats)
+    return app
+
+
+@pytest.fixture()
+def stats():
+    return DeadlineStats()
+
+
+@pytest.fixture()
+def client(stats):
+    transport = ASGITransport(app=create_app(stats))
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_deadline_expires_with_504(client, stats):
+    fast = await client.get("/sleep", params={"seconds": 0})
+    slow = await client.get("/sleep", params={"seconds": 1})
+
+    assert fast.status_code == 200
+    assert 0 < fast.json()["remaining"] <= 0.2
+    assert slow.status_code == 504
+    assert stats.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_route_timeout_is_capped_by_client_header(client, stats):
+    response = await client.get("/slow", params={"seconds": 0.3})
+    assert response.status_code == 200
+    assert 0.5 < response.json()["remaining"] <= 1
+
+    response = await client.get(
+        "/slow", params={"seconds": 0.3}, headers={"X-Request-Timeout": "0.1"}
+    )
+    assert response.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_follows_deadline(client, stats):
+    response = await client.get("/query", headers={"X-Request-Timeout": "0.5"})
+
+    # statement_timeout срабатывает раньше срока запроса: в нём уже учтено прошедшее время
+    assert response.status_code == 504
+    assert stats.statement_timeouts == 1
+    assert stats.timeouts == 0
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_handler(stats):
+    cancelled = asyncio.Event()
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise AssertionError("ответ отключившемуся клиенту не отправляется")
+
+    middleware = DeadlineMiddleware(app, default_seconds=5, stats=stats)
+    await middleware({"type": "http", "path": "/", "headers": []}, receive, send)
+
+    assert cancelled.is_set()
+    assert stats.disconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_reschedule_without_route_timeout_keeps_client_deadline():
+    loop = asyncio.get_running_loop()
+    async with asyncio.timeout(None) as timeout:
+        deadline = Deadline(timeout, client_when=loop.time() + 1)
+        token = current_deadline.set(deadline)
+        try:
+            deadline.reschedule(None)
+            assert 0.9 < remaining() <= 1
+            deadline.reschedule(10)
+            assert remaining() <= 1
+        finally:
+            current_deadline.reset(token)
+
+    assert remaining() is None
@@ -0,0 +1,155 @@
+import io
+import time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from models import FeedReport
+from services import FeedBatches, FeedService
+from tools.feeds import FeedFormatError, iter_json, iter_xml
+from tools.fixtures.users import UserFactory
+
+
+def feed_item(external_id: str, title: str = "Python разработчик", **fields) -> dict:
+    return {
+        "external_id": external_id,
+        "title": title,
+        "description": "Пишем бэкенд",
+        "salary_from": "100",
+        "salary_to": "200",
+        **fields,
+    }
+
+
+def test_iter_json_reads_array_and_lines_by_chunks():
+    array = b'[{"external_id": "1", "salary_from": 1.5},\n {"tags": ["]", "}"]}]'
+    lines = b'{"external_id": "1"}\n{"external_id": "2"}\n'
+
+    assert list(iter_json(io.BytesIO(array), chunk_size=4)) == [
+        {"external_id": "1", "salary_from": Decimal("1.5")},
+        {"tags": ["]", "}"]},
+    ]
+    assert list(iter_json(io.BytesIO(lines), chunk_size=4)) == [
+        {"external_id": "1"},
+        {"external_id": "2"},
+    ]
+    assert list(iter_json(io.BytesIO(b""))) == []
+
+
+@pytest.mark.parametrize("data", [b'[{"a": 1}', b'{"a": ', b"[1]", b'[{"a": "' + b"x" * 100])
+def test_iter_json_rejects_broken_feed(data):
+    with pytest.raises(FeedFormatError):
+        list(iter_json(io.BytesIO(data), chunk_size=8, max_item_size=64))
+
+
+def test_iter_xml_reads_nested_items():
+    data = (
+        b'<feed><jobs><job external_id="1"><title> Python </title><salary_from/></job>'
+        b"<job><title>Go</title></job></jobs></feed>"
+    )
+
+    assert list(iter_xml(io.BytesIO(data))) == [
+        {"external_id": "1", "title": "Python", "salary_from": None},
+        {"title": "Go"},
+    ]
+    with pytest.raises(FeedFormatError):
+        list(iter_xml(io.BytesIO(b"<jobs><job>")))
+
+
+def test_feed_batches_dedup_and_errors():
+    report = FeedReport()
+    items = iter(
+        [
+            feed_item("1"),
+            feed_item("2", salary_from="300"),
+            feed_item("1", title="Senior Python разработчик"),
+            feed_item("3"),
+        ]
+    )
+
+    batches = list(FeedBatches(items, report, batch_size=2))
+
+    assert [[job.external_id for job in batch] for batch in batches] == [["1", "3"]]
+    assert batches[0][0].title == "Senior Python разработчик"
+    assert (report.parsing.items, report.validation.items) == (4, 3)
+    assert (report.invalid, report.duplicates) == (1, 1)
+    assert report.errors == [
+        "запись 2: Value error, Зарплата 'от' не может быть больше зарплаты 'до'"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ingest_upserts_by_external_id(job_repository, sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        session.add(company)
+        await session.flush()
+
+        statements = []
+        event.listen(
+            session.sync_session.connection(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        service = FeedService(job_repository)
+        first = await service.ingest(
+            company.id, True, iter([feed_item("1"), feed_item("2")]), batch_size=1
+        )
+        second = await service.ingest(
+            company.id,
+            True,
+            iter([feed_item("1"), feed_item("2", is_active=False), feed_item("3")]),
+        )
+
+    # пачка — одна команда INSERT ... ON CONFLICT, а не команда на строку
+    assert len([statement for statement in statements if statement.startswith("INSERT")]) == 3
+    assert (first.inserted, first.updated, first.upsert.items) == (2, 0, 2)
+    assert (second.inserted, second.updated, second.unchanged) == (1, 1, 1)
+    jobs = {job.external_id: job for job in await job_repository.retrieve_many(limit=10)}
+    assert sorted(jobs) == ["1", "2", "3"]
+    assert not jobs["2"].is_active
+
+    # удалённая вакансия, которая снова пришла в ленте, восстанавливается
+    await job_repository.delete(id=jobs["1"].id, user_id=company.id)
+    third = await service.ingest(company.id, True, iter([feed_item("1")]))
+    assert third.updated == 1
+    assert (await job_repository.retrieve(id=jobs["1"].id)).deleted_at is None
+
+    with pytest.raises(PermissionError):
+        await service.ingest(company.id, False, iter([]))
+
+
+@pytest.mark.asyncio
+async def test_ingest_reports_broken_file(job_repository, sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        session.add(company)
+        await session.flush()
+
+    data = io.BytesIO(b'[{"external_id": "1", "title": "Python", "description": "", ')
+    report = await FeedService(job_repository).ingest(company.id, True, iter_json(data))
+
+    assert report.error.startswith("Некорректный JSON")
+    assert report.inserted == 0
+
+
+@pytest.mark.asyncio
+async def test_ingest_waits_for_parsing_thread_on_error():
+    parsed = []
+
+    def items():
+        for number in range(4):
+            time.sleep(0.05)
+            parsed.append(number)
+            yield feed_item(str(number))
+
+    class FailingJobRepository:
+        async def upsert_many(self, user_id, jobs):
+            raise ConnectionError("БД недоступна")
+
+    with pytest.raises(ConnectionError):
+        await FeedService(FailingJobRepository()).ingest(1, True, items(), batch_size=2)
+
+    # ошибка вернулась только после того, как поток разобрал начатую вторую пачку
+    assert parsed == [0, 1, 2, 3]
@@ -0,0 +1,28 @@
+import numpy as np
+
+from tools.hashing import HashingVectorizer
+
+
+def test_vectors_are_normalized():
+    vectorizer = HashingVectorizer(n_features=2**16)
+
+    _, values = vectorizer.transform("Опытный разработчик Python, пишу на FastAPI")
+
+    assert np.isclose(np.linalg.norm(values), 1)
+
+
+def test_similarity_prefers_related_text_and_word_forms():
+    vectorizer = HashingVectorizer()
+    job = vectorizer.transform("Ищем разработчика Python для сервиса на FastAPI")
+
+    scores = vectorizer.similarity(
+        job,
+        [
+            vectorizer.transform("Я разработчик Python, три года пишу сервисы на FastAPI"),
+            vectorizer.transform("Бухгалтер со знанием 1С"),
+            vectorizer.transform(None),
+        ],
+    )
+
+    assert scores[0] > scores[1] >= 0
+    assert scores[2] == 0
@@ -1,11 +1,18 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from pydantic import ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
 
 from repositories import JobRepository
+from repositories.exceptions import CheckViolationError, EntityNotFoundError, VersionConflictError
+from repositories.job_repository import JobQueries
+from storage.sqlalchemy.tables import Job
 from tools.fixtures.jobs import JobFactory
 from tools.fixtures.responses import ResponseFactory
 from tools.fixtures.users import UserFactory
-from web.schemas import JobCreateSchema
+from web.schemas import JobCreateSchema, JobPatchSchema, JobUpdateSchema
 
 
 @pytest.mark.asyncio
@@ -86,6 +93,23 @@ async def test_get_by_id(job_repository, sa_session):
     assert current_job.id == job.id
 
 
+@pytest.mark.asyncio
+async def test_retrieve_reuses_query_across_values(job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build()
+        jobs = JobFactory.build_batch(2, user_id=user.id)
+        session.add(user)
+        session.add_all(jobs)
+        await session.flush()
+
+    JobRepository._retrieve_query.cache_clear()
+    for job in jobs:
+        assert (await job_repository.retrieve(id=job.id, user_id=user.id)).id == job.id
+
+    cache = JobRepository._retrieve_query.cache_info()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
 @pytest.mark.asyncio
 async def test_create_with_invalid_data(job_repository):
     with pytest.raises(ValidationError):
@@ -98,3 +122,186 @@ async def test_create_with_invalid_data(job_repository):
         )
 
         await job_repository.create(job_create_dto=job, user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_get_all_filtered_by_is_active(job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build()
+        active_job = JobFactory.build(user_id=user.id, is_active=True)
+        inactive_job = JobFactory.build(user_id=user.id, is_active=False)
+        session.add(user)
+        session.add_all([active_job, inactive_job])
+        await session.flush()
+
+    active_jobs = await job_repository.retrieve_many(is_active=True)
+    assert [job.id for job in active_jobs] == [active_job.id]
+
+    inactive_jobs = await job_repository.retrieve_many(is_active=False)
+    assert [job.id for job in inactive_jobs] == [inactive_job.id]
+
+    all_jobs = await job_repository.retrieve_many()
+    assert len(all_jobs) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_bumps_version(job_repository, sa_session):
+    stale = datetime.now(timezone.utc) - timedelta(days=1)
+    async with sa_session() as session:
+        user = UserFactory.build()
+        job = JobFactory.build(user_id=user.id, updated_at=stale)
+        session.add(user)
+        session.add(job)
+        await session.flush()
+
+    assert await job_repository.retrieve_version(id=job.id) == stale
+
+    updated_job = await job_repository.update(
+        id=job.id, job_update_dto=JobUpdateSchema(title="updated_title")
+    )
+    assert updated_job.updated_at > stale
+    assert await job_repository.retrieve_version(id=job.id) == updated_job.updated_at
+
+    versions = await job_repository.retrieve_many_versions()
+    assert versions == [(job.id, updated_job.updated_at)]
+
+
+@pytest.mark.asyncio
+async def test_patch_changes_only_given_fields(job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build()
+        job = JobFactory.build(user_id=user.id, title="Python", is_active=True)
+        session.add(user)
+        session.add(job)
+        await session.flush()
+
+    put = await job_repository.update(id=job.id, job_update_dto=JobUpdateSchema(title="Go"))
+    assert put.version == 2
+
+    patch = JobPatchSchema(is_active=False, version=2)
+    patched = await job_repository.patch(
+        id=job.id, user_id=user.id, values=patch.changes(), version=patch.version
+    )
+    assert (patched.title, patched.is_active, patched.version) == ("Go", False, 3)
+    assert patched.description == job.description
+
+    # клиент прочитал вакансию до последнего изменения
+    with pytest.raises(VersionConflictError) as e:
+        await job_repository.patch(id=job.id, user_id=user.id, values={"title": "Rust"}, version=2)
+    assert e.value.version == 3
+    assert (await job_repository.retrieve(id=job.id)).title == "Go"
+
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.patch(id=job.id, user_id=user.id + 1, values={"title": "Rust"})
+
+
+@pytest.mark.asyncio
+async def test_patch_compares_salary_with_stored_bound(job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build()
+        job = JobFactory.build(user_id=user.id, salary_from=100, salary_to=200)
+        session.add(user)
+        session.add(job)
+        await session.flush()
+
+    for values in ({"salary_from": 300}, {"salary_to": 50}):
+        with pytest.raises(CheckViolationError):
+            await job_repository.patch(id=job.id, user_id=user.id, values=values)
+    # конфликт версий важнее: с устаревшей версией клиенту нужно перечитать вакансию
+    with pytest.raises(VersionConflictError):
+        await job_repository.patch(id=job.id, user_id=user.id, values={"salary_to": 50}, version=7)
+
+    patched = await job_repository.patch(id=job.id, user_id=user.id, values={"salary_from": 200})
+    assert (patched.salary_from, patched.salary_to, patched.version) == (200, 200, 2)
+
+
+def test_patch_schema_rejects_null_for_required_fields():
+    assert JobPatchSchema(title="Go").changes() == {"title": "Go"}
+    with pytest.raises(ValidationError):
+        JobPatchSchema(title=None)
+    with pytest.raises(ValidationError):
+        JobPatchSchema(version=0)
+
+
+@pytest.mark.asyncio
+async def test_retrieve_version_not_found(job_repository):
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.retrieve_version(id=1)
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many_by_ids_keeps_order(job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build()
+        jobs = JobFactory.build_batch(3, user_id=user.id)
+        session.add(user)
+        session.add_all(jobs)
+        await session.flush()
+
+    ids = [jobs[2].id, jobs[0].id, -1]
+    found = await job_repository.retrieve_many_by_ids(ids)
+
+    assert [job.id for job in found] == [jobs[2].id, jobs[0].id]
+
+
+@pytest.mark.asyncio
+async def test_iter_updated_since(job_repository, sa_session):
+    now = datetime.now(timezone.utc)
+    async with sa_session() as session:
+        user = UserFactory.build()
+        old_job = JobFactory.build(user_id=user.id, updated_at=now - timedelta(days=2))
+        new_job = JobFactory.build(user_id=user.id, updated_at=now)
+        session.add(user)
+        session.add_all([old_job, new_job])
+        await session.flush()
+
+    all_jobs = [job.id async for job in job_repository.iter_updated_since()]
+    assert all_jobs == [old_job.id, new_job.id]
+
+    changed = [job.id async for job in job_repository.iter_updated_since(now - timedelta(days=1))]
+    assert changed == [new_job.id]
+
+
+@pytest.mark.asyncio
+async def test_delete_is_soft_until_purge(job_repository, response_repository, sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        applicant = UserFactory.build(is_company=False)
+        session.add_all([company, applicant])
+        await session.flush()
+        job = JobFactory.build(user_id=company.id, is_active=True)
+        session.add(job)
+        await session.flush()
+        session.add(ResponseFactory.build(user_id=applicant.id, job_id=job.id))
+        await session.flush()
+
+    deleted = await job_repository.delete(id=job.id, user_id=company.id)
+
+    assert deleted.deleted_at is not None
+    assert await job_repository.retrieve_many() == []
+    assert await response_repository.retrieve_many(job_id=job.id) == []
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.retrieve(id=job.id)
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.delete(id=job.id, user_id=company.id)
+
+    not_yet = deleted.deleted_at - timedelta(seconds=1)
+    assert await job_repository.purge_deleted(before=not_yet) == 0
+    purge_time = deleted.deleted_at + timedelta(seconds=1)
+    assert await response_repository.purge_deleted(before=purge_time) == 1
+    assert await job_repository.purge_deleted(before=purge_time) == 1
+
+
+@pytest.mark.asyncio
+async def test_active_listing_uses_partial_index(sa_session):
+    # на пустой таблице планировщик выбрал бы seq scan при любом условии: он запрещён,
+    # и IS TRUE вместо "=" дал бы сканирование другого индекса с сортировкой
+    query = JobQueries._paginate(select(Job), limit=20, skip=0, is_active=True)
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    async with sa_session() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        res = await session.execute(text(f"EXPLAIN {compiled}"))
+        plan = "\n".join(res.scalars().all())
+
+    assert "ix_jobs_active_created_at_id" in plan
+    assert "Sort" not in plan
@@ -0,0 +1,113 @@
+import pytest
+import pytest_asyncio
+from dependency_injector import providers
+from httpx import ASGITransport, AsyncClient
+
+from main import app
+from repositories.memory import InMemoryJobRepository, InMemoryStore, InMemoryUserRepository
+from services import JobService, UserService
+from tools.security import create_access_token
+from web.schemas import JobCreateSchema, UserCreateSchema
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def job_client():
+    """Клиент приложения, у которого сервис вакансий работает на репозиториях в памяти."""
+
+    store = InMemoryStore()
+    user_repository = InMemoryUserRepository(store)
+    job_repository = InMemoryJobRepository(store)
+    job_service = providers.Factory(
+        JobService, job_repository=job_repository, user_repository=user_repository
+    )
+    company = await user_repository.create(
+        UserCreateSchema(
+            name="Компания",
+            email="hr@example.com",
+            password="password",
+            password2="password",
+            is_company=True,
+        ),
+        hashed_password="hash",
+    )
+    for is_active in (True, True, False):
+        await job_repository.create(
+            user_id=company.id,
+            job_create_dto=JobCreateSchema(
+                title="Python",
+                description="FastAPI",
+                salary_from=1,
+                salary_to=2,
+                is_active=is_active,
+            ),
+        )
+
+    # вход по токену ищет пользователя через сервис пользователей: тоже в памяти
+    user_service = providers.Factory(UserService, user_repository=user_repository)
+    with app.container.job_service.override(job_service), app.container.user_service.override(
+        user_service
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client, job_repository
+
+
+@pytest.mark.asyncio
+async def test_read_job_not_modified(job_client):
+    client, _ = job_client
+
+    job = await client.get("/jobs/1")
+    etag, last_modified = job.headers["ETag"], job.headers["Last-Modified"]
+    by_etag = await client.get("/jobs/1", headers={"If-None-Match": etag})
+    by_date = await client.get("/jobs/1", headers={"If-Modified-Since": last_modified})
+    # If-None-Match приоритетнее: несовпадающий тег отдаёт вакансию при свежей дате
+    mismatch = await client.get(
+        "/jobs/1", headers={"If-None-Match": 'W/"other"', "If-Modified-Since": last_modified}
+    )
+
+    assert job.status_code == 200
+    for response in (by_etag, by_date):
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+    assert mismatch.status_code == 200
+    assert mismatch.json() == job.json()
+
+
+@pytest.mark.asyncio
+async def test_job_list_revalidates_by_etag_only(job_client):
+    client, job_repository = job_client
+
+    page = await client.get("/jobs", params={"is_active": True})
+    etag = page.headers["ETag"]
+    cached = await client.get("/jobs", params={"is_active": True}, headers={"If-None-Match": etag})
+
+    assert [job["id"] for job in page.json()] == [2, 1]
+    assert "Last-Modified" not in page.headers
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # вакансия ушла со страницы, оставшиеся не изменились: ETag другой, ответ полный
+    await job_repository.patch(2, user_id=1, values={"is_active": False})
+    changed = await client.get("/jobs", params={"is_active": True}, headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert [job["id"] for job in changed.json()] == [1]
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_patch_keeps_salary_range(job_client):
+    client, job_repository = job_client
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+    # вторая граница не передана: сравнивается с сохранённой (от 1 до 2)
+    above = await client.patch("/jobs/1", json={"salary_from": 5}, headers=headers)
+    below = await client.patch("/jobs/1", json={"salary_to": 0.5}, headers=headers)
+    raised = await client.patch("/jobs/1", json={"salary_to": 10}, headers=headers)
+
+    assert above.status_code == below.status_code == 422
+    assert raised.status_code == 200
+    job = await job_repository.retrieve(id=1)
+    assert (job.salary_from, job.salary_to, job.version) == (1, 10, 2)
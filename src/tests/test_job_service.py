@@ -0,0 +1,122 @@
+import pytest
+
+from services import JobDuplicateIndex, JobService
+from services.exception import EditConflictError, JobDuplicateError, JobNotFoundError
+from tools.fixtures.jobs import JobFactory
+from tools.fixtures.users import UserFactory
+from web.schemas import JobCreateSchema, JobPatchSchema, JobUpdateSchema
+
+DESCRIPTION = "Разработка сервисов на FastAPI и PostgreSQL, опыт от 3 лет, удалённая работа"
+
+
+@pytest.fixture()
+def job_service(job_repository, user_repository):
+    return JobService(job_repository, user_repository, duplicate_index=JobDuplicateIndex())
+
+
+async def create_company_with_job(sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        session.add(company)
+        await session.flush()
+        job = JobFactory.build(
+            user_id=company.id, title="Python developer", description=DESCRIPTION, is_active=True
+        )
+        session.add(job)
+        await session.flush()
+
+    return company, job
+
+
+@pytest.mark.asyncio
+async def test_create_rejects_repost_of_existing_job(job_service, sa_session):
+    company, job = await create_company_with_job(sa_session)
+    repost = JobCreateSchema(
+        title="Python Developer!",
+        description=DESCRIPTION.upper(),
+        salary_from=100,
+        salary_to=200,
+        is_active=True,
+    )
+
+    with pytest.raises(JobDuplicateError) as e:
+        await job_service.create(user_id=company.id, is_company=True, job_create_dto=repost)
+    created = await job_service.create(
+        user_id=company.id, is_company=True, job_create_dto=repost, allow_duplicate=True
+    )
+
+    assert e.value.duplicate_id == job.id
+    assert created.id != job.id
+
+
+@pytest.mark.asyncio
+async def test_create_ignores_jobs_of_other_companies(job_service, sa_session):
+    _, job = await create_company_with_job(sa_session)
+    async with sa_session() as session:
+        other_company = UserFactory.build(is_company=True)
+        session.add(other_company)
+        await session.flush()
+
+    created = await job_service.create(
+        user_id=other_company.id,
+        is_company=True,
+        job_create_dto=JobCreateSchema(
+            title="Python developer",
+            description=DESCRIPTION,
+            salary_from=100,
+            salary_to=200,
+            is_active=True,
+        ),
+    )
+
+    assert created.id != job.id
+
+
+@pytest.mark.asyncio
+async def test_update_does_not_match_job_with_itself(job_service, sa_session):
+    company, job = await create_company_with_job(sa_session)
+
+    updated = await job_service.update(
+        id=job.id,
+        user_id=company.id,
+        job_update_dto=JobUpdateSchema(description=DESCRIPTION + "."),
+    )
+
+    assert updated.description == DESCRIPTION + "."
+
+
+@pytest.mark.asyncio
+async def test_patch_checks_duplicates_and_version(job_service, sa_session):
+    company, job = await create_company_with_job(sa_session)
+    other = await job_service.create(
+        user_id=company.id,
+        is_company=True,
+        job_create_dto=JobCreateSchema(
+            title="Go developer",
+            description="Бэкенд на Go",
+            salary_from=1,
+            salary_to=2,
+            is_active=True,
+        ),
+    )
+
+    with pytest.raises(JobDuplicateError):
+        await job_service.patch(
+            id=other.id,
+            user_id=company.id,
+            job_patch_dto=JobPatchSchema(title="Python developer", description=DESCRIPTION),
+        )
+
+    patched = await job_service.patch(
+        id=other.id, user_id=company.id, job_patch_dto=JobPatchSchema(salary_to=3, version=1)
+    )
+    assert (patched.title, patched.salary_to, patched.version) == ("Go developer", 3, 2)
+
+    with pytest.raises(EditConflictError):
+        await job_service.patch(
+            id=other.id, user_id=company.id, job_patch_dto=JobPatchSchema(salary_to=4, version=1)
+        )
+    with pytest.raises(JobNotFoundError):
+        await job_service.patch(
+            id=job.id, user_id=company.id + 1, job_patch_dto=JobPatchSchema(title="Go developer")
+        )
@@ -0,0 +1,167 @@
+import io
+import json
+import logging
+import os
+import time
+import timeit
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from storage.sqlalchemy.client import SqlAlchemyAsync
+from tests.conftest import settings
+from tools.logs import LogQueueHandler, log_sampled, request_id, setup_logging
+from web.middlewares import RequestLogMiddleware
+
+# бюджет на вызов логгера в обработчике запроса (мкс), переопределяется для медленных CI-машин
+LOG_CALL_BUDGET_US = float(os.environ.get("LOG_CALL_BUDGET_US", 5))
+
+logger = logging.getLogger("tests.logs")
+
+
+@pytest.fixture()
+def log_setup():
+    """Логи в очередь с выводом в StringIO; после теста — прежние настройки logging."""
+
+    srcfile, factory = logging._srcfile, logging.getLogRecordFactory()
+    stream = io.StringIO()
+    listener = setup_logging(stream=stream)
+
+    def records() -> list[dict]:
+        listener.start()
+        listener.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield listener, records
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, LogQueueHandler):
+            root.removeHandler(handler)
+    root.setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.NOTSET)
+    logging._srcfile = srcfile
+    logging.setLogRecordFactory(factory)
+
+
+def test_json_records_carry_request_id_and_extra(log_setup):
+    _, records = log_setup
+
+    token = request_id.set("abc")
+    logger.info("Вакансия %s обновлена", 1, extra={"job_id": 1})
+    request_id.reset(token)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Ошибка")
+
+    updated, error = records()
+    assert updated["message"] == "Вакансия 1 обновлена"
+    assert (updated["level"], updated["request_id"], updated["job_id"]) == ("INFO", "abc", 1)
+    assert "request_id" not in error
+    assert error["exc_info"].endswith("ValueError: boom")
+
+
+def test_sampled_out_request_keeps_warnings(log_setup):
+    _, records = log_setup
+
+    token = log_sampled.set(False)
+    logger.info("не попадёт в лог")
+    logger.warning("попадёт в лог")
+    log_sampled.reset(token)
+
+    assert [record["message"] for record in records()] == ["попадёт в лог"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_sets_request_id_and_samples(log_setup):
+    _, records = log_setup
+    app = FastAPI()
+
+    @app.get("/jobs")
+    async def jobs() -> list:
+        logger.info("лента")
+        return []
+
+    @app.get("/jobs/{id}")
+    async def job(id: int) -> dict:
+        logger.info("вакансия")
+        return {}
+
+    @app.get("/boom")
+    async def boom() -> None:
+        raise ValueError("boom")
+
+    app.add_middleware(RequestLogMiddleware, sample_rates={"GET /jobs": 0})
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        feed = await client.get("/jobs")
+        own = await client.get("/jobs/1", headers={"X-Request-ID": "lb-42"})
+        forged = await client.get("/jobs/1", headers={"X-Request-ID": 'x"\n{"level": "ERROR"}'})
+        with pytest.raises(ValueError):
+            await client.get("/boom")
+
+    assert len(feed.headers["X-Request-ID"]) == 32
+    assert own.headers["X-Request-ID"] == "lb-42"
+    assert forged.headers["X-Request-ID"] != 'x"\n{"level": "ERROR"}'
+    written = [record for record in records() if record["logger"] in ("tests.logs", "access")]
+    # лента вне выборки: ни записи обработчика, ни строки журнала доступа
+    assert [(record["message"], record.get("request_id")) for record in written[:4]] == [
+        ("вакансия", "lb-42"),
+        ("GET /jobs/1 200", "lb-42"),
+        ("вакансия", forged.headers["X-Request-ID"]),
+        ("GET /jobs/1 200", forged.headers["X-Request-ID"]),
+    ]
+    access, failed = written[1], written[4]
+    assert (access["method"], access["path"], access["status"]) == ("GET", "/jobs/1", 200)
+    assert access["duration_ms"] >= 0
+    assert (failed["level"], failed["message"], failed["status"]) == ("ERROR", "GET /boom 500", 500)
+    assert failed["exc_info"].endswith("ValueError: boom")
+    assert len(written) == 5
+
+
+@pytest.mark.asyncio
+async def test_sql_logs_carry_request_id(log_setup):
+    listener, records = log_setup
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    db = SqlAlchemyAsync(settings)
+    token = request_id.set("sql")
+    try:
+        async with db.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        request_id.reset(token)
+        await db.engine.dispose()
+
+    statements = [record for record in records() if record["message"] == "SELECT 1"]
+    assert statements and statements[0]["request_id"] == "sql"
+
+
+def test_log_call_fits_budget(log_setup):
+    # слушатель не запущен: замеряется только вызов в потоке обработчика, без
+    # обработчиков pytest, которые форматируют запись в том же потоке
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    root.handlers = [handler for handler in handlers if isinstance(handler, LogQueueHandler)]
+    token = request_id.set("0f3c9a4e2b7d4c1e8a6b5d3f2e1c0b9a")
+    try:
+        plain, access = (
+            min(timeit.repeat(call, number=1000, repeat=50))
+            for call in (
+                lambda: logger.info("Вакансия %s обновлена", 42),
+                # строка журнала доступа, которую middleware пишет на каждый запрос
+                lambda: RequestLogMiddleware._log_access(
+                    logging.INFO, "GET", "/jobs", 200, time.perf_counter()
+                ),
+            )
+        )
+    finally:
+        request_id.reset(token)
+        root.handlers = handlers
+
+    # минимум по коротким повторам: замер без помех от соседних процессов
+    assert plain / 1000 * 1e6 < LOG_CALL_BUDGET_US
+    assert access / 1000 * 1e6 < LOG_CALL_BUDGET_US
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from repositories.exceptions import (
+    CheckViolationError,
+    EntityNotFoundError,
+    UniqueError,
+    VersionConflictError,
+)
+from repositories.memory import (
+    InMemoryJobRepository,
+    InMemoryResponseRepository,
+    InMemoryStatsRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from services import JobService, PurgeService, ResponseService
+from services.exception import ResponseAlreadyExistsError, ResponseCreationError
+from web.schemas import (
+    JobCreateSchema,
+    JobFeedItemSchema,
+    JobPatchSchema,
+    ResponseCreateSchema,
+    UserCreateSchema,
+    UserUpdateSchema,
+)
+
+
+@pytest.fixture()
+def store():
+    return InMemoryStore()
+
+
+@pytest.fixture()
+def repositories(store):
+    return (
+        InMemoryUserRepository(store),
+        InMemoryJobRepository(store),
+        InMemoryResponseRepository(store),
+    )
+
+
+def user_create_dto(email: str, is_company: bool = False) -> UserCreateSchema:
+    return UserCreateSchema(
+        name="Пользователь",
+        email=email,
+        password="password",
+        password2="password",
+        is_company=is_company,
+    )
+
+
+def job_create_dto(title: str = "Python разработчик", is_active: bool = True) -> JobCreateSchema:
+    return JobCreateSchema(
+        title=title, description="Пишем бэкенд", salary_from=100, salary_to=200, is_active=is_active
+    )
+
+
+@pytest.mark.asyncio
+async def test_unique_email_and_foreign_keys(repositories):
+    user_repository, job_repository, response_repository = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    applicant = await user_repository.create(user_create_dto("applicant@example.com"), "hash")
+
+    with pytest.raises(UniqueError):
+        await user_repository.create(user_create_dto("company@example.com"), "hash")
+    with pytest.raises(UniqueError):
+        await user_repository.update(
+            applicant.id, UserUpdateSchema(name="Соискатель", email="company@example.com")
+        )
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.create(user_id=100, job_create_dto=job_create_dto())
+
+    job = await job_repository.create(company.id, job_create_dto())
+    response_create_dto = ResponseCreateSchema(message="Готов работать")
+    await response_repository.create(applicant.id, job.id, response_create_dto)
+
+    with pytest.raises(UniqueError):
+        await response_repository.create(applicant.id, job.id, response_create_dto)
+    with pytest.raises(EntityNotFoundError):
+        await response_repository.create(applicant.id, 100, response_create_dto)
+
+    assert (await user_repository.retrieve(email="applicant@example.com")).id == applicant.id
+
+
+@pytest.mark.asyncio
+async def test_feed_order_and_pagination(repositories):
+    user_repository, job_repository, _ = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    jobs = [
+        await job_repository.create(company.id, job_create_dto(str(i), is_active=i % 3 != 0))
+        for i in range(10)
+    ]
+
+    newest_first = [job.id for job in reversed(jobs)]
+    assert [job.id for job in await job_repository.retrieve_many(limit=4, skip=2)] == (
+        newest_first[2:6]
+    )
+    active = await job_repository.retrieve_many(limit=100, is_active=True)
+    assert [job.id for job in active] == [id for id in newest_first if jobs[id - 1].is_active]
+    inactive = await job_repository.retrieve_many(limit=2, skip=1, is_active=False)
+    assert [job.title for job in inactive] == ["6", "3"]
+
+    # обновление перестраивает индексы: вакансия переходит из ленты активных в неактивные
+    await job_repository.update(jobs[-1].id, job_create_dto("9", is_active=False))
+    assert jobs[-1].id not in [job.id for job in await job_repository.retrieve_many(is_active=True)]
+    inactive = await job_repository.retrieve_many(limit=2, is_active=False)
+    assert [job.title for job in inactive] == ["9", "6"]
+    await job_repository.delete(jobs[-1].id, company.id)
+    inactive = await job_repository.retrieve_many(limit=2, is_active=False)
+    assert [job.title for job in inactive] == ["6", "3"]
+    changes = [job.id async for job in job_repository.iter_updated_since()]
+    assert changes[-1] == jobs[-1].id
+
+
+@pytest.mark.asyncio
+async def test_soft_delete_and_cascade_purge(store, repositories):
+    user_repository, job_repository, response_repository = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    applicant = await user_repository.create(user_create_dto("applicant@example.com"), "hash")
+    job = await job_repository.create(company.id, job_create_dto())
+    response = await response_repository.create(
+        applicant.id, job.id, ResponseCreateSchema(message="Готов работать")
+    )
+
+    await user_repository.delete(company.id)
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.retrieve(id=job.id)
+    with pytest.raises(EntityNotFoundError):
+        await response_repository.retrieve(id=response.id)
+    # email удалённого пользователя снова свободен
+    await user_repository.create(user_create_dto("company@example.com", True), "hash")
+
+    purged = await PurgeService(user_repository, job_repository, response_repository).purge(
+        retention=timedelta(0), pause=0
+    )
+
+    assert purged == 3
+    assert company.id not in store.users
+    assert not store.jobs and not store.responses and not store.response_pairs
+    assert not store.deleted_users and not store.deleted_jobs
+
+
+@pytest.mark.asyncio
+async def test_periodic_purge_logs_database_errors_only(repositories, caplog):
+    user_repository, job_repository, response_repository = repositories
+    errors = [OperationalError("DELETE", {}, Exception("connection lost")), ValueError("bug")]
+
+    async def purge_deleted(before: datetime, batch_size: int = 1000) -> int:
+        raise errors.pop(0)
+
+    response_repository.purge_deleted = purge_deleted
+    service = PurgeService(user_repository, job_repository, response_repository)
+
+    # сбой БД записывается в лог и не останавливает цикл, дефект кода завершает задачу
+    with pytest.raises(ValueError):
+        await service.purge_periodically(interval_seconds=0, retention=timedelta(0))
+
+    assert not errors
+    [record] = [record for record in caplog.records if record.name == "services.purge"]
+    assert isinstance(record.exc_info[1], OperationalError)
+
+
+@pytest.mark.asyncio
+async def test_services_without_database(store, repositories):
+    user_repository, job_repository, response_repository = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    applicant = await user_repository.create(user_create_dto("applicant@example.com"), "hash")
+    job_service = JobService(job_repository, user_repository)
+    response_service = ResponseService(response_repository)
+
+    job = await job_service.create(
+        user_id=company.id, is_company=True, job_create_dto=job_create_dto()
+    )
+    response_create_dto = ResponseCreateSchema(message="Готов работать")
+    await response_service.create(applicant.id, job.id, False, response_create_dto)
+
+    with pytest.raises(ResponseAlreadyExistsError):
+        await response_service.create(applicant.id, job.id, False, response_create_dto)
+    with pytest.raises(ResponseCreationError):
+        await response_service.create(applicant.id, 100, False, response_create_dto)
+
+    stats = await InMemoryStatsRepository(store).retrieve()
+    assert (stats.users_total, stats.companies_total, stats.jobs_total) == (2, 1, 1)
+    assert stats.responses_total == 1
+    assert stats.salary_from.p50 == 100
+    assert stats.responses_per_day == {datetime.now(timezone.utc).date(): 1}
+
+
+@pytest.mark.asyncio
+async def test_profile(repositories):
+    user_repository, job_repository, response_repository = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    applicant = await user_repository.create(user_create_dto("applicant@example.com"), "hash")
+    jobs = [await job_repository.create(company.id, job_create_dto(str(i))) for i in range(3)]
+    for job in jobs[1:]:
+        await response_repository.create(applicant.id, job.id, ResponseCreateSchema())
+
+    profile = await user_repository.retrieve_profile(company.id, limit=2)
+    applicant_profile = await user_repository.retrieve_profile(applicant.id, limit=1)
+
+    assert [(job.id, job.responses_total) for job in profile.jobs] == [(3, 1), (2, 1)]
+    assert (profile.jobs_total, profile.active_jobs_total, profile.responses_total) == (3, 3, 2)
+    assert [response.job_id for response in applicant_profile.responses] == [jobs[2].id]
+    assert applicant_profile.responses_total == 2
+
+
+@pytest.mark.asyncio
+async def test_upsert_many(store, repositories):
+    user_repository, job_repository, _ = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+
+    def feed(*titles: str) -> list[JobFeedItemSchema]:
+        return [
+            JobFeedItemSchema(
+                external_id=str(i), title=title, description="", salary_from=1, salary_to=2
+            )
+            for i, title in enumerate(titles)
+        ]
+
+    assert await job_repository.upsert_many(company.id, feed("Python", "Go")) == (2, 0)
+    assert await job_repository.upsert_many(company.id, feed("Python", "Rust", "C")) == (1, 1)
+    await job_repository.delete(store.external_jobs[company.id, "0"], company.id)
+    assert await job_repository.upsert_many(company.id, feed("Python")) == (0, 1)
+
+    jobs = await job_repository.retrieve_many()
+    assert [(job.external_id, job.title) for job in jobs] == [
+        ("2", "C"),
+        ("1", "Rust"),
+        ("0", "Python"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_patch(repositories):
+    user_repository, job_repository, response_repository = repositories
+    company = await user_repository.create(user_create_dto("company@example.com", True), "hash")
+    user = await user_repository.create(user_create_dto("user@example.com"), "hash")
+    job = await job_repository.create(company.id, job_create_dto())
+    response = await response_repository.create(
+        user.id, job.id, ResponseCreateSchema(message="Готов работать")
+    )
+
+    patch = JobPatchSchema(is_active=False, version=1)
+    patched = await job_repository.patch(job.id, company.id, patch.changes(), patch.version)
+    assert (patched.title, patched.is_active, patched.version) == (job.title, False, 2)
+    assert [job.id for job in await job_repository.retrieve_many(is_active=False)] == [job.id]
+    with pytest.raises(VersionConflictError):
+        await job_repository.patch(job.id, company.id, {"title": "Go"}, version=1)
+    with pytest.raises(EntityNotFoundError):
+        await job_repository.patch(job.id, user.id, {"title": "Go"})
+    with pytest.raises(CheckViolationError):
+        await job_repository.patch(job.id, company.id, {"salary_from": job.salary_to + 1})
+
+    with pytest.raises(UniqueError):
+        await user_repository.patch(user.id, {"email": company.email})
+    assert (await user_repository.patch(user.id, {"name": "Иван"}, version=1)).version == 2
+
+    patched = await response_repository.patch(response.id, user.id, {"message": None})
+    assert (patched.message, patched.version) == (None, 2)
@@ -0,0 +1,30 @@
+from tools.minhash import LshIndex, MinHasher
+
+ORIGINAL = "Python разработчик. Сервисы на FastAPI и PostgreSQL, опыт от 3 лет, удалённая работа"
+REPOST = "PYTHON-РАЗРАБОТЧИК! Сервисы на FastAPI и PostgreSQL, опыт от 3 лет, удаленная работа"
+OTHER = "Главный бухгалтер на производство, 1С, налоговая отчётность, полный день"
+
+
+def test_signatures_are_deterministic():
+    assert (MinHasher().signature(ORIGINAL) == MinHasher().signature(ORIGINAL)).all()
+
+
+def test_query_finds_near_duplicates_only():
+    index = LshIndex(threshold=0.8)
+    hasher = index.hasher
+    index.insert(1, hasher.signature(ORIGINAL))
+    index.insert(2, hasher.signature(OTHER))
+
+    assert [id for id, _ in index.query(hasher.signature(REPOST))] == [1]
+    assert index.query(hasher.signature(REPOST), exclude=[1]) == []
+
+
+def test_remove_drops_signature_from_buckets():
+    index = LshIndex()
+    index.insert(1, index.hasher.signature(ORIGINAL))
+
+    index.remove(1)
+    index.remove(1)
+
+    assert len(index) == 0
+    assert index.query(index.hasher.signature(ORIGINAL)) == []
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import socket
+
+import pytest
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.pool import NullPool
+
+from config import DBSettings
+from config.common import env_file_path
+from storage.sqlalchemy.client import SqlAlchemyAsync
+
+settings = DBSettings(_env_file=env_file_path)
+
+# PgBouncer в режиме transaction из docker-compose (сервис pgbouncer-test)
+PGBOUNCER_HOST = os.environ.get("PGBOUNCER_HOST", "localhost")
+PGBOUNCER_PORT = int(os.environ.get("PGBOUNCER_PORT", 6433))
+# PGBOUNCER_REQUIRED=true: без PgBouncer тесты падают, а не пропускаются
+PGBOUNCER_REQUIRED = os.environ.get("PGBOUNCER_REQUIRED", "").lower() == "true"
+
+
+def pgbouncer_available() -> bool:
+    try:
+        with socket.create_connection((PGBOUNCER_HOST, PGBOUNCER_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+requires_pgbouncer = pytest.mark.skipif(
+    not PGBOUNCER_REQUIRED and not pgbouncer_available(),
+    reason="PgBouncer не запущен (docker-compose up pgbouncer-test)",
+)
+
+
+def pgbouncer_settings(**kwargs) -> DBSettings:
+    return DBSettings(
+        postgres_user=settings.postgres_user,
+        postgres_password=settings.postgres_password,
+        postgres_host=PGBOUNCER_HOST,
+        postgres_port=PGBOUNCER_PORT,
+        db_name=settings.db_name,
+        **kwargs,
+    )
+
+
+def test_pgbouncer_mode_uses_null_pool():
+    engine = SqlAlchemyAsync(pgbouncer_settings(pgbouncer=True))._build_engine()
+    assert isinstance(engine.pool, NullPool)
+
+    engine = SqlAlchemyAsync(pgbouncer_settings())._build_engine()
+    assert not isinstance(engine.pool, NullPool)
+
+
+@requires_pgbouncer
+@pytest.mark.asyncio
+async def test_prepared_statements_survive_transaction_pooling():
+    db = SqlAlchemyAsync(pgbouncer_settings(pgbouncer=True))
+    query = select(text("pg_backend_pid()")).where(bindparam("value") > 0)
+
+    async def worker(value: int) -> set[int]:
+        backends = set()
+        # каждая транзакция может попасть в своё серверное соединение PgBouncer
+        for _ in range(20):
+            async with db.get_db() as session:
+                backends.add((await session.execute(query, {"value": value})).scalar_one())
+        return backends
+
+    try:
+        results = await asyncio.gather(*(worker(value) for value in range(1, 21)))
+    finally:
+        await db.Session.kw["bind"].dispose()
+
+    # клиентов больше, чем серверных соединений: соединения действительно переиспользовались
+    assert len(set().union(*results)) < len(results)
@@ -0,0 +1,105 @@
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from tools.profiler import PROFILE_CLAIM, SamplingProfiler
+from tools.security import create_access_token
+from web.middlewares import ProfileMiddleware
+from web.routers import debug_router
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def frame_names(profile: dict) -> set[str]:
+    return {frame["name"] for frame in profile["shared"]["frames"]}
+
+
+def test_sampling_profiler_formats():
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy(0.05)
+
+    profile = profiler.speedscope("test")
+    assert profiler.samples > 0
+    assert {"busy", "test_sampling_profiler_formats"} <= frame_names(profile)
+    sampled = profile["profiles"][0]
+    assert len(sampled["samples"]) == len(sampled["weights"])
+    assert sampled["endValue"] == pytest.approx(profiler.duration, rel=0.5)
+    assert any(";busy (" in line for line in profiler.collapsed().splitlines())
+
+
+def test_anchor_keeps_only_frames_above_it():
+    def anchored():
+        with SamplingProfiler(interval=0.001, anchor=sys._getframe()) as profiler:
+            busy(0.05)
+        return profiler
+
+    profiler = anchored()
+    stacks = list(profiler.stacks)
+    assert stacks and all(stack[0][0] == "anchored" for stack in stacks)
+
+    # кадр завершённой функции не бывает в стеке потока: ни одной выборки
+    def finished():
+        return sys._getframe()
+
+    with SamplingProfiler(interval=0.001, anchor=finished()) as profiler:
+        busy(0.02)
+    assert profiler.samples == 0
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/jobs")
+    async def jobs() -> list:
+        busy(0.05)
+        return []
+
+    app.add_middleware(ProfileMiddleware)
+    app.include_router(debug_router)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_request_profile_requires_claim():
+    transport = ASGITransport(app=create_app())
+    user = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': '1', PROFILE_CLAIM: True})}"}
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ignored = await client.get("/jobs?profile=1", headers=user)
+        plain = await client.get("/jobs", headers=admin)
+        profiled = await client.get("/jobs?profile=1", headers=admin)
+
+    assert ignored.json() == plain.json() == []
+    assert profiled.headers["X-Profile-Status"] == "200"
+    profile = profiled.json()
+    assert "jobs" in frame_names(profile)
+    # стеки начинаются с кадра middleware, а не с цикла событий
+    roots = {sample[0] for sample in profile["profiles"][0]["samples"]}
+    assert [profile["shared"]["frames"][root]["name"] for root in roots] == ["__call__"]
+    assert "_run_once" not in frame_names(profile)
+
+
+@pytest.mark.asyncio
+async def test_worker_profile_endpoint():
+    transport = ASGITransport(app=create_app())
+    user = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': '1', PROFILE_CLAIM: True})}"}
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        forbidden = await client.get("/debug/profile?seconds=0.05", headers=user)
+        profile = await client.get("/debug/profile?seconds=0.05&interval=0.001", headers=admin)
+        collapsed = await client.get("/debug/profile?seconds=0.05&format=collapsed", headers=admin)
+
+    assert forbidden.status_code == 403
+    assert profile.json()["profiles"][0]["type"] == "sampled"
+    # поток цикла событий ждёт в селекторе, пока идёт запись профиля
+    assert "select" in frame_names(profile.json())
+    assert collapsed.headers["content-type"].startswith("text/plain")
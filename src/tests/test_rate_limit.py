@@ -0,0 +1,106 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select, update
+
+from dependencies.rate_limit import ConcurrencyLimit
+from storage.rate_limit import InMemoryRateLimitBackend
+from storage.sqlalchemy.rate_limit import SqlAlchemyRateLimitBackend
+from storage.sqlalchemy.tables import RateLimitBucket
+from tools.security import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_exhausts_bucket():
+    backend = InMemoryRateLimitBackend()
+
+    for _ in range(3):
+        assert await backend.acquire("key", rate=1, capacity=3) == 0
+
+    retry_after = await backend.acquire("key", rate=1, capacity=3)
+    assert 0 < retry_after <= 1
+    assert await backend.acquire("other_key", rate=1, capacity=3) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recent_keys():
+    backend = InMemoryRateLimitBackend(max_keys=4)
+
+    for key in range(10):
+        await backend.acquire(str(key), rate=1, capacity=1)
+
+    assert len(backend._buckets) <= 4
+    assert "9" in backend._buckets
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_backend_exhausts_bucket(sa_session):
+    backend = SqlAlchemyRateLimitBackend(session=sa_session)
+
+    for _ in range(2):
+        assert await backend.acquire("key", rate=0.5, capacity=2) == 0
+
+    retry_after = await backend.acquire("key", rate=0.5, capacity=2)
+    assert 0 < retry_after <= 2
+    assert await backend.acquire("other_key", rate=0.5, capacity=2) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_purges_idle_buckets():
+    backend = InMemoryRateLimitBackend()
+
+    await backend.acquire("idle", rate=1, capacity=1)
+    await asyncio.sleep(0.05)
+    await backend.acquire("active", rate=1, capacity=1)
+
+    assert await backend.purge_idle(idle_seconds=0.02) == 1
+    assert list(backend._buckets) == ["active"]
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_backend_purges_idle_buckets(sa_session):
+    backend = SqlAlchemyRateLimitBackend(session=sa_session)
+    await backend.acquire("idle", rate=1, capacity=1)
+    async with sa_session() as session:
+        await session.execute(
+            update(RateLimitBucket)
+            .filter(RateLimitBucket.key == "idle")
+            .values(updated_at=func.now() - timedelta(hours=2))
+        )
+    await backend.acquire("active", rate=1, capacity=1)
+
+    assert await backend.purge_idle(idle_seconds=3600) == 1
+    async with sa_session() as session:
+        keys = (await session.execute(select(RateLimitBucket.key))).scalars().all()
+    assert keys == ["active"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_user():
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/ranked", dependencies=[Depends(ConcurrencyLimit(limit=1))])
+    async def ranked() -> dict:
+        await release.wait()
+        return {}
+
+    def auth(user_id: int) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/ranked", headers=auth(1)))
+        await asyncio.sleep(0.05)
+        limited = await client.get("/ranked", headers=auth(1))
+        release.set()
+        other = await client.get("/ranked", headers=auth(2))
+        assert (await first).status_code == 200
+        after = await client.get("/ranked", headers=auth(1))
+
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert other.status_code == after.status_code == 200
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models import Job
+from services import JobTextIndex, RecommendationService
+from services.job_sync import JobIndexSyncMixin
+from tools.fixtures.jobs import JobFactory
+from tools.fixtures.responses import ResponseFactory
+from tools.fixtures.users import UserFactory
+
+
+@pytest.mark.asyncio
+async def test_recommend_by_response_history(job_repository, response_repository, sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        applicant = UserFactory.build(is_company=False)
+        python_job = JobFactory.build(
+            user_id=company.id, title="Python developer", description="FastAPI", is_active=True
+        )
+        similar_job = JobFactory.build(
+            user_id=company.id, title="Python engineer", description="FastAPI", is_active=True
+        )
+        closed_job = JobFactory.build(
+            user_id=company.id, title="Python lead", description="FastAPI", is_active=False
+        )
+        other_job = JobFactory.build(
+            user_id=company.id, title="Accountant", description="Reports", is_active=True
+        )
+        session.add_all([company, applicant])
+        await session.flush()
+        session.add_all([python_job, similar_job, closed_job, other_job])
+        await session.flush()
+        session.add(ResponseFactory.build(user_id=applicant.id, job_id=python_job.id))
+        await session.flush()
+
+    job_index = JobTextIndex()
+    service = RecommendationService(
+        job_repository=job_repository,
+        response_repository=response_repository,
+        job_index=job_index,
+    )
+    # пока индекс не построен, рекомендации не ждут его: свежие активные вакансии
+    assert [job.id for job in await service.recommend(user_id=applicant.id, limit=5)] == [
+        other_job.id,
+        similar_job.id,
+        python_job.id,
+    ]
+
+    await job_index.sync(job_repository)
+    recommended = await service.recommend(user_id=applicant.id, limit=5)
+
+    assert [job.id for job in recommended] == [similar_job.id]
+
+
+@pytest.mark.asyncio
+async def test_recommend_without_history_returns_latest_active_jobs(
+    job_repository, response_repository, sa_session
+):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        active_job = JobFactory.build(user_id=company.id, is_active=True)
+        inactive_job = JobFactory.build(user_id=company.id, is_active=False)
+        session.add(company)
+        await session.flush()
+        session.add_all([active_job, inactive_job])
+        await session.flush()
+
+    service = RecommendationService(
+        job_repository=job_repository,
+        response_repository=response_repository,
+        job_index=JobTextIndex(),
+    )
+    recommended = await service.recommend(user_id=company.id, limit=5)
+
+    assert [job.id for job in recommended] == [active_job.id]
+
+
+@pytest.mark.asyncio
+async def test_job_index_compacts_in_background():
+    job_index = JobTextIndex(min_compact_size=2)
+    jobs = [
+        Job(id, 1, title, "FastAPI", salary_from=1, salary_to=2, is_active=True)
+        for id, title in enumerate(["Python developer", "Python engineer", "Accountant"], 1)
+    ]
+
+    await job_index.upsert_jobs(jobs)
+    # упаковка запущена задачей, поиск до её конца идёт по неупакованным документам
+    assert job_index._compaction is not None
+    assert [id for id, _ in job_index.search(job_index.profile([1]), k=1, exclude=[1])] == [2]
+
+    await job_index._compaction
+    assert not job_index.needs_compaction()
+    assert [id for id, _ in job_index.search(job_index.profile([1]), k=1, exclude=[1])] == [2]
+
+
+class RecordingIndex(JobIndexSyncMixin):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.upserted: list[int] = []
+
+    def upsert_job(self, job: Job) -> None:
+        self.upserted.append(job.id)
+
+
+class ChangeFeed:
+    def __init__(self) -> None:
+        self.jobs: list[Job] = []
+
+    async def iter_updated_since(self, since=None, batch_size=1000):
+        for job in sorted(self.jobs, key=lambda job: job.updated_at):
+            if since is None or job.updated_at >= since:
+                yield job
+
+
+def test_job_index_sync_requires_upsert_job():
+    with pytest.raises(TypeError):
+        JobIndexSyncMixin()
+
+
+@pytest.mark.asyncio
+async def test_job_index_sync_picks_up_late_commits():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def job(id: int, seconds: int) -> Job:
+        updated_at = start + timedelta(seconds=seconds)
+        return Job(id, 1, "Python", "FastAPI", 1, 2, True, updated_at=updated_at)
+
+    feed = ChangeFeed()
+    index = RecordingIndex(refresh_seconds=0, lag_seconds=60)
+    feed.jobs = [job(1, 0), job(2, 10)]
+    await index.sync(feed)
+    assert index.upserted == [1, 2]
+    assert index.synced_until == start + timedelta(seconds=10)
+
+    # транзакция началась раньше уже прочитанной строки, а зафиксировалась позже
+    feed.jobs.append(job(3, 5))
+    await index.sync(feed)
+    assert index.upserted == [1, 2, 3]
+    assert index.synced_until == start + timedelta(seconds=10)
+
+    # строки из окна перечитывания, не изменившиеся с прошлого раза, не вносятся повторно
+    feed.jobs[0] = job(1, 20)
+    await index.sync(feed)
+    assert index.upserted == [1, 2, 3, 1]
+    assert index.synced_until == start + timedelta(seconds=20)
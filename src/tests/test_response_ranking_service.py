@@ -0,0 +1,102 @@
+import pytest
+
+from services import ResponseRankingService, ResponseScoreCache
+from services.exception import JobNotFoundError
+from tools.fixtures.jobs import JobFactory
+from tools.fixtures.responses import ResponseFactory
+from tools.fixtures.users import UserFactory
+from web.schemas.job import JobUpdateSchema
+
+
+async def create_job_with_responses(sa_session, messages):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        applicants = UserFactory.build_batch(len(messages) + 1, is_company=False)
+        session.add_all([company, *applicants])
+        await session.flush()
+        job = JobFactory.build(
+            user_id=company.id,
+            title="Python developer",
+            description="Разработка сервисов на FastAPI и PostgreSQL",
+        )
+        session.add(job)
+        await session.flush()
+        responses = [
+            ResponseFactory.build(user_id=applicant.id, job_id=job.id, message=message)
+            for applicant, message in zip(applicants, messages)
+        ]
+        session.add_all(responses)
+        await session.flush()
+
+    return company, job, responses, applicants[-1]
+
+
+@pytest.mark.asyncio
+async def test_rank_orders_responses_by_similarity(job_repository, response_repository, sa_session):
+    company, job, responses, _ = await create_job_with_responses(
+        sa_session,
+        ["Работал бухгалтером", "Пишу сервисы на FastAPI, знаю PostgreSQL", None],
+    )
+    service = ResponseRankingService(job_repository, response_repository, ResponseScoreCache())
+
+    ranked = await service.rank(job_id=job.id, user_id=company.id, limit=2, skip=0)
+    next_page = await service.rank(job_id=job.id, user_id=company.id, limit=2, skip=2)
+
+    assert [response.id for response, _ in ranked] == [responses[1].id, responses[0].id]
+    assert [response.id for response, _ in next_page] == [responses[2].id]
+    assert next_page[0][1] == 0
+
+
+@pytest.mark.asyncio
+async def test_rank_scores_only_new_responses(job_repository, response_repository, sa_session):
+    company, job, responses, applicant = await create_job_with_responses(
+        sa_session, ["Работал бухгалтером"]
+    )
+    cache = ResponseScoreCache()
+    service = ResponseRankingService(job_repository, response_repository, cache)
+    await service.rank(job_id=job.id, user_id=company.id, limit=10, skip=0)
+    entry = cache.get(await job_repository.retrieve(id=job.id))
+
+    async with sa_session() as session:
+        new_response = ResponseFactory.build(
+            user_id=applicant.id, job_id=job.id, message="Разработка на FastAPI"
+        )
+        session.add(new_response)
+        await session.flush()
+    ranked = await service.rank(job_id=job.id, user_id=company.id, limit=10, skip=0)
+
+    assert cache.get(await job_repository.retrieve(id=job.id)) is entry
+    assert entry.last_response_id == new_response.id
+    assert [response.id for response, _ in ranked] == [new_response.id, responses[0].id]
+
+
+@pytest.mark.asyncio
+async def test_rank_rebuilds_scores_after_job_update(
+    job_repository, response_repository, sa_session
+):
+    company, job, responses, _ = await create_job_with_responses(
+        sa_session, ["Пишу на FastAPI", "Веду учёт в 1С"]
+    )
+    service = ResponseRankingService(job_repository, response_repository, ResponseScoreCache())
+    await service.rank(job_id=job.id, user_id=company.id, limit=10, skip=0)
+
+    await job_repository.update(
+        id=job.id,
+        job_update_dto=JobUpdateSchema(
+            title="Бухгалтер", description="Учёт в 1С", salary_from=1, salary_to=2, is_active=True
+        ),
+    )
+    ranked = await service.rank(job_id=job.id, user_id=company.id, limit=10, skip=0)
+
+    assert [response.id for response, _ in ranked] == [responses[1].id, responses[0].id]
+
+
+@pytest.mark.asyncio
+async def test_rank_checks_job_owner(job_repository, response_repository, sa_session):
+    _, job, _, applicant = await create_job_with_responses(sa_session, [])
+    service = ResponseRankingService(job_repository, response_repository, ResponseScoreCache())
+
+    with pytest.raises(PermissionError):
+        await service.rank(job_id=job.id, user_id=applicant.id, limit=10, skip=0)
+    with pytest.raises(JobNotFoundError):
+        await service.rank(job_id=-1, user_id=applicant.id, limit=10, skip=0)
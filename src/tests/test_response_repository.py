@@ -1,6 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
+from repositories.exceptions import EntityNotFoundError, VersionConflictError
 from repositories.response_repository import ResponseRepository
 from web.schemas.response import ResponseCreateSchema, ResponseUpdateSchema
 
@@ -90,9 +91,38 @@ async def test_update(response_repository, test_response):
     assert updated_response.message == new_message
 
 
+@pytest.mark.asyncio
+async def test_patch_resets_message(response_repository, test_response):
+    patched = await response_repository.patch(
+        id=test_response.id, user_id=test_response.user_id, values={"message": None}, version=1
+    )
+
+    assert (patched.message, patched.version) == (None, 2)
+    with pytest.raises(VersionConflictError):
+        await response_repository.patch(
+            id=test_response.id, user_id=test_response.user_id, values={"message": ""}, version=1
+        )
+    with pytest.raises(EntityNotFoundError):
+        await response_repository.patch(
+            id=test_response.id, user_id=test_response.user_id + 1, values={"message": ""}
+        )
+
+
 @pytest.mark.asyncio
 async def test_delete(response_repository, test_response):
     await response_repository.delete(id=test_response.id, user_id=test_response.user_id)
     res = await response_repository.retrieve_many()
 
     assert not res
+
+
+@pytest.mark.asyncio
+async def test_iter_by_job_after_id(response_repository, test_response):
+    all_responses = [response async for response in response_repository.iter_by_job(job_id=1)]
+    new_responses = [
+        response
+        async for response in response_repository.iter_by_job(job_id=1, after_id=test_response.id)
+    ]
+
+    assert [response.id for response in all_responses] == [test_response.id]
+    assert new_responses == []
@@ -0,0 +1,90 @@
+import pytest
+import pytest_asyncio
+from fastapi.responses import JSONResponse, ORJSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from web.schemas import JobCreateSchema, UserCreateSchema
+
+GZIP_MINIMUM_SIZE = 2048
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def make_client(memory_app):
+    """Клиент приложения со страницей вакансий больше порога сжатия."""
+
+    clients = []
+
+    async def make(**env) -> tuple[AsyncClient, object]:
+        app = memory_app(GZIP_MINIMUM_SIZE=str(GZIP_MINIMUM_SIZE), **env)
+        repositories = app.container.repositories_container
+        company = await repositories.user_repository().create(
+            UserCreateSchema(
+                name="Компания",
+                email="hr@example.com",
+                password="password",
+                password2="password",
+                is_company=True,
+            ),
+            hashed_password="hash",
+        )
+        for number in range(20):
+            await repositories.job_repository().create(
+                user_id=company.id,
+                job_create_dto=JobCreateSchema(
+                    title=f"Вакансия {number}",
+                    description="Разработка сервисов на FastAPI и PostgreSQL. " * 10,
+                    salary_from=100_000,
+                    salary_to=200_000,
+                    is_active=True,
+                ),
+            )
+
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        clients.append(client)
+        return client, app
+
+    yield make
+
+    for client in clients:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, response_class", [("json", JSONResponse), ("orjson", ORJSONResponse)]
+)
+async def test_response_class_setting(make_client, name, response_class):
+    client, app = await make_client(RESPONSE_CLASS=name)
+
+    response = await client.get("/jobs", params={"limit": 2})
+
+    assert app.router.default_response_class is response_class
+    assert response.status_code == 200
+    assert [job["title"] for job in response.json()] == ["Вакансия 19", "Вакансия 18"]
+    assert response.content == response_class(content=None).render(response.json())
+
+
+@pytest.mark.asyncio
+async def test_gzip_above_minimum_size(make_client):
+    client, _ = await make_client()
+
+    page = await client.get("/jobs", headers={"Accept-Encoding": "gzip"})
+    job = await client.get("/jobs/1", headers={"Accept-Encoding": "gzip"})
+    plain = await client.get("/jobs", headers={"Accept-Encoding": "identity"})
+
+    assert len(plain.content) > GZIP_MINIMUM_SIZE > len(job.content)
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert int(page.headers["Content-Length"]) < len(plain.content) // 2
+    assert page.content == plain.content
+    assert "Content-Encoding" not in job.headers
+    assert "Content-Encoding" not in plain.headers
+
+
+@pytest.mark.asyncio
+async def test_gzip_disabled(make_client):
+    client, _ = await make_client(GZIP_ENABLED="false")
+
+    page = await client.get("/jobs", headers={"Accept-Encoding": "gzip"})
+
+    assert len(page.content) > GZIP_MINIMUM_SIZE
+    assert "Content-Encoding" not in page.headers
@@ -0,0 +1,66 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+
+import pytest
+
+from tools.fixtures.seed import COLUMNS, SeedPlan, build_rows
+
+PLAN = SeedPlan(
+    users=50,
+    jobs=40,
+    responses=200,
+    first_user_id=101,
+    first_job_id=11,
+    seed=7,
+    chunk_size=15,
+    now=datetime(2026, 1, 1, tzinfo=timezone.utc),
+)
+
+
+def all_rows(plan: SeedPlan, table: str) -> list[dict]:
+    return [
+        dict(zip(COLUMNS[table], row))
+        for chunk in range(plan.chunks(table))
+        for row in build_rows(plan, table, chunk)
+    ]
+
+
+def test_rows_are_deterministic_per_chunk():
+    jobs = build_rows(PLAN, "jobs", 1)
+    responses = build_rows(PLAN, "responses", 2)
+    # пачки не зависят от порядка генерации: так их можно строить в разных процессах
+    build_rows(PLAN, "users", 0)
+    assert build_rows(PLAN, "responses", 2) == responses
+    assert build_rows(PLAN, "jobs", 1) == jobs
+
+
+def test_foreign_keys_and_uniqueness():
+    users = {user["id"]: user for user in all_rows(PLAN, "users")}
+    jobs = all_rows(PLAN, "jobs")
+    responses = all_rows(PLAN, "responses")
+
+    assert sorted(users) == list(range(101, 151))
+    assert len({user["email"] for user in users.values()}) == len(users)
+    assert [job["id"] for job in jobs] == list(range(11, 51))
+    assert all(users[job["user_id"]]["is_company"] for job in jobs)
+    assert all(job["salary_from"] <= job["salary_to"] for job in jobs)
+
+    pairs = [(response["user_id"], response["job_id"]) for response in responses]
+    assert len(set(pairs)) == len(pairs)
+    assert all(not users[user_id]["is_company"] for user_id, _ in pairs)
+    assert {job_id for _, job_id in pairs} <= {job["id"] for job in jobs}
+    assert len(responses) == 200
+
+
+def test_responses_total_is_exact():
+    # пачки строятся независимо, но их доли в сумме дают ровно запрошенное число
+    for responses in (0, 1, 37, 999):
+        assert len(all_rows(replace(PLAN, responses=responses), "responses")) == responses
+
+    # все пары соискатель-вакансия: каждая вакансия упирается в число соискателей
+    full = replace(PLAN, users=20, responses=40 * 18)
+    pairs = {(row["user_id"], row["job_id"]) for row in all_rows(full, "responses")}
+    assert len(pairs) == 40 * 18
+
+    with pytest.raises(ValueError):
+        replace(full, responses=40 * 18 + 1)
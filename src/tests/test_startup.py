@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent.resolve()
+# бюджет на холодный импорт main (мкс), переопределяется для медленных CI-машин
+IMPORT_TIME_BUDGET_US = int(os.environ.get("IMPORT_TIME_BUDGET_US", 1_500_000))
+LAZY_MODULES = ("passlib", "jose", "uvicorn")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def test_import_main_fits_budget():
+    result = run_python("-X", "importtime", "-c", "import main")
+
+    main_line = next(
+        line for line in result.stderr.splitlines() if line.split("|")[-1].strip() == "main"
+    )
+    cumulative_us = int(main_line.split("|")[1])
+    assert cumulative_us < IMPORT_TIME_BUDGET_US
+
+
+def test_import_main_is_lazy():
+    script = (
+        "import sys, main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules)); "
+        "print('app' in vars(main))"
+    )
+    loaded_modules, app_built = run_python("-c", script).stdout.splitlines()
+
+    assert loaded_modules == ""
+    assert app_built == "False"
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from repositories import StatsRepository
+from repositories.exceptions import RepositoryError
+from services import StatsService
+from tools.fixtures.jobs import JobFactory
+from tools.fixtures.responses import ResponseFactory
+from tools.fixtures.users import UserFactory
+
+
+@pytest.fixture()
+def stats_repository(sa_session):
+    return StatsRepository(session=sa_session)
+
+
+@pytest.mark.asyncio
+async def test_refresh_computes_totals_and_percentiles(stats_repository, sa_session):
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        applicant = UserFactory.build(is_company=False)
+        session.add_all([company, applicant])
+        await session.flush()
+        jobs = [
+            JobFactory.build(user_id=company.id, salary_from=salary, salary_to=salary * 2)
+            for salary in (100, 200, 300)
+        ]
+        for job in jobs:
+            job.is_active = True
+        closed_job = JobFactory.build(
+            user_id=company.id, salary_from=10_000, salary_to=20_000, is_active=False
+        )
+        session.add_all([*jobs, closed_job])
+        await session.flush()
+        session.add(ResponseFactory.build(user_id=applicant.id, job_id=jobs[0].id))
+        await session.flush()
+
+    assert await stats_repository.refresh()
+    stats = await stats_repository.retrieve()
+
+    assert (stats.users_total, stats.companies_total) == (2, 1)
+    assert (stats.jobs_total, stats.active_jobs_total, stats.responses_total) == (4, 3, 1)
+    assert (stats.salary_from.p25, stats.salary_from.p50, stats.salary_from.p75) == (150, 200, 250)
+    assert stats.salary_to.p50 == 400
+    assert stats.responses_per_day == {datetime.now(timezone.utc).date(): 1}
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_fresh_stats(stats_repository):
+    assert await stats_repository.refresh()
+
+    assert not await stats_repository.refresh(max_age=timedelta(minutes=5))
+
+
+@pytest.mark.asyncio
+async def test_periodic_refresh_logs_failures(caplog):
+    errors = [RepositoryError("Не удалось обновить статистику"), ValueError("bug")]
+
+    class FailingStatsRepository:
+        async def refresh(self, max_age: timedelta) -> bool:
+            raise errors.pop(0)
+
+    # сбой пересчёта записывается в лог и не останавливает цикл, дефект кода завершает задачу
+    with pytest.raises(ValueError):
+        await StatsService(FailingStatsRepository()).refresh_periodically(interval_seconds=0)
+
+    assert not errors
+    [record] = [record for record in caplog.records if record.name == "services.stats"]
+    assert isinstance(record.exc_info[1], RepositoryError)
@@ -0,0 +1,21 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from tools.security import STATS_CLAIM, create_access_token
+
+
+@pytest.mark.asyncio
+async def test_stats_require_claim(memory_app):
+    transport = ASGITransport(app=memory_app())
+    user = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    operator = {"Authorization": f"Bearer {create_access_token({'sub': '1', STATS_CLAIM: True})}"}
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        anonymous = await client.get("/stats")
+        forbidden = await client.get("/stats", headers=user)
+        stats = await client.get("/stats", headers=operator)
+
+    assert anonymous.status_code == 403
+    assert forbidden.status_code == 403
+    assert stats.status_code == 200
+    assert stats.json()["users_total"] == 0
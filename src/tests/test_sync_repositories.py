@@ -0,0 +1,80 @@
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from dependency_injector import providers
+
+import cli
+from dependencies.containers import SyncRepositoriesContainer
+from repositories.exceptions import EntityNotFoundError
+from web.schemas import JobCreateSchema, ResponseCreateSchema, UserCreateSchema
+
+
+@pytest.fixture()
+def container(sync_session):
+    container = SyncRepositoriesContainer()
+    container.db.override(providers.Singleton(SimpleNamespace, get_db=sync_session))
+    return container
+
+
+def create_company(container, email="company@example.com"):
+    user_create_dto = UserCreateSchema(
+        name="Компания", email=email, password="password", password2="password", is_company=True
+    )
+    return container.user_repository().create(user_create_dto, hashed_password="hash")
+
+
+def job_create_dto(title: str = "Python разработчик") -> JobCreateSchema:
+    return JobCreateSchema(
+        title=title, description="Пишем бэкенд", salary_from=100, salary_to=200, is_active=True
+    )
+
+
+def test_crud_shares_queries_with_async_repositories(container):
+    company = create_company(container)
+    job_repository = container.job_repository()
+
+    job = job_repository.create(company.id, job_create_dto())
+    assert job_repository.retrieve(id=job.id).title == "Python разработчик"
+
+    updated = job_repository.update(job.id, job_create_dto(title="Go разработчик"))
+    assert updated.title == "Go разработчик"
+    assert updated.updated_at > job.updated_at
+
+    response = container.response_repository().create(
+        company.id, job.id, ResponseCreateSchema(message="Готов работать")
+    )
+    assert [r.id for r in container.response_repository().iter_by_job(job.id)] == [response.id]
+
+    job_repository.delete(job.id, user_id=company.id)
+    with pytest.raises(EntityNotFoundError):
+        job_repository.retrieve(id=job.id)
+    with pytest.raises(EntityNotFoundError):
+        container.response_repository().retrieve(id=response.id)
+
+
+def test_purge_deleted_user(container):
+    company = create_company(container)
+    container.job_repository().create(company.id, job_create_dto())
+    container.user_repository().delete(company.id)
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert container.job_repository().purge_deleted(before=later) == 1
+    assert container.user_repository().purge_deleted(before=later) == 1
+
+
+def test_export_jobs_streams_deleted_jobs_too(container, tmp_path):
+    company = create_company(container)
+    jobs = [container.job_repository().create(company.id, job_create_dto()) for _ in range(3)]
+    container.job_repository().delete(jobs[0].id, user_id=company.id)
+
+    output = tmp_path / "jobs.jsonl"
+    args = argparse.Namespace(since=None, output=str(output), batch_size=2)
+    cli.export_jobs(container, args)
+
+    rows = {row["id"]: row for row in map(json.loads, output.read_text().splitlines())}
+    assert {job.id for job in jobs} <= rows.keys()
+    assert rows[jobs[0].id]["deleted_at"] is not None
+    assert rows[jobs[1].id]["deleted_at"] is None
@@ -0,0 +1,86 @@
+from tools.tfidf import TfIdfIndex
+
+JOBS = {
+    1: "Python backend developer FastAPI PostgreSQL",
+    2: "Senior Python developer Django PostgreSQL",
+    3: "Frontend developer React TypeScript",
+    4: "Бухгалтер на производство, 1С",
+    5: "Главный бухгалтер, отчётность 1С",
+}
+
+
+def build_index() -> TfIdfIndex:
+    index = TfIdfIndex()
+    for id, text in JOBS.items():
+        index.upsert(id, text)
+    return index
+
+
+def test_search_ranks_similar_documents_first():
+    index = build_index()
+
+    result = index.search(index.profile([1]), k=2, exclude=[1])
+
+    assert [id for id, _ in result] == [2, 3]
+
+
+def test_search_handles_cyrillic_text():
+    index = build_index()
+
+    result = index.search(index.profile([4]), k=1, exclude=[4])
+
+    assert result[0][0] == 5
+
+
+def test_not_searchable_documents_are_only_used_for_profiles():
+    index = build_index()
+    index.upsert(2, JOBS[2], searchable=False)
+
+    result = index.search(index.profile([2]), k=5, exclude=[])
+
+    assert 2 not in [id for id, _ in result]
+    assert result[0][0] == 1
+    assert len(index) == 4
+
+
+def test_remove_drops_document_from_postings():
+    index = build_index()
+
+    index.remove(2)
+    index.remove(2)
+
+    assert len(index) == 4
+    assert 2 not in [id for id, _ in index.search(index.profile([1]), k=5)]
+
+
+def test_search_merges_packed_and_pending_documents():
+    index = build_index()
+    index.compact()
+
+    index.upsert(6, "Python developer FastAPI")
+    index.upsert(2, JOBS[3])
+    index.remove(3)
+
+    result = index.search(index.profile([1]), k=5, exclude=[1])
+
+    assert result[0][0] == 6
+    assert 3 not in [id for id, _ in result]
+    assert len(index) == 5
+
+
+def test_changes_during_compaction_stay_searchable():
+    index = build_index()
+    index.compact()
+
+    snapshot = index.begin_compaction()
+    # пока матрица упаковывается в другом потоке, вакансии меняются
+    index.upsert(3, "Python developer FastAPI")
+    index.remove(5)
+    index.upsert(6, "Главный бухгалтер 1С")
+    index.finish_compaction(index.pack(snapshot))
+
+    assert [id for id, _ in index.search(index.profile([1]), k=3, exclude=[1])][:2] == [3, 2]
+    assert [id for id, _ in index.search(index.profile([4]), k=2, exclude=[4])] == [6]
+    assert len(index) == 5
+    index.compact()
+    assert [id for id, _ in index.search(index.profile([4]), k=2, exclude=[4])] == [6]
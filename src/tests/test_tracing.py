@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from dependency_injector import providers
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+pytest.importorskip("opentelemetry.sdk")
+
+from dependencies.containers import RepositoriesContainer, ServicesContainer  # noqa: E402
+from main import override_with_memory_repositories  # noqa: E402
+from repositories.memory import InMemoryJobRepository  # noqa: E402
+from services import JobService  # noqa: E402
+from services.exception import JobNotFoundError  # noqa: E402
+from storage.sqlalchemy.client import SqlAlchemyAsync  # noqa: E402
+from tests.conftest import settings  # noqa: E402
+from tools.tracing import (  # noqa: E402
+    instrument_container,
+    instrument_engine,
+    setup_tracing,
+    tracer,
+)
+from web.tracing import TracingMiddleware  # noqa: E402
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture(scope="module")
+def spans(tmp_path_factory):
+    """Спаны из файлового экспортёра; TracerProvider глобальный, один на процесс."""
+
+    path = tmp_path_factory.mktemp("tracing") / "spans.jsonl"
+    provider = setup_tracing("labor-exchange-tests", exporter="file", endpoint=str(path))
+
+    def read() -> list[dict]:
+        provider.force_flush()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    return read
+
+
+def by_name(spans: list[dict]) -> dict[str, dict]:
+    return {span["name"]: span for span in spans}
+
+
+def create_services() -> ServicesContainer:
+    repo_container = RepositoriesContainer()
+    override_with_memory_repositories(repo_container)
+    services_container = ServicesContainer()
+    services_container.repositories_container.override(repo_container)
+    services_container.job_duplicate_index.override(providers.Object(None))
+    instrument_container(repo_container, "repository")
+    instrument_container(services_container, "service")
+    return services_container
+
+
+@pytest.mark.asyncio
+async def test_request_spans_cover_layers(spans):
+    container = create_services()
+    app = FastAPI()
+
+    def get_job_service() -> JobService:
+        return container.job_service()
+
+    @app.get("/jobs/{id}")
+    async def read_job(id: int, job_service: JobService = Depends(get_job_service)):
+        try:
+            return await job_service.retrieve(id=id)
+        except JobNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+
+    app.add_middleware(TracingMiddleware)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/jobs/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+        )
+
+    assert response.status_code == 404
+    recorded = by_name(spans())
+    server = recorded["GET /jobs/{id}"]
+    service = recorded["JobService.retrieve"]
+    repository = recorded["InMemoryJobRepository.retrieve"]
+
+    # родитель серверного спана — вызывающий сервис из traceparent
+    assert server["context"]["trace_id"] == f"0x{TRACE_ID}"
+    assert server["parent_id"] == f"0x{PARENT_ID}"
+    assert server["attributes"]["http.response.status_code"] == 404
+    assert service["parent_id"] == server["context"]["span_id"]
+    assert repository["parent_id"] == service["context"]["span_id"]
+    assert repository["attributes"]["app.layer"] == "repository"
+    assert repository["status"]["status_code"] == "ERROR"
+
+
+def test_instrumented_factories_keep_types():
+    container = create_services()
+
+    job_service = container.job_service()
+    assert isinstance(job_service, JobService)
+    assert type(job_service).__name__ == "JobService"
+    assert isinstance(job_service.job_repository, InMemoryJobRepository)
+    # повторная инструментация не оборачивает методы второй раз
+    instrument_container(container, "service")
+    assert type(container.job_service()) is type(job_service)
+
+
+@pytest.mark.asyncio
+async def test_sql_spans(spans):
+    db = SqlAlchemyAsync(settings)
+    instrument_engine(db.engine.sync_engine)
+    try:
+        with tracer.start_as_current_span("sql-parent") as parent:
+            async with db.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                with pytest.raises(ProgrammingError):
+                    await connection.execute(text("SELECT * FROM missing_table"))
+    finally:
+        await db.engine.dispose()
+
+    parent_id = f"0x{parent.get_span_context().span_id:016x}"
+    statements = {
+        span["attributes"]["db.statement"]: span
+        for span in spans()
+        if span["parent_id"] == parent_id
+    }
+    assert statements["SELECT 1"]["name"] == "SELECT"
+    assert statements["SELECT 1"]["kind"] == "SpanKind.CLIENT"
+    assert statements["SELECT * FROM missing_table"]["status"]["status_code"] == "ERROR"
@@ -1,12 +1,17 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
 import pytest
 from pydantic import ValidationError
+from sqlalchemy import event
 from sqlalchemy.exc import IntegrityError
 
-from repositories.exceptions import UniqueError
+from repositories.exceptions import UniqueError, VersionConflictError
 from tools.fixtures.jobs import JobFactory
+from tools.fixtures.responses import ResponseFactory
 from tools.fixtures.users import UserFactory
 from tools.security import hash_password
-from web.schemas import UserCreateSchema, UserUpdateSchema
+from web.schemas import UserCreateSchema, UserPatchSchema, UserUpdateSchema
 
 
 @pytest.mark.asyncio
@@ -162,6 +167,28 @@ async def test_update_email_from_other_user(user_repository, sa_session):
         await user_repository.update(id=user2.id, user_update_dto=user_update_dto)
 
 
+@pytest.mark.asyncio
+async def test_patch(user_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build(email="test@example.com")
+        user2 = UserFactory.build()
+        session.add(user)
+        session.add(user2)
+        await session.flush()
+
+    patch = UserPatchSchema(name="updated_name", version=1)
+    patched = await user_repository.patch(id=user2.id, values=patch.changes(), version=1)
+    assert (patched.name, patched.email, patched.version) == ("updated_name", user2.email, 2)
+
+    with pytest.raises(VersionConflictError):
+        await user_repository.patch(id=user2.id, values={"name": "stale"}, version=1)
+    # откат после ошибки сбрасывает объекты сессии теста
+    id, email = user2.id, user2.email
+    with pytest.raises(UniqueError):
+        await user_repository.patch(id=id, values={"email": "test@example.com"})
+    assert (await user_repository.retrieve(id=id)).email == email
+
+
 @pytest.mark.asyncio
 async def test_delete(user_repository, sa_session):
     async with sa_session() as session:
@@ -172,3 +199,86 @@ async def test_delete(user_repository, sa_session):
     await user_repository.delete(id=user.id)
     res = await user_repository.retrieve_many()
     assert not res
+
+
+@pytest.mark.asyncio
+async def test_delete_hides_user_jobs_and_frees_email(user_repository, job_repository, sa_session):
+    async with sa_session() as session:
+        user = UserFactory.build(is_company=True)
+        session.add(user)
+        await session.flush()
+        session.add(JobFactory.build(user_id=user.id, is_active=True))
+        await session.flush()
+
+    await user_repository.delete(id=user.id)
+    new_user = await user_repository.create(
+        UserCreateSchema(
+            name="name",
+            email=user.email,
+            password="password",
+            password2="password",
+            is_company=False,
+        ),
+        hashed_password=hash_password("password"),
+    )
+
+    assert await job_repository.retrieve_many() == []
+    assert new_user.id != user.id
+    purge_time = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert await user_repository.purge_deleted(before=purge_time) == 1
+
+
+@pytest.mark.asyncio
+async def test_retrieve_profile_in_one_query(user_repository, sa_session):
+    created_at = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    async with sa_session() as session:
+        company = UserFactory.build(is_company=True)
+        applicant, gone = UserFactory.build(is_company=False), UserFactory.build(is_company=False)
+        session.add_all([company, applicant, gone])
+        await session.flush()
+        jobs = [
+            JobFactory.build(
+                user_id=company.id,
+                is_active=i != 1,
+                salary_from=Decimal("100.50"),
+                created_at=created_at + timedelta(days=i),
+            )
+            for i in range(3)
+        ]
+        jobs.append(JobFactory.build(user_id=company.id, deleted_at=created_at, is_active=True))
+        session.add_all(jobs)
+        await session.flush()
+        responses = [
+            ResponseFactory.build(user_id=user.id, job_id=job.id, created_at=created_at)
+            for user, job in ((applicant, jobs[0]), (applicant, jobs[2]), (gone, jobs[2]))
+        ]
+        session.add_all(responses)
+        gone.deleted_at = created_at
+        await session.flush()
+
+        statements = []
+        event.listen(
+            session.sync_session.connection(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        profile = await user_repository.retrieve_profile(id=company.id, limit=2)
+        applicant_profile = await user_repository.retrieve_profile(id=applicant.id, limit=2)
+
+    assert len(statements) == 2
+    assert profile.user.id == company.id
+    assert (profile.jobs_total, profile.active_jobs_total, profile.responses_total) == (3, 2, 2)
+    assert [job.id for job in profile.jobs] == [jobs[2].id, jobs[1].id]
+    assert [job.responses_total for job in profile.jobs] == [1, 0]
+    assert profile.jobs[0].salary_from == Decimal("100.50")
+    assert isinstance(profile.jobs[0].updated_at, datetime)
+    # при равных датах откликов новее тот, у кого больше id
+    assert [response.id for response in profile.responses] == [responses[1].id, responses[0].id]
+    assert profile.responses[0].created_at == created_at
+
+    assert applicant_profile.jobs == []
+    assert applicant_profile.responses_total == 2
+    assert {response.job_id for response in applicant_profile.responses} == {
+        jobs[0].id,
+        jobs[2].id,
+    }
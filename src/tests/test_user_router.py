@@ -0,0 +1,25 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_create_user_is_rate_limited(memory_app):
+    transport = ASGITransport(app=memory_app())
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        statuses = []
+        for number in range(6):
+            response = await client.post(
+                "/users",
+                json={
+                    "name": "Соискатель",
+                    "email": f"user{number}@example.com",
+                    "password": "password",
+                    "password2": "password",
+                },
+            )
+            statuses.append(response.status_code)
+
+    # 5 регистраций в минуту с одного IP, шестая — без расчёта bcrypt-хеша
+    assert statuses == [201] * 5 + [429]
+    assert 0 < int(response.headers["Retry-After"]) <= 12
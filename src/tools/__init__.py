@@ -1 +1 @@
-from .common import to_model, update_fields  # noqa
+from .common import from_json, to_model, update_fields  # noqa
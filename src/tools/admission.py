@@ -0,0 +1,137 @@
+import math
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Optional
+
+
+class Priority(IntEnum):
+    # анонимное чтение: лента вакансий, поиск
+    LOW = 0
+    # чтение с авторизацией и анонимная запись: регистрация, вход
+    NORMAL = 1
+    # запись с авторизацией
+    HIGH = 2
+
+
+# доля лимита, до которой принимаются запросы приоритета: остаток лимита
+# придерживается для более важных запросов
+PRIORITY_SHARE = {Priority.LOW: 0.5, Priority.NORMAL: 0.8, Priority.HIGH: 1.0}
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    """Снимок пула соединений движка."""
+
+    size: int
+    checked_out: int
+    max_overflow: int
+
+    @property
+    def capacity(self) -> int:
+        return self.size + max(self.max_overflow, 0)
+
+    @property
+    def saturated(self) -> bool:
+        """Все соединения выданы: следующий запрос к БД встанет в очередь пула."""
+
+        return self.max_overflow >= 0 and self.checked_out >= self.capacity
+
+
+class AdmissionController:
+    """Адаптивный лимит одновременных запросов воркера (AIMD).
+
+    Пока запросы укладываются в `latency_target` секунд, лимит растёт на единицу
+    за каждые `limit` завершённых запросов; ответ дольше цели, ошибка перегрузки
+    (503/504) или исчерпанный пул соединений уменьшают лимит в `backoff` раз, но
+    не чаще раза за `latency_target`: один всплеск не обрушивает лимит до минимума.
+
+    Запрос сверх лимита своего приоритета сразу отклоняется. Пока пул соединений
+    исчерпан, анонимное чтение не принимается вовсе: ему пришлось бы ждать в
+    очереди пула вместе с записью. Маршруты, медленные по замыслу (загрузка ленты,
+    профиль воркера), сравниваются со своим сроком, а не с `latency_target`
+    (см. LatencyTarget).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 2,
+        max_limit: int = 200,
+        latency_target: float = 0.5,
+        backoff: float = 0.75,
+        pool_status: Optional[Callable[[], Optional[PoolStatus]]] = None,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.pool_status = pool_status
+        self.in_flight = 0
+        self.admitted: Counter[Priority] = Counter()
+        self.shed: Counter[Priority] = Counter()
+        self._decreased_at = float("-inf")
+
+    def try_acquire(self, priority: Priority) -> bool:
+        """Занять место под запрос; False — запрос нужно отклонить."""
+
+        if self.in_flight >= max(1.0, self.limit * PRIORITY_SHARE[priority]) or (
+            priority == Priority.LOW and self._pool_saturated()
+        ):
+            self.shed[priority] += 1
+            return False
+        self.in_flight += 1
+        self.admitted[priority] += 1
+        return True
+
+    def release(
+        self, latency: float, overloaded: bool = False, latency_target: Optional[float] = None
+    ) -> None:
+        """Освободить место и учесть время ответа в лимите.
+
+        `latency_target` — цель для этого запроса, если она отличается от общей.
+        """
+
+        if latency_target is None:
+            latency_target = self.latency_target
+        busy = self.in_flight >= self.limit / 2
+        self.in_flight -= 1
+        if overloaded or latency > latency_target or self._pool_saturated():
+            now = time.monotonic()
+            if now - self._decreased_at >= self.latency_target:
+                self._decreased_at = now
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        elif busy:
+            # при малой загрузке время ответа ничего не говорит о пределе: лимит не растёт
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def _pool_saturated(self) -> bool:
+        if self.pool_status is None:
+            return False
+        pool = self.pool_status()
+        return pool is not None and pool.saturated
+
+
+class LatencyTarget:
+    """Время ответа, с которым контроллер сравнивает текущий запрос.
+
+    AdmissionMiddleware создаёт цель с `latency_target` контроллера, маршрут со своим
+    сроком (RequestTimeout) поднимает её до этого срока: долгая загрузка ленты не
+    считается медленным ответом и не уменьшает лимит для остальных запросов.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def extend(self, seconds: Optional[float]) -> None:
+        """Поднять цель до срока маршрута; None — срока нет, время ответа не учитывается."""
+
+        self.seconds = math.inf if seconds is None else max(self.seconds, seconds)
+
+
+current_latency_target: ContextVar[Optional[LatencyTarget]] = ContextVar(
+    "current_latency_target", default=None
+)
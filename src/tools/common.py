@@ -1,4 +1,6 @@
-from typing import TypeVar
+from dataclasses import fields
+from datetime import datetime
+from typing import TypeVar, get_args, get_type_hints
 
 from sqlalchemy import Table
 
@@ -17,6 +19,25 @@ def to_model(orm_instanse: Table, data_class: type[T]) -> T:
     return data_class(**orm_fields)
 
 
+def from_json(row: dict, data_class: type[T]) -> T:
+    """Датакласс из объекта JSON (json_agg, json_build_object в запросе).
+
+    Даты в JSON приходят строками ISO 8601, числа numeric — значениями, которые уже
+    разобраны в Decimal при декодировании (json.loads(..., parse_float=Decimal)).
+    """
+
+    hints = get_type_hints(data_class)
+    values = {}
+    for field in fields(data_class):
+        if field.name not in row:
+            continue
+        value, hint = row[field.name], hints[field.name]
+        if isinstance(value, str) and datetime in (hint, *get_args(hint)):
+            value = datetime.fromisoformat(value)
+        values[field.name] = value
+    return data_class(**values)
+
+
 def update_fields(dict_from_dto: dict, data_from_db: Table):
     for field in dict_from_dto:
         new_value = dict_from_dto[field]
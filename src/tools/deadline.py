@@ -0,0 +1,46 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Optional
+
+
+class Deadline:
+    """Крайний срок обработки запроса по часам цикла событий.
+
+    Срок задаёт `asyncio.Timeout` вокруг обработчика запроса: по его истечении
+    обработчик отменяется. Маршрут может заменить срок по умолчанию своим,
+    но не дольше срока, который передал клиент: ответ позже ему уже не нужен.
+    """
+
+    def __init__(self, timeout: asyncio.Timeout, client_when: Optional[float] = None):
+        self.timeout = timeout
+        self.client_when = client_when
+
+    @property
+    def when(self) -> Optional[float]:
+        return self.timeout.when()
+
+    def remaining(self) -> Optional[float]:
+        """Секунды до срока, None — срок не задан."""
+
+        when = self.when
+        if when is None:
+            return None
+        return max(0.0, when - asyncio.get_running_loop().time())
+
+    def reschedule(self, seconds: Optional[float]) -> None:
+        """Отсчитать срок заново: `seconds` от текущего момента, None — без срока маршрута."""
+
+        when = asyncio.get_running_loop().time() + seconds if seconds else None
+        if self.client_when is not None:
+            when = self.client_when if when is None else min(when, self.client_when)
+        self.timeout.reschedule(when)
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Секунды до срока текущего запроса, None — вне запроса или без срока."""
+
+    deadline = current_deadline.get()
+    return deadline.remaining() if deadline else None
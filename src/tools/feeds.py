@@ -0,0 +1,104 @@
+"""Потоковый разбор лент вакансий партнёров (XML, JSON).
+
+Лента разбирается по одной записи: в памяти держатся текущая вакансия и буфер
+чтения, сколько бы ни весил файл.
+"""
+
+import codecs
+import json
+import re
+from decimal import Decimal
+from typing import BinaryIO, Callable, Iterator
+from xml.etree.ElementTree import ParseError, iterparse
+
+CHUNK_SIZE = 64 * 1024
+# запись длиннее считается ошибкой ленты: иначе битый файл читался бы в память целиком
+MAX_ITEM_SIZE = 1024 * 1024
+
+SEPARATORS = re.compile(r"[\s,]*")
+
+
+class FeedFormatError(ValueError):
+    pass
+
+
+def iter_xml(stream: BinaryIO, tag: str = "job") -> Iterator[dict]:
+    """Записи `<job>` на любой глубине документа: атрибуты и текст дочерних элементов.
+
+    Разобранная запись удаляется из родителя: дерево документа не растёт.
+    """
+
+    path = []
+    try:
+        for event, element in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                path.append(element)
+                continue
+
+            path.pop()
+            if element.tag != tag:
+                continue
+            item = dict(element.attrib)
+            for child in element:
+                item[child.tag] = child.text.strip() if child.text else None
+            yield item
+            if path:
+                path[-1].remove(element)
+    except ParseError as e:
+        raise FeedFormatError(f"Некорректный XML: {e}") from e
+
+
+def iter_json(
+    stream: BinaryIO, chunk_size: int = CHUNK_SIZE, max_item_size: int = MAX_ITEM_SIZE
+) -> Iterator[dict]:
+    """Объекты из массива JSON верхнего уровня или из JSON Lines.
+
+    Файл читается кусками по `chunk_size`, объекты выделяются из буфера
+    JSONDecoder.raw_decode; незавершённый объект ждёт следующего куска.
+    Дробные числа разбираются в Decimal, как зарплаты в БД.
+    """
+
+    decoder = json.JSONDecoder(parse_float=Decimal)
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, position, eof = "", 0, False
+    in_array = None
+
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if position < len(buffer) and in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+                continue
+        if position < len(buffer) and in_array and buffer[position] == "]":
+            return
+
+        item = None
+        if position < len(buffer):
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise FeedFormatError(f"Некорректный JSON: {e}") from e
+                if len(buffer) - position > max_item_size:
+                    raise FeedFormatError(f"Запись ленты длиннее {max_item_size} символов") from e
+        elif eof:
+            if in_array:
+                raise FeedFormatError("Некорректный JSON: массив не закрыт")
+            return
+
+        if item is None:
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + text.decode(chunk, final=eof)
+            position = 0
+            continue
+        if not isinstance(item, dict):
+            raise FeedFormatError("Запись ленты должна быть объектом JSON")
+        yield item
+
+
+FEED_PARSERS: dict[str, Callable[[BinaryIO], Iterator[dict]]] = {
+    "xml": iter_xml,
+    "json": iter_json,
+}
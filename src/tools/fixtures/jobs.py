@@ -17,3 +17,4 @@ class JobFactory(factory.alchemy.SQLAlchemyModelFactory):
     salary_to = factory.Faker("pydecimal", left_digits=7, right_digits=2, min_value=0)
     is_active = factory.Faker("pybool")
     created_at = factory.LazyFunction(datetime.now)
+    updated_at = factory.LazyFunction(datetime.now)
@@ -0,0 +1,263 @@
+"""Генерация правдоподобных данных в объёмах продакшена.
+
+Строки собираются фабриками из tools.fixtures (factory.build в dict, без ORM-объектов)
+и загружаются через COPY. Таблица делится на пачки с заранее известными диапазонами
+id, каждая пачка строится в своём процессе от собственного зерна `seed:таблица:номер`,
+поэтому результат не зависит от числа процессов и порядка, в котором они завершатся.
+"""
+
+import csv
+import io
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+import factory
+import factory.random
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.pool import NullPool
+
+from tools.fixtures.jobs import JobFactory
+from tools.fixtures.responses import ResponseFactory
+from tools.fixtures.users import UserFactory
+
+COLUMNS = {
+    "users": ("id", "email", "name", "hashed_password", "is_company", "created_at"),
+    "jobs": (
+        "id",
+        "user_id",
+        "title",
+        "description",
+        "salary_from",
+        "salary_to",
+        "is_active",
+        "created_at",
+        "updated_at",
+    ),
+    # id откликов выдаёт последовательность: на них никто не ссылается
+    "responses": ("user_id", "job_id", "message", "created_at"),
+}
+TABLES = tuple(COLUMNS)
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """Что и с каких id генерировать.
+
+    Пользователи с шагом `company_every` — компании, остальные — соискатели.
+    Вакансии принадлежат только компаниям, откликаются только соискатели.
+    """
+
+    users: int
+    jobs: int
+    responses: int
+    first_user_id: int = 1
+    first_job_id: int = 1
+    seed: int = 0
+    company_every: int = 10
+    chunk_size: int = 10_000
+    hashed_password: str = ""
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def __post_init__(self) -> None:
+        if self.responses > self.jobs * self.applicants:
+            raise ValueError(
+                f"Откликов больше, чем пар соискатель-вакансия: {self.jobs * self.applicants}"
+            )
+
+    @property
+    def companies(self) -> int:
+        return math.ceil(self.users / self.company_every)
+
+    @property
+    def applicants(self) -> int:
+        return self.users - self.companies
+
+    def company_id(self, index: int) -> int:
+        return self.first_user_id + index * self.company_every
+
+    def applicant_id(self, index: int) -> int:
+        block, offset = divmod(index, self.company_every - 1)
+        return self.first_user_id + block * self.company_every + offset + 1
+
+    @property
+    def responses_per_job(self) -> float:
+        return self.responses / self.jobs if self.jobs else 0
+
+    def responses_for_jobs(self, start: int, end: int) -> int:
+        """Сколько откликов у вакансий [start, end): по всем пачкам ровно `responses`."""
+
+        return self.responses * end // self.jobs - self.responses * start // self.jobs
+
+    @property
+    def jobs_per_response_chunk(self) -> int:
+        return max(1, int(self.chunk_size / max(self.responses_per_job, 1)))
+
+    def chunks(self, table: str) -> int:
+        if table == "users":
+            return math.ceil(self.users / self.chunk_size)
+        if table == "jobs":
+            return math.ceil(self.jobs / self.chunk_size)
+        if not self.applicants:
+            return 0
+        return math.ceil(self.jobs / self.jobs_per_response_chunk)
+
+
+def build_rows(plan: SeedPlan, table: str, chunk: int) -> list[tuple]:
+    seed = f"{plan.seed}:{table}:{chunk}"
+    # зерно и у Faker внутри фабрик, и у собственного генератора: пачка воспроизводима
+    factory.random.reseed_random(seed)
+    rnd = random.Random(seed)
+    rows = _ROW_BUILDERS[table](plan, chunk, rnd)
+    return [tuple(row[column] for column in COLUMNS[table]) for row in rows]
+
+
+def _users(plan: SeedPlan, chunk: int, rnd: random.Random) -> Iterator[dict]:
+    start = chunk * plan.chunk_size
+    offsets = range(start, min(plan.users, start + plan.chunk_size))
+    users = factory.build_batch(
+        dict,
+        len(offsets),
+        FACTORY_CLASS=UserFactory,
+        name=factory.Faker("name", locale="ru_RU"),
+        email=factory.Faker("user_name"),
+        hashed_password=plan.hashed_password,
+    )
+    for offset, user in zip(offsets, users):
+        user["id"] = plan.first_user_id + offset
+        # email уникален: к имени из Faker добавляется id
+        user["email"] = f"{user['email']}.{user['id']}@example.com"
+        user["is_company"] = offset % plan.company_every == 0
+        user["created_at"] = plan.now - timedelta(days=rnd.uniform(0, 365))
+        yield user
+
+
+def _jobs(plan: SeedPlan, chunk: int, rnd: random.Random) -> Iterator[dict]:
+    start = chunk * plan.chunk_size
+    offsets = range(start, min(plan.jobs, start + plan.chunk_size))
+    jobs = factory.build_batch(
+        dict,
+        len(offsets),
+        FACTORY_CLASS=JobFactory,
+        title=factory.Faker("job", locale="ru_RU"),
+        description=factory.Faker("paragraph", nb_sentences=8, locale="ru_RU"),
+    )
+    for offset, job in zip(offsets, jobs):
+        job["id"] = plan.first_job_id + offset
+        # у крупных работодателей вакансий больше: квадрат смещает выбор к первым компаниям
+        job["user_id"] = plan.company_id(int(plan.companies * rnd.random() ** 2))
+        job["salary_from"] = rnd.randrange(30, 300) * 1000
+        job["salary_to"] = job["salary_from"] + rnd.randrange(0, 200) * 1000
+        job["is_active"] = rnd.random() < 0.9
+        job["created_at"] = job["updated_at"] = plan.now - timedelta(days=rnd.uniform(0, 180))
+        yield job
+
+
+def _responses(plan: SeedPlan, chunk: int, rnd: random.Random) -> Iterator[dict]:
+    start = chunk * plan.jobs_per_response_chunk
+    offsets = range(start, min(plan.jobs, start + plan.jobs_per_response_chunk))
+    # веса распределены экспоненциально: у большинства вакансий откликов мало
+    weights = [rnd.expovariate(1) for _ in offsets]
+    counts = _spread(plan.responses_for_jobs(offsets.start, offsets.stop), weights, plan.applicants)
+    for offset, count in zip(offsets, counts):
+        responses = factory.build_batch(
+            dict,
+            count,
+            FACTORY_CLASS=ResponseFactory,
+            message=factory.Faker("paragraph", locale="ru_RU"),
+        )
+        # выборка без повторов: пара (user_id, job_id) уникальна, вакансии у пачек не общие
+        applicants = rnd.sample(range(plan.applicants), count)
+        for applicant, response in zip(applicants, responses):
+            response["user_id"] = plan.applicant_id(applicant)
+            response["job_id"] = plan.first_job_id + offset
+            response["created_at"] = plan.now - timedelta(days=rnd.uniform(0, 90))
+            yield response
+
+
+def _spread(total: int, weights: list[float], cap: int) -> list[int]:
+    """Разложить ровно `total` пропорционально весам, не больше `cap` на каждый."""
+
+    counts = [0] * len(weights)
+    while total:
+        open_ = [i for i, count in enumerate(counts) if count < cap]
+        scale = total / (sum(weights[i] for i in open_) or 1)
+        shares = {i: weights[i] * scale for i in open_}
+        for i in open_:
+            added = min(cap - counts[i], int(shares[i]))
+            counts[i] += added
+            total -= added
+        # остаток от округления — вакансиям с наибольшей дробной частью доли
+        for i in sorted(open_, key=lambda i: shares[i] - int(shares[i]), reverse=True):
+            if not total:
+                break
+            if counts[i] < cap:
+                counts[i] += 1
+                total -= 1
+    return counts
+
+
+_ROW_BUILDERS = {"users": _users, "jobs": _jobs, "responses": _responses}
+
+_engine: Optional[Engine] = None
+
+
+def _init_worker(dsn: str) -> None:
+    global _engine
+    _engine = create_engine(dsn, poolclass=NullPool)
+
+
+def _load_chunk(plan: SeedPlan, table: str, chunk: int) -> int:
+    rows = build_rows(plan, table, chunk)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    connection = _engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        connection.commit()
+    finally:
+        connection.close()
+    return len(rows)
+
+
+def plan_from_database(engine: Engine, **kwargs) -> SeedPlan:
+    """План, продолжающий id после уже существующих записей."""
+
+    with engine.connect() as connection:
+        max_user_id = connection.execute(text("SELECT coalesce(max(id), 0) FROM users")).scalar()
+        max_job_id = connection.execute(text("SELECT coalesce(max(id), 0) FROM jobs")).scalar()
+    return SeedPlan(first_user_id=max_user_id + 1, first_job_id=max_job_id + 1, **kwargs)
+
+
+def seed(dsn: str, plan: SeedPlan, workers: int) -> Iterator[tuple[str, int, float]]:
+    """Загрузить таблицы по порядку внешних ключей, отдавая (таблица, строк, секунд)."""
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dsn,)) as pool:
+        for table in TABLES:
+            started = time.perf_counter()
+            chunks = range(plan.chunks(table))
+            loaded = sum(pool.map(_load_chunk, [plan] * len(chunks), [table] * len(chunks), chunks))
+            yield table, loaded, time.perf_counter() - started
+
+    engine = create_engine(dsn, poolclass=NullPool)
+    try:
+        with engine.begin() as connection:
+            # id пользователей и вакансий заданы явно: последовательности догоняют их
+            for table in ("users", "jobs"):
+                connection.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT coalesce(max(id), 1) FROM {table}))"
+                    )
+                )
+    finally:
+        engine.dispose()
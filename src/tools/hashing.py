@@ -0,0 +1,64 @@
+import math
+import zlib
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from tools.text import tokenize
+
+Vector = tuple[np.ndarray, np.ndarray]
+
+
+class HashingVectorizer:
+    """Разреженные векторы n-грамм фиксированной размерности без словаря.
+
+    Признаки: слова, пары соседних слов и символьные триграммы слов. Триграммы
+    сглаживают разницу словоформ («разработчик» и «разработчиком» получают общие
+    признаки). Номер признака — crc32 n-граммы по модулю `n_features`, знак берётся
+    из старшего бита хеша, чтобы коллизии в среднем гасили друг друга.
+    """
+
+    def __init__(self, n_features: int = 2**20) -> None:
+        self.n_features = n_features
+
+    def transform(self, text: Optional[str]) -> Vector:
+        counts = Counter(self._ngrams(tokenize(text or "")))
+
+        features: dict[int, float] = defaultdict(float)
+        for gram, count in counts.items():
+            hashed = zlib.crc32(gram.encode())
+            sign = -1 if hashed & 0x80000000 else 1
+            features[hashed % self.n_features] += sign * (1 + math.log(count))
+
+        norm = math.sqrt(sum(value * value for value in features.values())) or 1
+        indices = np.fromiter(features.keys(), dtype=np.int32, count=len(features))
+        values = np.fromiter(features.values(), dtype=np.float32, count=len(features)) / norm
+        return indices, values
+
+    def similarity(self, query: Vector, vectors: Iterable[Vector]) -> np.ndarray:
+        """Косинусная близость запроса к каждому из векторов одной операцией NumPy."""
+
+        vectors = list(vectors)
+        if not vectors:
+            return np.empty(0, dtype=np.float32)
+
+        dense = np.zeros(self.n_features, dtype=np.float32)
+        dense[query[0]] = query[1]
+
+        lengths = [len(indices) for indices, _ in vectors]
+        indices = np.concatenate([indices for indices, _ in vectors])
+        values = np.concatenate([values for _, values in vectors])
+        rows = np.repeat(np.arange(len(vectors)), lengths)
+        products = dense[indices] * values
+        return np.bincount(rows, weights=products, minlength=len(vectors)).astype(np.float32)
+
+    @staticmethod
+    def _ngrams(words: list[str]) -> Iterable[str]:
+        yield from words
+        for first, second in zip(words, words[1:]):
+            yield f"{first} {second}"
+        for word in words:
+            padded = f" {word} "
+            for start in range(len(padded) - 2):
+                yield f"#{padded[start:start + 3]}"
@@ -0,0 +1,155 @@
+"""Структурированные логи (JSON) через очередь.
+
+Вызов логгера в обработчике запроса только создаёт запись и кладёт её в очередь:
+форматирование и вывод идут в потоке QueueListener, цикл событий не ждёт stdout.
+Идентификатор запроса и признак выборки передаются через contextvars и попадают
+во все записи обработки запроса, включая логи SQLAlchemy.
+"""
+
+import logging
+import sys
+import time
+from collections.abc import Mapping
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional, TextIO
+
+import orjson
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# False — запрос не попал в выборку: его записи ниже WARNING отбрасываются
+log_sampled: ContextVar[bool] = ContextVar("log_sampled", default=True)
+
+STARTED = time.time()
+# стандартные атрибуты LogRecord; остальные (extra=...) выводятся отдельными полями JSON
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "taskName",
+}
+
+
+class ContextLogRecord(logging.LogRecord):
+    """LogRecord с id запроса, но без файла, потока и процесса.
+
+    Стандартный LogRecord на каждый вызов разбирает путь к файлу и спрашивает
+    текущий поток и процесс — это половина цены записи, а в JSON этих полей нет.
+    Атрибуты те же, что у LogRecord: сторонние форматтеры (pytest) работают как раньше.
+    """
+
+    def __init__(
+        self, name, level, pathname, lineno, msg, args, exc_info, func=None, sinfo=None, **kwargs
+    ):
+        created = time.time()
+        self.name = name
+        self.msg = msg
+        # logger.info("%(a)s", {"a": 1}) — как в LogRecord
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.levelname = logging.getLevelName(level)
+        self.levelno = level
+        self.pathname = self.filename = pathname
+        self.module = ""
+        self.exc_info = exc_info
+        self.exc_text = None
+        self.stack_info = sinfo
+        self.lineno = lineno
+        self.funcName = func
+        self.created = created
+        self.msecs = (created - int(created)) * 1000
+        self.relativeCreated = (created - STARTED) * 1000
+        self.thread = self.threadName = self.processName = self.process = None
+        self.request_id = request_id.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись — одна строка JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class LogQueueHandler(QueueHandler):
+    """QueueHandler без блокировки, форматирования и копирования записи.
+
+    SimpleQueue потокобезопасна сама, блокировка обработчика не нужна. Сообщение
+    подставляется сразу (аргументы могут измениться после вызова), остальное,
+    включая трассировку исключения, форматирует поток слушателя.
+    """
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not log_sampled.get():
+            return False
+        try:
+            record.msg = record.message = record.getMessage()
+            record.args = None
+            self.queue.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+        return True
+
+
+def log_fields(
+    logger: logging.Logger, level: int, message: str, fields: dict, exc_info=None
+) -> None:
+    """logger.log(level, message, extra=fields) для горячего пути (строка журнала доступа).
+
+    Logger.makeRecord переносит extra в запись по одному полю с проверкой каждого
+    имени — это около трети цены вызова. Здесь запись создаётся сразу и поля
+    добавляются одним update; имена полей не должны совпадать с атрибутами LogRecord.
+    """
+
+    if not logger.isEnabledFor(level):
+        return
+    record = ContextLogRecord(logger.name, level, "", 0, message, None, exc_info)
+    record.__dict__.update(fields)
+    logger.handle(record)
+
+
+def setup_logging(
+    level: str = "INFO", sql: bool = False, stream: Optional[TextIO] = None
+) -> QueueListener:
+    """Направить логи процесса в очередь и вернуть её слушателя.
+
+    Записи копятся в очереди, пока слушатель не запущен: при запуске с preload
+    приложение собирается в мастере, а поток слушателя запускается в каждом
+    воркере после fork (в lifespan).
+    """
+
+    # без поиска файла и строки вызова: в JSON их нет, а стоит он как треть записи
+    logging._srcfile = None
+    logging.setLogRecordFactory(ContextLogRecord)
+
+    log_queue: SimpleQueue = SimpleQueue()
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        if isinstance(old, LogQueueHandler):
+            root.removeHandler(old)
+    root.addHandler(LogQueueHandler(log_queue))
+    root.setLevel(level)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if sql else logging.WARNING)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    return QueueListener(log_queue, output)
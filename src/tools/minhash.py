@@ -0,0 +1,101 @@
+import zlib
+from collections import defaultdict
+from typing import Iterable
+
+import numpy as np
+
+from tools.text import tokenize
+
+# простое число Мерсенна 2^61 - 1 для универсального хеширования
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """MinHash-сигнатуры множества символьных шинглов текста.
+
+    Доля совпадающих позиций двух сигнатур — несмещённая оценка коэффициента
+    Жаккара их множеств шинглов. Коэффициенты хеш-функций получаются из
+    фиксированного seed, поэтому сигнатуры совпадают между воркерами и запусками.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        # регистр, пунктуация и пробелы не должны отличать перепост от оригинала
+        normalized = " ".join(tokenize(text)).replace("ё", "е")
+        shifted = (normalized[offset:] for offset in range(self.shingle_size))
+        shingles = {"".join(chars) for chars in zip(*shifted)} or {normalized}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode()) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+        # переполнение при умножении допустимо: остаток всё равно равномерен на практике
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class LshIndex:
+    """Индекс LSH по полосам MinHash-сигнатур.
+
+    Сигнатура делится на `bands` полос, документы с хотя бы одной совпавшей полосой
+    становятся кандидатами и проверяются по оценке Жаккара. Порог срабатывания
+    кандидатов примерно (1 / bands) ** (1 / rows): для 8 полос по 8 строк это ~0.77.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 8) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._signatures: dict[int, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[int]]] = [defaultdict(set) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def insert(self, id: int, signature: np.ndarray) -> None:
+        self.remove(id)
+        self._signatures[id] = signature
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets[key].add(id)
+
+    def remove(self, id: int) -> None:
+        signature = self._signatures.pop(id, None)
+        if signature is None:
+            return
+
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[key]
+            bucket.discard(id)
+            if not bucket:
+                del buckets[key]
+
+    def query(self, signature: np.ndarray, exclude: Iterable[int] = ()) -> list[tuple[int, float]]:
+        """Документы с оценкой Жаккара не ниже порога, по убыванию оценки."""
+
+        candidates = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+        candidates.difference_update(exclude)
+
+        matches = []
+        for id in candidates:
+            similarity = float(np.mean(self._signatures[id] == signature))
+            if similarity >= self.threshold:
+                matches.append((id, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
@@ -0,0 +1,142 @@
+"""Выборочный профилировщик на stdlib для живого воркера.
+
+Отдельный поток раз в `interval` секунд снимает стек потока цикла событий
+(sys._current_frames) и копит время по стекам. Профилируемый код не
+инструментируется: пока профилировщик не запущен, он ничего не стоит, а во
+время записи стоит один захват GIL на выборку.
+
+Результат — файл speedscope (https://www.speedscope.app) или свёрнутые стеки
+для flamegraph.pl.
+"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import FrameType
+from typing import Optional
+
+# claim токена, который разрешает профилирование; при входе не выдаётся,
+# токен с ним выпускает оператор (cli.py profile-token)
+PROFILE_CLAIM = "profile"
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+FrameKey = tuple[str, str, int]
+
+
+def can_profile(payload: Optional[dict]) -> bool:
+    return bool(payload and payload.get(PROFILE_CLAIM))
+
+
+class SamplingProfiler:
+    """Выборки стека одного потока.
+
+    С `anchor` учитываются только выборки, в стеке которых есть этот кадр (кадр
+    middleware запроса), и только часть стека выше него: так из общего потока
+    цикла событий выделяется время одного запроса. Код, который запрос отдал в
+    другие задачи или потоки, в такой профиль не попадает.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        interval: float = 0.005,
+        anchor: Optional[FrameType] = None,
+    ):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.anchor = anchor
+        self.stacks: dict[tuple[FrameKey, ...], float] = defaultdict(float)
+        self.samples = 0
+        self.started = self.stopped = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.stopped or time.perf_counter()) - self.started
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped = time.perf_counter()
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        previous = self.started
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            # вес выборки — фактическое время с предыдущей: поток ждёт GIL дольше `interval`
+            weight, previous = now - previous, now
+            stack = self._stack(frame)
+            if stack:
+                self.stacks[stack] += weight
+                self.samples += 1
+
+    def _stack(self, frame: Optional[FrameType]) -> tuple[FrameKey, ...]:
+        keys = []
+        while frame is not None:
+            code = frame.f_code
+            keys.append((code.co_name, code.co_filename, code.co_firstlineno))
+            if frame is self.anchor:
+                break
+            frame = frame.f_back
+        else:
+            if self.anchor is not None:
+                return ()
+        keys.reverse()
+        return tuple(keys)
+
+    def speedscope(self, name: str) -> dict:
+        """Профиль в формате speedscope: один профиль типа sampled, веса в секундах."""
+
+        frames: dict[FrameKey, int] = {}
+        samples, weights = [], []
+        for stack, weight in self.stacks.items():
+            samples.append([frames.setdefault(key, len(frames)) for key in stack])
+            weights.append(weight)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "labor-exchange",
+            "shared": {
+                "frames": [
+                    {"name": function, "file": file, "line": line}
+                    for function, file, line in frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def collapsed(self) -> str:
+        """Свёрнутые стеки (`a;b;c <мкс>` на строку) для flamegraph.pl."""
+
+        return "".join(
+            ";".join(f"{function} ({file}:{line})" for function, file, line in stack)
+            + f" {round(weight * 1e6)}\n"
+            for stack, weight in self.stacks.items()
+        )
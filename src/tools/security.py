@@ -1,42 +1,64 @@
 import datetime
+from functools import cache
+from typing import Optional
 
 from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from jose import jwt
-from passlib.context import CryptContext
 
 from config.auth import AuthSettings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-auth_settings = AuthSettings()
+# claim токена, который открывает сводную статистику биржи; при входе не выдаётся,
+# токен с ним выпускает оператор (cli.py stats-token)
+STATS_CLAIM = "stats"
+
+
+# passlib и jose импортируются при первом использовании, а не при импорте модуля
+@cache
+def get_pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@cache
+def get_auth_settings() -> AuthSettings:
+    return AuthSettings()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(password: str, hash: str) -> bool:
-    if not pwd_context.verify(password, hash):
+    if not get_pwd_context().verify(password, hash):
         raise ValueError()
 
 
-def create_access_token(data: dict) -> str:
+def create_access_token(data: dict, expire_minutes: Optional[float] = None) -> str:
+    from jose import jwt
+
+    auth_settings = get_auth_settings()
     to_encode = data.copy()
     to_encode.update(
         {
             "exp": datetime.datetime.utcnow()
-            + datetime.timedelta(minutes=auth_settings.access_token_expire_minutes)
+            + datetime.timedelta(
+                minutes=expire_minutes or auth_settings.access_token_expire_minutes
+            )
         }
     )
     return jwt.encode(to_encode, auth_settings.secret_key, algorithm=auth_settings.algorithm)
 
 
 def decode_access_token(token: str):
+    from jose import jwt
+
+    auth_settings = get_auth_settings()
     try:
         encoded_jwt = jwt.decode(
             token, auth_settings.secret_key, algorithms=[auth_settings.algorithm]
         )
-    except jwt.JWSError:
+    except (jwt.JWSError, jwt.JWTError):
         return None
     return encoded_jwt
 
@@ -0,0 +1,8 @@
+import re
+
+# слова из букв длиной от двух символов: цифры и пунктуация в признаки не попадают
+TOKEN_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
@@ -0,0 +1,271 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from tools.text import tokenize
+
+Vector = tuple[np.ndarray, np.ndarray]
+# документы для упаковки: id, их векторы и размер словаря на момент снимка
+Snapshot = tuple[list[int], list[Vector], int]
+
+
+class PackedMatrix(NamedTuple):
+    row_ids: np.ndarray
+    rows: dict[int, int]
+    indptr: np.ndarray
+    postings_rows: np.ndarray
+    postings_weights: np.ndarray
+
+
+class TfIdfIndex:
+    """Инкрементальный TF-IDF индекс по схеме lnc.ltc.
+
+    Документы хранятся как нормированные векторы логарифмических частот без idf,
+    idf применяется только к запросу, поэтому изменение одного документа не требует
+    пересчёта весов остальных. Для поиска векторы упакованы в сжатую по столбцам
+    матрицу (CSC): по каждому терму массив строк-документов и массив весов.
+    Изменения между упаковками копятся в небольшом словарном индексе, матрица
+    перестраивается, когда изменений больше `compact_ratio` от её размера.
+
+    С `auto_compact=False` упаковкой управляет вызывающий код: снимок документов
+    (begin_compaction) и подмена массивов (finish_compaction) быстрые, а сама
+    упаковка (pack) не обращается к индексу и может идти в другом потоке.
+    """
+
+    def __init__(
+        self,
+        max_query_terms: int = 64,
+        max_doc_terms: int = 48,
+        max_df: float = 0.2,
+        min_postings_cap: int = 1000,
+        compact_ratio: float = 0.05,
+        min_compact_size: int = 1000,
+        auto_compact: bool = True,
+    ) -> None:
+        self.max_query_terms = max_query_terms
+        # у длинного описания оставляем только самые весомые термы: матрица остаётся компактной
+        self.max_doc_terms = max_doc_terms
+        # термы из более чем max_df доли документов почти не влияют на ранжирование,
+        # а их списки документов самые длинные: на больших индексах такие термы пропускаются
+        self.max_df = max_df
+        self.min_postings_cap = min_postings_cap
+        self.compact_ratio = compact_ratio
+        self.min_compact_size = min_compact_size
+        self.auto_compact = auto_compact
+
+        self._terms: dict[str, int] = {}
+        self._df: Counter[int] = Counter()
+        self._vectors: dict[int, Vector] = {}
+        self._searchable: set[int] = set()
+
+        # упакованная часть: строка матрицы -> id документа и CSC-массивы по термам
+        self._row_ids = np.empty(0, dtype=np.int64)
+        self._rows: dict[int, int] = {}
+        self._alive = np.empty(0, dtype=bool)
+        self._dead_rows = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._postings_rows = np.empty(0, dtype=np.int32)
+        self._postings_weights = np.empty(0, dtype=np.float32)
+
+        # документы, добавленные или изменённые после последней упаковки
+        self._pending: dict[int, dict[int, float]] = defaultdict(dict)
+        self._pending_ids: set[int] = set()
+        # id документов, изменённых после снимка идущей упаковки
+        self._changed: Optional[set[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._searchable)
+
+    def upsert(
+        self,
+        id: int,
+        text: str,
+        searchable: bool = True,
+        weights: Optional[dict[str, float]] = None,
+    ) -> None:
+        """Добавить или заменить документ; `weights` — готовый результат term_weights(text)."""
+
+        self.remove(id)
+        vector = self._vectors[id] = self._encode(weights or self.term_weights(text))
+        if not searchable:
+            return
+
+        self._searchable.add(id)
+        self._pending_ids.add(id)
+        for term_id, weight in zip(vector[0].tolist(), vector[1].tolist()):
+            self._df[term_id] += 1
+            self._pending[term_id][id] = weight
+        if self.auto_compact and self.needs_compaction():
+            self.compact()
+
+    def remove(self, id: int) -> None:
+        if self._changed is not None:
+            self._changed.add(id)
+        vector = self._vectors.pop(id, None)
+        if vector is None or id not in self._searchable:
+            return
+
+        self._searchable.discard(id)
+        term_ids = vector[0].tolist()
+        self._df.subtract(term_ids)
+        if id in self._pending_ids:
+            self._pending_ids.discard(id)
+            for term_id in term_ids:
+                del self._pending[term_id][id]
+
+        row = self._rows.pop(id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._dead_rows += 1
+
+    def profile(self, ids: Iterable[int]) -> dict[int, float]:
+        """Суммарный вектор документов: интересы пользователя по его откликам."""
+
+        profile: dict[int, float] = defaultdict(float)
+        for id in ids:
+            if id in self._vectors:
+                term_ids, weights = self._vectors[id]
+                for term_id, weight in zip(term_ids.tolist(), weights.tolist()):
+                    profile[term_id] += weight
+        return profile
+
+    def search(
+        self, query: dict[int, float], k: int, exclude: Iterable[int] = ()
+    ) -> list[tuple[int, float]]:
+        n_docs = len(self._searchable)
+        max_postings = max(self.min_postings_cap, int(n_docs * self.max_df))
+        weighted = {
+            term_id: weight * math.log((1 + n_docs) / (1 + self._df[term_id]))
+            for term_id, weight in query.items()
+            if 0 < self._df[term_id] <= max_postings
+        }
+        terms = heapq.nlargest(self.max_query_terms, weighted.items(), key=itemgetter(1))
+        exclude = set(exclude)
+
+        scores = np.zeros(len(self._row_ids), dtype=np.float32)
+        pending_scores: dict[int, float] = defaultdict(float)
+        n_packed_terms = len(self._indptr) - 1
+        for term_id, query_weight in terms:
+            if term_id < n_packed_terms:
+                start, end = self._indptr[term_id], self._indptr[term_id + 1]
+                scores[self._postings_rows[start:end]] += (
+                    query_weight * self._postings_weights[start:end]
+                )
+            for id, weight in self._pending.get(term_id, {}).items():
+                pending_scores[id] += query_weight * weight
+
+        scores[~self._alive] = 0
+        for id in exclude:
+            if id in self._rows:
+                scores[self._rows[id]] = 0
+            pending_scores.pop(id, None)
+
+        candidates = self._top_rows(scores, k)
+        candidates.extend(pending_scores.items())
+        return heapq.nlargest(k, candidates, key=itemgetter(1))
+
+    def compact(self) -> None:
+        """Упаковать все документы для поиска в CSC-матрицу."""
+
+        self.finish_compaction(self.pack(self.begin_compaction()))
+
+    def needs_compaction(self) -> bool:
+        threshold = max(self.min_compact_size, int(len(self._row_ids) * self.compact_ratio))
+        return len(self._pending_ids) + self._dead_rows > threshold
+
+    def begin_compaction(self) -> Snapshot:
+        """Снимок документов для упаковки: изменения после него останутся неупакованными."""
+
+        self._changed = set()
+        ids = list(self._searchable)
+        return ids, [self._vectors[id] for id in ids], len(self._terms)
+
+    @staticmethod
+    def pack(snapshot: Snapshot) -> PackedMatrix:
+        """CSC-матрица снимка. Индекс не читается, поэтому можно вызывать в другом потоке."""
+
+        ids, vectors, n_terms = snapshot
+        lengths = np.fromiter((len(term_ids) for term_ids, _ in vectors), dtype=np.int64)
+        term_ids = np.concatenate([term_ids for term_ids, _ in vectors] or [np.empty(0, np.int32)])
+        weights = np.concatenate([weights for _, weights in vectors] or [np.empty(0, np.float32)])
+        rows = np.repeat(np.arange(len(ids), dtype=np.int32), lengths)
+
+        order = np.argsort(term_ids, kind="stable")
+        indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=n_terms), out=indptr[1:])
+        return PackedMatrix(
+            row_ids=np.array(ids, dtype=np.int64),
+            rows={id: row for row, id in enumerate(ids)},
+            indptr=indptr,
+            postings_rows=rows[order],
+            postings_weights=weights[order],
+        )
+
+    def finish_compaction(self, packed: PackedMatrix) -> None:
+        """Подменить упакованную часть; документы, изменённые после снимка, остаются в pending."""
+
+        changed, self._changed = self._changed or set(), None
+        self._row_ids = packed.row_ids
+        self._rows = packed.rows
+        self._indptr = packed.indptr
+        self._postings_rows = packed.postings_rows
+        self._postings_weights = packed.postings_weights
+        self._alive = np.ones(len(packed.row_ids), dtype=bool)
+        self._dead_rows = 0
+        for id in changed:
+            row = self._rows.pop(id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._dead_rows += 1
+
+        # в pending остаются только документы, добавленные после снимка
+        keep = self._pending_ids & changed
+        pending = defaultdict(dict)
+        if keep:
+            for term_id, docs in self._pending.items():
+                kept = {id: weight for id, weight in docs.items() if id in keep}
+                if kept:
+                    pending[term_id] = kept
+        self._pending = pending
+        self._pending_ids = keep
+
+    @contextmanager
+    def deferred_compaction(self):
+        """Массовая загрузка: одна упаковка в конце вместо упаковок по ходу."""
+
+        auto_compact, self.auto_compact = self.auto_compact, False
+        try:
+            yield self
+        finally:
+            self.auto_compact = auto_compact
+            self.compact()
+
+    def _top_rows(self, scores: np.ndarray, k: int) -> list[tuple[int, float]]:
+        # большинство строк нулевые, на них argpartition работает в разы медленнее
+        rows = np.flatnonzero(scores > 0)
+        if k < len(rows):
+            rows = rows[np.argpartition(scores[rows], -k)[-k:]]
+        return [(int(self._row_ids[row]), float(scores[row])) for row in rows.tolist()]
+
+    def term_weights(self, text: str) -> dict[str, float]:
+        """Нормированные логарифмические частоты самых весомых термов текста.
+
+        Индекс не читается и не меняется: тексты можно обрабатывать в другом потоке.
+        """
+
+        counts = Counter(tokenize(text))
+        vector = {term: 1 + math.log(count) for term, count in counts.items()}
+        vector = dict(heapq.nlargest(self.max_doc_terms, vector.items(), key=itemgetter(1)))
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1
+        return {term: weight / norm for term, weight in vector.items()}
+
+    def _encode(self, weights: dict[str, float]) -> Vector:
+        term_ids = np.array(
+            [self._terms.setdefault(term, len(self._terms)) for term in weights], dtype=np.int32
+        )
+        return term_ids, np.array(list(weights.values()), dtype=np.float32)
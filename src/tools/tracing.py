@@ -0,0 +1,137 @@
+"""Трассировка OpenTelemetry: спаны сервисов, репозиториев и SQL.
+
+Необязательная зависимость (extra tracing): модуль импортирует opentelemetry и
+поэтому импортируется только при TRACING_ENABLED. Выключенная трассировка ничего
+не стоит: классы сервисов и репозиториев, движок БД и цепочка middleware
+остаются прежними.
+
+Спаны слоёв появляются через контейнеры dependency_injector: фабрики сервисов и
+репозиториев начинают создавать подклассы, у которых публичные async-методы
+обёрнуты в спан. Код сервисов и репозиториев о трассировке не знает.
+"""
+
+import functools
+import inspect
+from typing import Any, Callable, Literal, Optional
+
+from dependency_injector import containers, providers
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+tracer = trace.get_tracer(__name__)
+
+# длинные пачки INSERT ... VALUES не нужны в спане целиком
+MAX_STATEMENT_LENGTH = 2000
+
+
+def setup_tracing(
+    service_name: str,
+    exporter: Literal["otlp", "file"] = "otlp",
+    endpoint: Optional[str] = None,
+) -> TracerProvider:
+    """Глобальный TracerProvider процесса с пакетной отправкой спанов.
+
+    otlp — коллектор по HTTP (`endpoint`, по умолчанию OTEL_EXPORTER_OTLP_ENDPOINT
+    или localhost:4318), file — спаны строками JSON в файл `endpoint` (для тестов
+    и отладки без коллектора).
+    """
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        span_exporter = OTLPSpanExporter(endpoint=endpoint)
+    else:
+        span_exporter = ConsoleSpanExporter(
+            out=open(endpoint, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    # поток отправки BatchSpanProcessor перезапускается в воркерах после fork
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def traced_method(layer: str, name: str, method: Callable) -> Callable:
+    attributes = {"app.layer": layer, "code.function": method.__name__}
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs) -> Any:
+        with tracer.start_as_current_span(name, attributes=attributes):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+@functools.cache
+def traced_class(cls: type, layer: str) -> type:
+    """Подкласс `cls`, у которого публичные async-методы создают спан `Класс.метод`."""
+
+    if getattr(cls, "__traced__", False):
+        return cls
+    namespace = {
+        name: traced_method(layer, f"{cls.__name__}.{name}", method)
+        for name, method in inspect.getmembers(cls, inspect.iscoroutinefunction)
+        if not name.startswith("_")
+        and not isinstance(inspect.getattr_static(cls, name), (staticmethod, classmethod))
+    }
+    namespace.update(__module__=cls.__module__, __qualname__=cls.__qualname__, __traced__=True)
+    return type(cls.__name__, (cls,), namespace)
+
+
+def instrument_container(container: containers.Container, layer: str) -> None:
+    """Фабрики контейнера (и подменившие их фабрики) создают трассируемые подклассы.
+
+    Вызывается после всех override: подмена, сделанная позже, останется без спанов.
+    """
+
+    for provider in container.providers.values():
+        for factory in (provider, *provider.overridden):
+            if isinstance(factory, providers.Factory) and inspect.isclass(factory.provides):
+                factory.set_provides(traced_class(factory.provides, layer))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Спан на каждую команду SQL движка (для AsyncEngine — его sync_engine)."""
+
+    event.listen(engine, "before_cursor_execute", _start_sql_span)
+    event.listen(engine, "after_cursor_execute", _end_sql_span)
+    event.listen(engine, "handle_error", _fail_sql_span)
+
+
+def _start_sql_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    context._tracing_span = tracer.start_span(
+        operation,
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.name": conn.engine.url.database or "",
+            "db.operation": operation,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        },
+    )
+
+
+def _end_sql_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = getattr(context, "_tracing_span", None)
+    if span is not None:
+        span.end()
+        context._tracing_span = None
+
+
+def _fail_sql_span(exception_context) -> None:
+    span = getattr(exception_context.execution_context, "_tracing_span", None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+        span.end()
+        exception_context.execution_context._tracing_span = None
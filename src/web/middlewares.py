@@ -0,0 +1,366 @@
+import asyncio
+import logging
+import random
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from tools.admission import AdmissionController, LatencyTarget, Priority, current_latency_target
+from tools.deadline import Deadline, current_deadline
+from tools.logs import log_fields, log_sampled, request_id
+from tools.profiler import SamplingProfiler, can_profile
+from tools.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("access")
+
+# SQLSTATE query_canceled: сработал statement_timeout
+QUERY_CANCELED = "57014"
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# ответы, по которым лимит одновременных запросов уменьшается
+OVERLOAD_STATUSES = frozenset(
+    {status.HTTP_503_SERVICE_UNAVAILABLE, status.HTTP_504_GATEWAY_TIMEOUT}
+)
+
+
+# id запроса от клиента или балансировщика попадает в логи как есть, поэтому только такой
+REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+@dataclass
+class DeadlineStats:
+    """Счётчики прерванных запросов воркера."""
+
+    # срок запроса истёк в приложении (asyncio) — 504
+    timeouts: int = 0
+    # запрос к БД прерван по statement_timeout — 504
+    statement_timeouts: int = 0
+    # не дождались соединения из пула — 503
+    pool_timeouts: int = 0
+    # клиент отключился, обработка отменена
+    disconnects: int = 0
+
+
+class DeadlineMiddleware:
+    """Срок обработки запроса и отмена обработки после отключения клиента.
+
+    Срок берётся из заголовка `header` (секунды), но не дольше `default_seconds`;
+    маршрут может задать свой срок зависимостью RequestTimeout. Внутри срока
+    транзакции БД получают statement_timeout по оставшемуся времени (DeadlineSession).
+
+    Тело запроса читает одна задача и передаёт обработчику через очередь на одно
+    сообщение: так отключение клиента видно, даже если обработчик тело не читает.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_seconds: Optional[float],
+        header: str = "X-Request-Timeout",
+        stats: Optional[DeadlineStats] = None,
+    ):
+        self.app = app
+        self.default_seconds = default_seconds or None
+        self.header = header.lower().encode("latin-1")
+        self.stats = stats or DeadlineStats()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = response_complete = disconnected = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                response_complete = True
+            await send(message)
+
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+        async def read_messages() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    # после ответа сервер тоже отдаёт disconnect: фоновые задачи не трогаем
+                    if not response_complete:
+                        disconnected = True
+                        handler.cancel()
+                    return
+                await messages.put(message)
+
+        loop = asyncio.get_running_loop()
+        client_seconds = self._client_seconds(scope)
+        client_when = loop.time() + client_seconds if client_seconds else None
+        try:
+            async with asyncio.timeout(None) as timeout:
+                deadline = Deadline(timeout, client_when)
+                deadline.reschedule(self.default_seconds)
+                # обработчик копирует контекст при создании задачи и видит свой срок
+                token = current_deadline.set(deadline)
+                handler = asyncio.create_task(self.app(scope, messages.get, send_wrapper))
+                current_deadline.reset(token)
+                reader = asyncio.create_task(read_messages())
+                try:
+                    await handler
+                except asyncio.CancelledError:
+                    if not disconnected or asyncio.current_task().cancelling():
+                        raise
+                    self.stats.disconnects += 1
+                    logger.info("Клиент отключился, обработка %s отменена", scope["path"])
+                finally:
+                    reader.cancel()
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            self.stats.timeouts += 1
+            if not response_started:
+                response = JSONResponse(
+                    {"detail": "Превышено время обработки запроса"},
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                )
+                await response(scope, messages.get, send)
+
+    def _client_seconds(self, scope: Scope) -> Optional[float]:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    return None
+                return seconds if seconds > 0 else None
+        return None
+
+
+class AdmissionMiddleware:
+    """Отказ в обслуживании сверх адаптивного лимита одновременных запросов.
+
+    Запрос сверх лимита своего приоритета сразу получает 503 с Retry-After и не
+    занимает ни обработчик, ни очередь пула соединений. Приоритет определяется по
+    методу и токену: запись с авторизацией важнее анонимного чтения ленты.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not self.controller.try_acquire(self.priority(scope)):
+            response = JSONResponse(
+                {"detail": "Сервис перегружен, повторите запрос позже"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # маршрут с долгим сроком поднимает цель через RequestTimeout
+        target = LatencyTarget(self.controller.latency_target)
+        target_token = current_latency_target.set(target)
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_latency_target.reset(target_token)
+            self.controller.release(
+                time.monotonic() - started,
+                overloaded=status_code in OVERLOAD_STATUSES,
+                latency_target=target.seconds,
+            )
+
+    @staticmethod
+    def priority(scope: Scope) -> Priority:
+        authenticated = bearer_payload(scope) is not None
+        read = scope["method"] in READ_METHODS
+        if authenticated and not read:
+            return Priority.HIGH
+        if authenticated or not read:
+            return Priority.NORMAL
+        return Priority.LOW
+
+
+class RequestLogMiddleware:
+    """Идентификатор запроса в логах и строка журнала доступа на каждый ответ.
+
+    Идентификатор берётся из заголовка `header`, если его передал клиент или
+    балансировщик, иначе создаётся; ответ возвращает его тем же заголовком. Через
+    contextvars он попадает во все записи обработки запроса, включая логи SQLAlchemy.
+
+    Маршруты из `sample_rates` (`{"GET /jobs": 0.01}`, путь без параметров запроса)
+    логируются выборочно: записи ниже WARNING остаются у доли запросов `rate`.
+    Предупреждения, ошибки и ответы 5xx пишутся всегда.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str = "X-Request-ID",
+        sample_rates: Optional[dict[str, float]] = None,
+    ):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.sample_rates = sample_rates or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        id = self._client_request_id(scope) or uuid.uuid4().hex
+        method, path = scope["method"], scope["path"]
+        rate = self.sample_rates.get(f"{method} {path}")
+        id_token = request_id.set(id)
+        sampled_token = log_sampled.set(rate is None or random.random() < rate)
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), (self.header, id.encode())]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            self._log_access(logging.ERROR, method, path, 500, started, sys.exc_info())
+            raise
+        else:
+            level = logging.WARNING if status_code and status_code >= 500 else logging.INFO
+            self._log_access(level, method, path, status_code, started)
+        finally:
+            log_sampled.reset(sampled_token)
+            request_id.reset(id_token)
+
+    def _client_request_id(self, scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                value = value.decode("latin-1")
+                return value if REQUEST_ID.fullmatch(value) else None
+        return None
+
+    @staticmethod
+    def _log_access(
+        level: int,
+        method: str,
+        path: str,
+        status_code: Optional[int],
+        started: float,
+        exc_info=None,
+    ) -> None:
+        fields = {
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        log_fields(access_logger, level, f"{method} {path} {status_code}", fields, exc_info)
+
+
+class ProfileMiddleware:
+    """Профиль одного запроса: `?profile=1` с токеном, в котором есть claim profile.
+
+    Вместо ответа обработчика возвращается файл speedscope со стеками запроса,
+    статус исходного ответа — в заголовке X-Profile-Status. Без claim параметр
+    игнорируется. Middleware ставится внутрь DeadlineMiddleware: профилировщик
+    выделяет запрос по кадру middleware в стеке задачи обработчика.
+    """
+
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        with SamplingProfiler(interval=self.interval, anchor=sys._getframe()) as profiler:
+            await self.app(scope, receive, discard)
+
+        response = JSONResponse(
+            profiler.speedscope(f"{scope['method']} {scope['path']}"),
+            headers={
+                "X-Profile-Status": str(status_code),
+                "Content-Disposition": 'attachment; filename="request.speedscope.json"',
+            },
+        )
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        # обычный запрос платит только за поиск подстроки в query string
+        query = scope["query_string"]
+        if b"profile=" not in query:
+            return False
+        params = dict(parse_qsl(query.decode("latin-1")))
+        return params.get("profile") == "1" and can_profile(bearer_payload(scope))
+
+
+def bearer_payload(scope: Scope) -> Optional[dict]:
+    """Содержимое действительного токена из заголовка Authorization."""
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return decode_access_token(token) if scheme.lower() == "bearer" else None
+    return None
+
+
+def add_timeout_handlers(app, stats: DeadlineStats) -> None:
+    """Ответы на истёкшие сроки запросов к БД: 504 по statement_timeout, 503 по пулу."""
+
+    async def statement_timeout_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+        if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+            raise exc
+        stats.statement_timeouts += 1
+        return JSONResponse(
+            {"detail": "Превышено время обработки запроса"},
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        )
+
+    async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+        stats.pool_timeouts += 1
+        return JSONResponse(
+            {"detail": "Сервис перегружен, повторите запрос позже"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+
+    app.add_exception_handler(DBAPIError, statement_timeout_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
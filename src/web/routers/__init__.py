@@ -1,4 +1,6 @@
 from .auth import router as auth_router  # noqa
+from .debug import router as debug_router  # noqa
 from .job import router as job_router  # noqa
 from .response import router as response_router  # noqa
+from .stats import router as stats_router  # noqa
 from .user import router as user_router  # noqa
@@ -2,12 +2,16 @@ from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from dependencies.containers import ServicesContainer
+from dependencies.rate_limit import RateLimit
 from repositories import UserRepository
 from services.exception import UserNotFoundError
 from tools.security import create_access_token, verify_password
 from web.schemas import LoginSchema, TokenSchema
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+# проверка bcrypt-хеша дорогая: не больше 10 попыток входа в минуту с одного IP
+router = APIRouter(
+    prefix="/auth", tags=["auth"], dependencies=[Depends(RateLimit(times=10, seconds=60))]
+)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
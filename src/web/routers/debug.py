@@ -0,0 +1,48 @@
+import asyncio
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from dependencies import RequestTimeout, require_profile_claim
+from tools.profiler import SamplingProfiler
+
+MAX_PROFILE_SECONDS = 60
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_profile_claim)])
+
+# запись профиля длиннее срока запроса по умолчанию
+profile_timeout = RequestTimeout(seconds=MAX_PROFILE_SECONDS + 10)
+# профилировщики одного потока мешали бы друг другу: один профиль на воркер за раз
+capturing = asyncio.Lock()
+
+
+@router.get("/profile", dependencies=[Depends(profile_timeout)])
+async def profile_worker(
+    seconds: Annotated[float, Query(gt=0, le=MAX_PROFILE_SECONDS)] = 10,
+    interval: Annotated[float, Query(ge=0.001, le=1)] = 0.005,
+    format: Literal["speedscope", "collapsed"] = "speedscope",
+) -> Response:
+    """Профиль воркера, который принял запрос, за `seconds` секунд.
+
+    В профиль попадает весь поток цикла событий: обработка всех запросов воркера
+    и фоновые задачи; ожидание ввода-вывода видно как кадры селектора.
+    """
+
+    if capturing.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Профиль воркера уже записывается"
+        )
+    async with capturing:
+        with SamplingProfiler(interval=interval) as profiler:
+            await asyncio.sleep(seconds)
+
+    if format == "collapsed":
+        return PlainTextResponse(
+            profiler.collapsed(),
+            headers={"Content-Disposition": 'attachment; filename="worker.collapsed.txt"'},
+        )
+    return JSONResponse(
+        profiler.speedscope(f"worker, {seconds:g} с"),
+        headers={"Content-Disposition": 'attachment; filename="worker.speedscope.json"'},
+    )
@@ -1,26 +1,67 @@
 from dataclasses import asdict
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Literal, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import JSONResponse
 
 from dependencies.containers import ServicesContainer
 from dependencies.current_user import get_current_user
+from dependencies.deadline import RequestTimeout
+from dependencies.rate_limit import ConcurrencyLimit, RateLimit
 from models.user import User
-from services import JobService
-from services.exception import JobNotFoundError, ResponseAlreadyExistsError, ResponseCreationError
+from services import FeedService, JobService, ResponseRankingService
+from services.exception import (
+    EditConflictError,
+    JobDuplicateError,
+    JobNotFoundError,
+    JobSalaryRangeError,
+    ResponseAlreadyExistsError,
+    ResponseCreationError,
+)
 from services.response import ResponseService
+from tools.conditional import cache_headers, is_not_modified, make_etag
+from tools.feeds import FEED_PARSERS
 from web.schemas.common import RetrieveManyParams
-from web.schemas.job import JobCreateSchema, JobSchema, JobUpdateSchema
-from web.schemas.response import ResponseCreateSchema, ResponseSchema
+from web.schemas.feed import FeedReportSchema
+from web.schemas.job import (
+    JobCreateSchema,
+    JobPatchSchema,
+    JobRetrieveManyParams,
+    JobSchema,
+    JobUpdateSchema,
+)
+from web.schemas.response import RankedResponseSchema, ResponseCreateSchema, ResponseSchema
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+# ранжирование при пустом кэше оценок читает и векторизует все отклики вакансии
+ranking_timeout = RequestTimeout(seconds=60)
+# ранжирование одной вакансии за раз на пользователя: параллельные запросы заняли бы воркер
+ranking_concurrency = ConcurrencyLimit(limit=1)
+# лента партнёра — сотни мегабайт, загрузка идёт пачками и может занять минуты;
+# компания загружает одну ленту за раз и не больше 20 в час
+feed_timeout = RequestTimeout(seconds=600)
+feed_concurrency = ConcurrencyLimit(limit=1)
+feed_rate_limit = RateLimit(times=20, seconds=3600, key="user")
+
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 @inject
 async def create_job(
     job_create_dto: JobCreateSchema,
+    allow_duplicate: bool = False,
     job_service: JobService = Depends(Provide[ServicesContainer.job_service]),
     current_user: User = Depends(get_current_user),
 ) -> JobSchema:
@@ -29,50 +70,153 @@ async def create_job(
             user_id=current_user.id,
             is_company=current_user.is_company,
             job_create_dto=job_create_dto,
+            allow_duplicate=allow_duplicate,
         )
         return JobSchema(**asdict(user))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except JobDuplicateError as e:
+        raise _duplicate_conflict(e) from e
+
+
+@router.post(
+    "/feed",
+    dependencies=[Depends(feed_timeout), Depends(feed_rate_limit), Depends(feed_concurrency)],
+)
+@inject
+async def upload_job_feed(
+    file: Annotated[UploadFile, File()],
+    format: Optional[Literal["xml", "json"]] = None,
+    batch_size: Annotated[int, Query(gt=0, le=5000)] = 1000,
+    feed_service: FeedService = Depends(Provide[ServicesContainer.feed_service]),
+    current_user: User = Depends(get_current_user),
+) -> FeedReportSchema:
+    """Вставить или обновить вакансии компании из ленты партнёра (XML или JSON).
+
+    Вакансии сопоставляются по external_id. При ошибке разбора файла ответ 422
+    с отчётом: пачки, загруженные до ошибки, сохранены.
+    """
+
+    format = format or _feed_format(file)
+    try:
+        # тело запроса уже во временном файле (SpooledTemporaryFile) и читается потоково
+        report = await feed_service.ingest(
+            user_id=current_user.id,
+            is_company=current_user.is_company,
+            items=FEED_PARSERS[format](file.file),
+            batch_size=batch_size,
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+
+    report = FeedReportSchema.model_validate(report, from_attributes=True)
+    if report.error:
+        return JSONResponse(report.model_dump(), status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    return report
 
 
 @router.get("")
 @inject
 async def read_jobs(
-    params: Annotated[RetrieveManyParams, Query()],
+    params: Annotated[JobRetrieveManyParams, Query()],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     job_service: JobService = Depends(Provide[ServicesContainer.job_service]),
 ) -> list[JobSchema]:
+    # ревалидация по дешёвому запросу (id, updated_at) без чтения самих вакансий
+    versions = await job_service.retrieve_many_versions(params.limit, params.skip, params.is_active)
+    etag = _page_etag(params, versions)
+    if is_not_modified(etag, if_none_match=if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
 
-    return await job_service.retrieve_many(params.limit, params.skip)
+    jobs = await job_service.retrieve_many(params.limit, params.skip, params.is_active)
+    etag = _page_etag(params, [(job.id, job.updated_at) for job in jobs])
+    response.headers.update(cache_headers(etag))
+    return jobs
 
 
 @router.get("/{id}")
 @inject
 async def read_job(
-    id: int, job_service: JobService = Depends(Provide[ServicesContainer.job_service])
+    id: int,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    if_modified_since: Annotated[Optional[str], Header()] = None,
+    job_service: JobService = Depends(Provide[ServicesContainer.job_service]),
 ) -> JobSchema:
     try:
-        return await job_service.retrieve(id=id)
+        updated_at = await job_service.retrieve_version(id=id)
+        etag = make_etag(id, updated_at.isoformat())
+        if is_not_modified(etag, updated_at, if_none_match, if_modified_since):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, updated_at)
+            )
+
+        job = await job_service.retrieve(id=id)
     except JobNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+    response.headers.update(
+        cache_headers(make_etag(job.id, job.updated_at.isoformat()), job.updated_at)
+    )
+    return job
+
 
 @router.put("/{id}")
 @inject
 async def update_job(
     id: int,
     job_update_dto: JobUpdateSchema,
+    allow_duplicate: bool = False,
     job_service: JobService = Depends(Provide[ServicesContainer.job_service]),
     current_user: User = Depends(get_current_user),
 ) -> JobSchema:
     try:
         updated_job = await job_service.update(
-            id=id, job_update_dto=job_update_dto, user_id=current_user.id
+            id=id,
+            job_update_dto=job_update_dto,
+            user_id=current_user.id,
+            allow_duplicate=allow_duplicate,
         )
         return JobSchema(**asdict(updated_job))
     except JobNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
     except PermissionError:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+    except JobDuplicateError as e:
+        raise _duplicate_conflict(e) from e
+
+
+@router.patch("/{id}")
+@inject
+async def patch_job(
+    id: int,
+    job_patch_dto: JobPatchSchema,
+    allow_duplicate: bool = False,
+    job_service: JobService = Depends(Provide[ServicesContainer.job_service]),
+    current_user: User = Depends(get_current_user),
+) -> JobSchema:
+    """Изменить только переданные поля; с `version` — только если вакансию не меняли."""
+
+    try:
+        job = await job_service.patch(
+            id=id,
+            job_patch_dto=job_patch_dto,
+            user_id=current_user.id,
+            allow_duplicate=allow_duplicate,
+        )
+        return JobSchema(**asdict(job))
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except EditConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "version": e.version},
+        ) from e
+    except JobSalaryRangeError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)) from e
+    except JobDuplicateError as e:
+        raise _duplicate_conflict(e) from e
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -120,3 +264,54 @@ async def get_responses_by_job_id(
         return job.responses
     except JobNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/{id}/responses/ranked",
+    dependencies=[Depends(ranking_timeout), Depends(ranking_concurrency)],
+)
+@inject
+async def get_ranked_responses_by_job_id(
+    id: int,
+    params: Annotated[RetrieveManyParams, Query()],
+    ranking_service: ResponseRankingService = Depends(
+        Provide[ServicesContainer.response_ranking_service]
+    ),
+    current_user: User = Depends(get_current_user),
+) -> list[RankedResponseSchema]:
+    try:
+        ranked = await ranking_service.rank(
+            job_id=id, user_id=current_user.id, limit=params.limit, skip=params.skip
+        )
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+
+    return [RankedResponseSchema(**asdict(response), score=score) for response, score in ranked]
+
+
+def _page_etag(params: JobRetrieveManyParams, versions: list[tuple[int, datetime]]) -> str:
+    # без Last-Modified: вакансия, ушедшая со страницы (удалена, снята, сдвинута фильтром),
+    # не меняет max(updated_at) оставшихся, и If-Modified-Since ответил бы устаревшим 304.
+    # ETag меняется и от состава страницы
+    return make_etag(
+        params.limit,
+        params.skip,
+        params.is_active,
+        [(id, updated_at.isoformat()) for id, updated_at in versions],
+    )
+
+
+def _feed_format(file: UploadFile) -> str:
+    content_type = file.content_type or ""
+    filename = file.filename or ""
+    return "xml" if "xml" in content_type or filename.endswith(".xml") else "json"
+
+
+def _duplicate_conflict(error: JobDuplicateError) -> HTTPException:
+    # клиент может показать найденную вакансию и повторить запрос с allow_duplicate=true
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": str(error), "duplicate_id": error.duplicate_id},
+    )
@@ -7,8 +7,8 @@ from dependencies.containers import ServicesContainer
 from dependencies.current_user import get_current_user
 from models.user import User
 from services import ResponseService
-from services.exception import ResponseNotFoundError
-from web.schemas.response import ResponseSchema, ResponseUpdateSchema
+from services.exception import EditConflictError, ResponseNotFoundError
+from web.schemas.response import ResponsePatchSchema, ResponseSchema, ResponseUpdateSchema
 
 router = APIRouter(prefix="/responses", tags=["responses"])
 
@@ -58,6 +58,28 @@ async def update_response(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
 
 
+@router.patch("/{id}")
+@inject
+async def patch_response(
+    id: int,
+    response_patch_dto: ResponsePatchSchema,
+    response_service: ResponseService = Depends(Provide[ServicesContainer.response_service]),
+    current_user: User = Depends(get_current_user),
+) -> ResponseSchema:
+    try:
+        response = await response_service.patch(
+            id=id, user_id=current_user.id, response_patch_dto=response_patch_dto
+        )
+        return ResponseSchema(**asdict(response))
+    except ResponseNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except EditConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "version": e.version},
+        ) from e
+
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 @inject
 async def delete_response(
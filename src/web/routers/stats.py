@@ -0,0 +1,26 @@
+from dataclasses import asdict
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from dependencies.containers import ServicesContainer
+from dependencies.current_user import require_stats_claim
+from services import StatsService
+from services.exception import StatsNotReadyError
+from web.schemas.stats import StatsSchema
+
+router = APIRouter(prefix="/stats", tags=["stats"], dependencies=[Depends(require_stats_claim)])
+
+
+@router.get("")
+@inject
+async def read_stats(
+    stats_service: StatsService = Depends(Provide[ServicesContainer.stats_service]),
+) -> StatsSchema:
+    # данные берутся из материализованных представлений: одна строка сводки и не более 30 дней
+    try:
+        stats = await stats_service.retrieve()
+    except StatsNotReadyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)) from e
+
+    return StatsSchema(**asdict(stats))
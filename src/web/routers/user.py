@@ -6,13 +6,27 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from dependencies import get_current_user
 from dependencies.containers import ServicesContainer
+from dependencies.rate_limit import ConcurrencyLimit, RateLimit
 from models import User
-from services import UserService
-from services.exception import UserAlreadyExistsError, UserNotFoundError
-from web.schemas import RetrieveManyParams, UserCreateSchema, UserSchema, UserUpdateSchema
+from services import RecommendationService, UserService
+from services.exception import EditConflictError, UserAlreadyExistsError, UserNotFoundError
+from web.schemas import (
+    JobSchema,
+    RetrieveManyParams,
+    UserCreateSchema,
+    UserPatchSchema,
+    UserProfileSchema,
+    UserSchema,
+    UserUpdateSchema,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# регистрация считает bcrypt-хеш пароля
+create_user_rate_limit = RateLimit(times=5, seconds=60)
+# рекомендации — поиск по TF-IDF индексу всех активных вакансий
+recommendations_concurrency = ConcurrencyLimit(limit=2)
+
 
 @router.get("")
 @inject
@@ -51,7 +65,45 @@ async def read_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
+@router.get("/{id}/profile")
+@inject
+async def read_profile(
+    id: int,
+    limit: Annotated[int, Query(gt=0, le=50)] = 5,
+    user_service: UserService = Depends(Provide[ServicesContainer.user_service]),
+    current_user: User = Depends(get_current_user),
+) -> UserProfileSchema:
+    """Пользователь с последними вакансиями и откликами: один запрос к БД."""
+
+    if id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+    try:
+        profile = await user_service.retrieve_profile(id=id, limit=limit)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+    return UserProfileSchema(**asdict(profile))
+
+
+@router.get("/{id}/recommendations", dependencies=[Depends(recommendations_concurrency)])
+@inject
+async def read_recommendations(
+    id: int,
+    limit: Annotated[int, Query(gt=0, le=100)] = 10,
+    recommendation_service: RecommendationService = Depends(
+        Provide[ServicesContainer.recommendation_service]
+    ),
+    current_user: User = Depends(get_current_user),
+) -> list[JobSchema]:
+    if id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+
+    return await recommendation_service.recommend(user_id=id, limit=limit)
+
+
+@router.post(
+    "", status_code=status.HTTP_201_CREATED, dependencies=[Depends(create_user_rate_limit)]
+)
 @inject
 async def create_user(
     user_create_dto: UserCreateSchema,
@@ -83,6 +135,31 @@ async def update_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
 
 
+@router.patch("/{id}")
+@inject
+async def patch_user(
+    id: int,
+    user_patch_schema: UserPatchSchema,
+    user_service: UserService = Depends(Provide[ServicesContainer.user_service]),
+    current_user: User = Depends(get_current_user),
+) -> UserSchema:
+    if id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
+
+    try:
+        user = await user_service.patch(current_user.id, user_patch_schema)
+        return UserSchema(**asdict(user))
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+    except UserAlreadyExistsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except EditConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "version": e.version},
+        ) from e
+
+
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 @inject
 async def delete_user(
@@ -1,5 +1,27 @@
 from .auth import LoginSchema, TokenSchema  # noqa
-from .common import RetrieveManyParams  # noqa
-from .job import JobCreateSchema, JobSchema, JobUpdateSchema  # noqa
-from .response import ResponseCreateSchema, ResponseSchema, ResponseUpdateSchema  # noqa
-from .user import UserCreateSchema, UserSchema, UserUpdateSchema  # noqa
+from .common import PatchSchema, RetrieveManyParams  # noqa
+from .feed import FeedReportSchema, StageStatsSchema  # noqa
+from .job import (  # noqa
+    JobCreateSchema,
+    JobFeedItemSchema,
+    JobPatchSchema,
+    JobRetrieveManyParams,
+    JobSchema,
+    JobUpdateSchema,
+)
+from .response import (  # noqa
+    RankedResponseSchema,
+    ResponseCreateSchema,
+    ResponsePatchSchema,
+    ResponseSchema,
+    ResponseUpdateSchema,
+)
+from .stats import SalaryPercentilesSchema, StatsSchema  # noqa
+from .user import (  # noqa
+    ProfileJobSchema,
+    UserCreateSchema,
+    UserPatchSchema,
+    UserProfileSchema,
+    UserSchema,
+    UserUpdateSchema,
+)
@@ -1,6 +1,33 @@
-from pydantic import BaseModel, Field
+from typing import Any, ClassVar, Optional, Self
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class RetrieveManyParams(BaseModel):
     limit: int = Field(default=100, gt=0)
     skip: int = Field(default=0, ge=0)
+
+
+class PatchSchema(BaseModel):
+    """Частичное обновление: меняются только переданные поля, null сбрасывает значение.
+
+    `version` — версия записи, которую прочитал клиент: если запись с тех пор
+    изменили, обновление отклоняется. Без `version` побеждает последняя запись.
+    """
+
+    # поля, которые нельзя сбросить: NOT NULL в БД
+    required_fields: ClassVar[frozenset[str]] = frozenset()
+
+    version: Optional[int] = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def forbid_null_required(self) -> Self:
+        for field in sorted(self.model_fields_set & self.required_fields):
+            if getattr(self, field) is None:
+                raise ValueError(f"Поле {field} не может быть пустым")
+        return self
+
+    def changes(self) -> dict[str, Any]:
+        """Переданные поля без `version`: значения для UPDATE ... SET."""
+
+        return self.model_dump(exclude_unset=True, exclude={"version"})
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class StageStatsSchema(BaseModel):
+    items: int
+    seconds: float
+    per_second: float
+
+
+class FeedReportSchema(BaseModel):
+    parsing: StageStatsSchema
+    validation: StageStatsSchema
+    upsert: StageStatsSchema
+    inserted: int
+    updated: int
+    unchanged: int
+    duplicates: int
+    invalid: int
+    errors: list[str]
+    error: Optional[str] = None
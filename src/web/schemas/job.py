@@ -1,7 +1,9 @@
 from decimal import Decimal
 from typing import Optional, Self
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
+
+from web.schemas.common import PatchSchema, RetrieveManyParams
 
 
 class SalaryValidationMixin:
@@ -21,6 +23,8 @@ class JobSchema(BaseModel):
     salary_from: Optional[Decimal]
     salary_to: Optional[Decimal]
     is_active: bool
+    external_id: Optional[str] = None
+    version: int = 1
 
 
 class JobCreateSchema(BaseModel, SalaryValidationMixin):
@@ -33,3 +37,28 @@ class JobCreateSchema(BaseModel, SalaryValidationMixin):
 
 class JobUpdateSchema(JobCreateSchema):
     pass
+
+
+class JobPatchSchema(PatchSchema, SalaryValidationMixin):
+    required_fields = frozenset({"title", "description", "salary_from", "salary_to", "is_active"})
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    salary_from: Optional[Decimal] = None
+    salary_to: Optional[Decimal] = None
+    is_active: Optional[bool] = None
+
+
+class JobFeedItemSchema(JobCreateSchema):
+    """Вакансия из ленты партнёра: поля, которые API разрешает не заполнять, обязательны."""
+
+    external_id: str = Field(min_length=1, max_length=255)
+    title: str
+    description: str
+    salary_from: Decimal
+    salary_to: Decimal
+    is_active: bool = True
+
+
+class JobRetrieveManyParams(RetrieveManyParams):
+    is_active: Optional[bool] = True
@@ -2,12 +2,15 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from web.schemas.common import PatchSchema
+
 
 class ResponseSchema(BaseModel):
     id: int
     job_id: int
     user_id: int
     message: Optional[str] = None
+    version: int = 1
 
 
 class ResponseCreateSchema(BaseModel):
@@ -16,3 +19,12 @@ class ResponseCreateSchema(BaseModel):
 
 class ResponseUpdateSchema(ResponseCreateSchema):
     pass
+
+
+class ResponsePatchSchema(PatchSchema):
+    # сопроводительное письмо можно убрать: null
+    message: Optional[str] = None
+
+
+class RankedResponseSchema(ResponseSchema):
+    score: float
@@ -0,0 +1,22 @@
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SalaryPercentilesSchema(BaseModel):
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+
+
+class StatsSchema(BaseModel):
+    users_total: int
+    companies_total: int
+    jobs_total: int
+    active_jobs_total: int
+    responses_total: int
+    salary_from: SalaryPercentilesSchema
+    salary_to: SalaryPercentilesSchema
+    responses_per_day: dict[date, int]
+    refreshed_at: datetime
@@ -3,12 +3,30 @@ from typing import Annotated, Optional
 from pydantic import BaseModel, EmailStr, StringConstraints, model_validator
 from typing import Self
 
+from web.schemas.common import PatchSchema
+from web.schemas.job import JobSchema
+from web.schemas.response import ResponseSchema
+
 
 class UserSchema(BaseModel):
     id: int
     name: str
     email: EmailStr
     is_company: bool
+    version: int = 1
+
+
+class ProfileJobSchema(JobSchema):
+    responses_total: int
+
+
+class UserProfileSchema(BaseModel):
+    user: UserSchema
+    jobs_total: int
+    active_jobs_total: int
+    responses_total: int
+    jobs: list[ProfileJobSchema]
+    responses: list[ResponseSchema]
 
 
 class UserUpdateSchema(BaseModel):
@@ -17,6 +35,14 @@ class UserUpdateSchema(BaseModel):
     is_company: Optional[bool] = None
 
 
+class UserPatchSchema(PatchSchema):
+    required_fields = frozenset({"name", "email", "is_company"})
+
+    name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    is_company: Optional[bool] = None
+
+
 class UserCreateSchema(BaseModel):
     name: str
     email: EmailStr